@@ -1,9 +1,11 @@
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import Depends, Query
 
 from app.api.routing import make_router
 from app.core.auth import require_session
+from app.core.config import get_settings
 from app.schemas.v1.airport import (
     Airport,
     AirportCode,
@@ -14,13 +16,15 @@ from app.schemas.v1.airport import (
 )
 from app.schemas.v1.base import MongoId
 from app.schemas.v1.exceptions import NotFoundException
-from app.schemas.v1.flight import Flight
+from app.schemas.v1.flight import FlightPageResponse
 from app.schemas.v1.response import DeletedResponse
 from app.services.airport import AirportService
 from app.services.flight import FlightService
 
 router = make_router()
 
+settings = get_settings()
+
 AirportServiceDep = Annotated[AirportService, Depends()]
 FlightServiceDep = Annotated[FlightService, Depends()]
 
@@ -131,12 +135,19 @@ async def get_airport_arrivals(
     airport_code: AirportCode,
     airport_service: AirportServiceDep,
     flight_service: FlightServiceDep,
-) -> list[Flight] | None:
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: str | None = Query(None),
+    window_from: datetime | None = Query(None, alias="from"),
+    window_to: datetime | None = Query(None, alias="to"),
+) -> FlightPageResponse:
     airport = await airport_service.get_airport_by_code(airport_code)
     if not airport:
         raise NotFoundException("Airport", airport_code)
 
-    return await flight_service.get_flights_by_arrival_airport(airport)
+    items, next_cursor = await flight_service.get_flights_by_arrival_airport(
+        airport, limit=limit, cursor=cursor, window_from=window_from, window_to=window_to
+    )
+    return FlightPageResponse(items=items, next_cursor=next_cursor)
 
 
 @router.get(
@@ -148,9 +159,16 @@ async def get_airport_departures(
     airport_code: AirportCode,
     airport_service: AirportServiceDep,
     flight_service: FlightServiceDep,
-) -> list[Flight] | None:
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: str | None = Query(None),
+    window_from: datetime | None = Query(None, alias="from"),
+    window_to: datetime | None = Query(None, alias="to"),
+) -> FlightPageResponse:
     airport = await airport_service.get_airport_by_code(airport_code)
     if not airport:
         raise NotFoundException("Airport", airport_code)
 
-    return await flight_service.get_flights_by_departure_airport(airport)
+    items, next_cursor = await flight_service.get_flights_by_departure_airport(
+        airport, limit=limit, cursor=cursor, window_from=window_from, window_to=window_to
+    )
+    return FlightPageResponse(items=items, next_cursor=next_cursor)
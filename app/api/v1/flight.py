@@ -1,36 +1,65 @@
-from typing import Annotated
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Annotated, Any
 
-from fastapi import Depends
+from fastapi import Depends, Query
+from fastapi.responses import StreamingResponse
 
 from app.api.routing import make_router
 from app.core.auth import require_session
+from app.core.config import get_settings
 from app.schemas.v1.base import MongoId
 from app.schemas.v1.exceptions import NotFoundException
-from app.schemas.v1.flight import Flight, FlightCreate, FlightNumber, FlightUpdate
+from app.schemas.v1.flight import (
+    Flight,
+    FlightCreate,
+    FlightNumber,
+    FlightPageResponse,
+    FlightUpdate,
+)
 from app.schemas.v1.response import DeletedResponse
 from app.schemas.v1.session import SessionResponse
 from app.services.flight import FlightService
+from app.services.flight_events import FLIGHTS_TOPIC, flight_broker
+from app.util.sse import SSE_HEARTBEAT, format_sse
 
 router = make_router()
 
+settings = get_settings()
+
 FlightServiceDep = Annotated[FlightService, Depends()]
 
 
-@router.get("/", summary="Get Active Flight Items", response_model=list[Flight])
+@router.get("/", summary="Get Active Flight Items", response_model=FlightPageResponse)
 async def get_active_flight_items(
     service: FlightServiceDep,
     _session: SessionResponse = Depends(require_session),
-) -> list[Flight]:
-    return await service.get_active_flights()
-
-
-@router.get("/all", summary="Get Flight Items", response_model=list[Flight])
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: str | None = Query(None),
+    window_from: datetime | None = Query(None, alias="from"),
+    window_to: datetime | None = Query(None, alias="to"),
+) -> FlightPageResponse:
+    items, next_cursor = await service.get_active_flights(
+        limit=limit, cursor=cursor, window_from=window_from, window_to=window_to
+    )
+    return FlightPageResponse(items=items, next_cursor=next_cursor)
+
+
+@router.get("/all", summary="Get Flight Items", response_model=FlightPageResponse)
 async def get_flight_items(
     service: FlightServiceDep,
     _session: SessionResponse = Depends(require_session),
-) -> list[Flight]:
-    flights = await service.get_all_flights()
-    return sorted(flights, key=lambda x: x.departure_at, reverse=True)
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: str | None = Query(None),
+    window_from: datetime | None = Query(None, alias="from"),
+    window_to: datetime | None = Query(None, alias="to"),
+) -> FlightPageResponse:
+    # Ordering (departure_at desc, _id desc) is applied by the index-backed query.
+    items, next_cursor = await service.get_all_flights(
+        limit=limit, cursor=cursor, window_from=window_from, window_to=window_to
+    )
+    return FlightPageResponse(items=items, next_cursor=next_cursor)
 
 
 @router.get(
@@ -60,6 +89,45 @@ async def get_next_flight_item(
     return flight
 
 
+async def _next_flight_snapshot(service: FlightService) -> dict[str, Any] | None:
+    flight = await service.get_next_flight()
+    return flight.serialize() if flight else None
+
+
+async def next_flight_events(
+    service: FlightService, heartbeat_seconds: float
+) -> AsyncIterator[str]:
+    """Send the next flight, then each change, re-sending the next flight only when a
+    change actually moved it. Idle periods are filled with heartbeats."""
+    with flight_broker.subscribe(FLIGHTS_TOPIC) as changes:
+        current = await _next_flight_snapshot(service)
+        yield format_sse("next_flight", current)
+        while True:
+            try:
+                change = await asyncio.wait_for(changes.get(), timeout=heartbeat_seconds)
+            except TimeoutError:
+                yield SSE_HEARTBEAT
+                continue
+            latest = await _next_flight_snapshot(service)
+            yield format_sse("flight_changed", change.serialize())
+            if latest != current:
+                current = latest
+                yield format_sse("next_flight", current)
+
+
+@router.get("/stream", summary="Stream Next Flight Updates")
+async def stream_flight_updates(
+    service: FlightServiceDep,
+    _session: SessionResponse = Depends(require_session),
+) -> StreamingResponse:
+    return StreamingResponse(
+        next_flight_events(service, settings.flight_stream_heartbeat_seconds),
+        media_type="text/event-stream",
+        # Disable proxy buffering so events are delivered as they are written.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{flight_id}", summary="Get Flight Item", response_model=Flight)
 async def get_flight_item(
     flight_id: MongoId,
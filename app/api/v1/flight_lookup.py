@@ -4,7 +4,8 @@ from fastapi import Depends, Query
 
 from app.api.routing import make_router
 from app.core.auth import require_session
-from app.schemas.v1.flight_lookup import FlightLookupResponse
+from app.integrations.aerodatabox_client import aerodatabox_client
+from app.schemas.v1.flight_lookup import AeroDataBoxMetrics, FlightLookupResponse
 from app.schemas.v1.session import SessionResponse
 from app.services.flight_lookup import lookup_flight
 
@@ -29,3 +30,14 @@ async def lookup_flight_route(
     _session: SessionResponse = Depends(require_session),
 ) -> FlightLookupResponse:
     return await lookup_flight(flightNumber, on_date=on_date)
+
+
+@router.get(
+    "/lookup/metrics",
+    summary="Rate limiter, retry and circuit breaker state of the flight lookup client",
+    response_model=AeroDataBoxMetrics,
+)
+async def lookup_metrics_route(
+    _session: SessionResponse = Depends(require_session),
+) -> AeroDataBoxMetrics:
+    return aerodatabox_client.metrics()
@@ -1,29 +1,39 @@
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import Depends, status
+from fastapi import Depends, Query, status
+from fastapi.responses import StreamingResponse
 
 from app.api.routing import make_router
 from app.core.auth import require_session
+from app.core.config import get_settings
 from app.schemas.v1.base import MongoId
 from app.schemas.v1.mediation import (
     AdviceEndpointResponse,
     CommentCreateResponse,
     MediationCommentCreate,
-    MediationCommentResponse,
+    MediationCommentPageResponse,
     MediationPerspective,
     MediationPerspectiveDraftUpdate,
     MediationSession,
     MediationSessionCreate,
     MediationSessionDetailResponse,
-    MediationSessionListItem,
+    MediationSessionPageResponse,
     ReflectionEndpointResponse,
     SubmitPerspectiveResponse,
 )
 from app.schemas.v1.session import SessionResponse
+from app.schemas.v1.user import UserType
 from app.services.mediation import MediationService
+from app.services.mediation_events import mediation_broker
+from app.util.sse import SSE_HEARTBEAT, format_sse
 
 router = make_router()
 
+settings = get_settings()
+
 MediationServiceDep = Annotated[MediationService, Depends()]
 SessionDep = Annotated[SessionResponse, Depends(require_session)]
 
@@ -45,13 +55,16 @@ async def create_mediation_session(
 @router.get(
     "/",
     summary="List mediation sessions",
-    response_model=list[MediationSessionListItem],
+    response_model=MediationSessionPageResponse,
 )
 async def list_mediation_sessions(
     service: MediationServiceDep,
     session: SessionDep,
-) -> list[MediationSessionListItem]:
-    return await service.list_sessions(session.user_type)
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: MongoId | None = Query(None),
+) -> MediationSessionPageResponse:
+    items, next_cursor = await service.list_sessions(session.user_type, limit, cursor)
+    return MediationSessionPageResponse(items=items, next_cursor=next_cursor)
 
 
 @router.get(
@@ -67,6 +80,40 @@ async def get_mediation_session(
     return await service.get_session_detail(session_id, session.user_type)
 
 
+async def mediation_session_events(
+    session_id: MongoId, user_type: UserType, heartbeat_seconds: float
+) -> AsyncIterator[str]:
+    """Relay the session's events, skipping ones private to the other user."""
+    with mediation_broker.subscribe(str(session_id)) as events:
+        while True:
+            try:
+                event = await asyncio.wait_for(events.get(), timeout=heartbeat_seconds)
+            except TimeoutError:
+                yield SSE_HEARTBEAT
+                continue
+            if event.recipient_user_type not in (None, user_type):
+                continue
+            payload = event.serialize()
+            payload.pop("recipient_user_type", None)
+            yield format_sse(event.event_type.value, payload)
+
+
+@router.get("/{session_id}/events", summary="Stream mediation session events")
+async def stream_mediation_session_events(
+    session_id: MongoId,
+    service: MediationServiceDep,
+    session: SessionDep,
+) -> StreamingResponse:
+    await service.get_session(session_id)
+    return StreamingResponse(
+        mediation_session_events(
+            session_id, session.user_type, settings.mediation_stream_heartbeat_seconds
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post(
     "/{session_id}/resolve",
     summary="Resolve mediation session",
@@ -188,14 +235,20 @@ async def get_mediation_advice(
 @router.get(
     "/{session_id}/comments",
     summary="List mediation comments",
-    response_model=list[MediationCommentResponse],
+    response_model=MediationCommentPageResponse,
 )
 async def list_mediation_comments(
     session_id: MongoId,
     service: MediationServiceDep,
     session: SessionDep,
-) -> list[MediationCommentResponse]:
-    return await service.list_comments(session_id, session.user_type)
+    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
+    cursor: str | None = Query(None),
+    since: datetime | None = Query(None),
+) -> MediationCommentPageResponse:
+    items, next_cursor = await service.list_comments(
+        session_id, session.user_type, limit, cursor, since
+    )
+    return MediationCommentPageResponse(items=items, next_cursor=next_cursor)
 
 
 @router.post(
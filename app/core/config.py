@@ -1,6 +1,7 @@
 from functools import lru_cache
+from typing import Literal
 
-from pydantic import field_validator, model_validator
+from pydantic import AliasChoices, Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -28,6 +29,9 @@ class Settings(BaseSettings):
     mediation_comments_collection_name: str = "mediation_comments"
     mediation_moderation_results_collection_name: str = "mediation_moderation_results"
     mediation_ai_jobs_collection_name: str = "mediation_ai_jobs"
+    mediation_events_collection_name: str = "mediation_events"
+    flight_lookup_cache_collection_name: str = "flight_lookup_cache"
+    call_budgets_collection_name: str = "call_budgets"
 
     aws_s3_image_folder: str = "images/"
     aws_s3_thumbnail_folder: str = "thumbnails/"
@@ -50,9 +54,73 @@ class Settings(BaseSettings):
     openai_api_key: str | None = None
     openai_model_mediation: str = "gpt-5"
     openai_model_moderation: str = "omni-moderation-latest"
+    # Concurrent moderation calls are sent together: a batch goes out once it holds
+    # max_size texts or window_seconds after its first one.
+    openai_moderation_batch_window_seconds: float = 0.02
+    openai_moderation_batch_max_size: int = 32
+    # Moderation decisions remembered per distinct text, so the same text is sent once.
+    mediation_moderation_cache_max_entries: int = 1024
     mediation_worker_enabled: bool = False
+    # The worker wakes on a change stream over the jobs collection; polling only
+    # catches what the stream cannot report (stale jobs) or runs at the fast interval
+    # when change streams are unavailable.
+    mediation_worker_change_stream_enabled: bool = True
     mediation_worker_poll_interval_seconds: float = 2.0
-    mediation_job_processing_timeout_seconds: float = 300.0
+    mediation_worker_fallback_poll_interval_seconds: float = 30.0
+    mediation_stale_job_sweep_interval_seconds: float = 60.0
+    # A claimed job is leased to its worker, which heartbeats every interval. A job
+    # without a heartbeat for `mediation_job_lease_seconds` is presumed abandoned.
+    mediation_job_heartbeat_interval_seconds: float = 15.0
+    # Still read from the deprecated MEDIATION_JOB_PROCESSING_TIMEOUT_SECONDS it replaced.
+    mediation_job_lease_seconds: float = Field(
+        default=60.0,
+        validation_alias=AliasChoices(
+            "mediation_job_lease_seconds", "mediation_job_processing_timeout_seconds"
+        ),
+    )
+    # A failed job is retried after jittered exponential backoff (base * 2^(attempt - 1),
+    # capped), or later if the upstream asked for it with Retry-After.
+    mediation_job_retry_base_delay_seconds: float = 10.0
+    mediation_job_retry_max_delay_seconds: float = 600.0
+    # Jobs are claimed in rank order: created_at, pushed back by priority * step and by
+    # the number of jobs the same session already has queued * fairness. A job of a
+    # lower priority therefore overtakes newer urgent jobs once it has waited long
+    # enough, and one busy session interleaves with the others instead of draining first.
+    mediation_job_priority_step_seconds: float = 30.0
+    mediation_job_session_fairness_seconds: float = 10.0
+    # Worker processes started by `python -m app.workers`.
+    mediation_worker_processes: int = 1
+    mediation_worker_concurrency: int = 4
+    # Per MediationAIJobType, so slow generation jobs cannot occupy every slot; types
+    # not listed may use the whole pool. Set as JSON, e.g. '{"COMMENT_RESPONSE": 2}'.
+    mediation_worker_job_type_limits: dict[str, int] = {
+        "SHARED_MEDIATION_ADVICE": 1,
+        "PRIVATE_REFLECTION": 2,
+        "COMMENT_RESPONSE": 2,
+    }
+    # How long shutdown waits for in-flight jobs before cancelling them.
+    mediation_worker_shutdown_timeout_seconds: float = 60.0
+    # "memory" delivers events within one process. "mongo" routes them through a
+    # collection and a change stream (replica sets only) so a separate worker process
+    # can reach API subscribers.
+    mediation_events_backend: Literal["memory", "mongo"] = "memory"
+    mediation_events_ttl_seconds: int = 3_600
+    mediation_stream_heartbeat_seconds: float = 15.0
+
+    flight_expiration_worker_enabled: bool = True
+    flight_expiration_interval_seconds: float = 60.0
+    # Live status polling spends AeroDataBox quota, so it is opt-in.
+    flight_tracker_enabled: bool = False
+    flight_tracker_interval_seconds: float = 60.0
+    flight_tracker_horizon_hours: float = 48.0
+    # Shared by every tracker process; retries are charged too.
+    flight_tracker_max_calls_per_hour: int = 12
+    # A flight claimed by one tracker is skipped by the others for this long.
+    flight_tracker_lease_seconds: float = 300.0
+    # Relay flight writes from a Mongo change stream (replica sets only); without one,
+    # streams only see writes made by this process.
+    flight_change_stream_enabled: bool = True
+    flight_stream_heartbeat_seconds: float = 15.0
 
     aws_region: str = "eu-west-1"
     aws_s3_bucket: str = "my-app-bucket"
@@ -66,8 +134,31 @@ class Settings(BaseSettings):
     aerodatabox_api_host: str = "aerodatabox.p.rapidapi.com"
     aerodatabox_timeout_seconds: float = 10.0
     aerodatabox_lookup_window_days: int = 7
+    # Window lookups fan out into one upstream call per uncached day, this many at a time.
+    aerodatabox_lookup_concurrency: int = 3
+    aerodatabox_http2_enabled: bool = True
+    aerodatabox_max_connections: int = 10
+    aerodatabox_max_keepalive_connections: int = 5
+    # Keep idle connections long enough that lookups after a pause skip the TLS handshake.
+    aerodatabox_keepalive_expiry_seconds: float = 120.0
+    # Open a connection at startup; off by default because it sends a request upstream.
+    aerodatabox_warmup_enabled: bool = False
+    # Client-side limiter sized to the RapidAPI plan quota.
+    aerodatabox_rate_limit_per_second: float = 1.0
+    aerodatabox_rate_limit_burst: int = 5
+    aerodatabox_max_retries: int = 2
+    aerodatabox_retry_base_delay_seconds: float = 0.5
+    aerodatabox_retry_max_delay_seconds: float = 4.0
+    aerodatabox_circuit_failure_threshold: int = 5
+    aerodatabox_circuit_reset_seconds: float = 30.0
     aerodatabox_cache_ttl_success_seconds: int = 21_600  # 6 h
     aerodatabox_cache_ttl_no_results_seconds: int = 1_800  # 30 min
+    # Expired lookups are served while a background refresh runs, and on provider errors.
+    aerodatabox_cache_stale_while_revalidate_seconds: int = 3_600  # 1 h
+    aerodatabox_cache_stale_if_error_seconds: int = 86_400  # 24 h
+    aerodatabox_cache_max_entries: int = 1_024
+    # Share lookups across workers and restarts through a Mongo TTL collection.
+    aerodatabox_cache_shared_enabled: bool = True
 
     default_page_size: int = 20
     max_page_size: int = 100
@@ -1,9 +1,14 @@
+import asyncio
 import logging
+import random
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 
 import httpx
 
 from app.core.config import get_settings
+from app.integrations.resilience import CircuitBreaker, CircuitState, TokenBucket
+from app.schemas.v1.flight_lookup import AeroDataBoxMetrics
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -12,9 +17,16 @@ settings = get_settings()
 class AeroDataBoxError(Exception):
     """Raised when the AeroDataBox API returns an error or is unreachable."""
 
-    def __init__(self, message: str, status_code: int | None = None) -> None:
+    def __init__(
+        self, message: str, status_code: int | None = None, *, retryable: bool = False
+    ) -> None:
         super().__init__(message)
         self.status_code = status_code
+        self.retryable = retryable
+
+
+class AeroDataBoxBudgetExhausted(AeroDataBoxError):
+    """Raised before a request when the caller's `attempt_budget` grants no more calls."""
 
 
 @dataclass
@@ -25,8 +37,25 @@ class RawFlightData:
 
 
 class AeroDataBoxClient:
+    """RapidAPI client guarded by a token-bucket limiter, jittered retries on 429/5xx
+    and network errors, and a circuit breaker that fails fast while the upstream is down.
+    """
+
     def __init__(self) -> None:
         self._client: httpx.AsyncClient | None = None
+        self._limiter = TokenBucket(
+            rate=settings.aerodatabox_rate_limit_per_second,
+            capacity=settings.aerodatabox_rate_limit_burst,
+        )
+        self._breaker = CircuitBreaker(
+            failure_threshold=settings.aerodatabox_circuit_failure_threshold,
+            reset_timeout=settings.aerodatabox_circuit_reset_seconds,
+        )
+        self._requests_total = 0
+        self._retries_total = 0
+        self._failures_total = 0
+        self._rate_limited_total = 0
+        self._short_circuited_total = 0
 
     def _get_client(self) -> httpx.AsyncClient:
         if not settings.aerodatabox_api_key:
@@ -39,31 +68,148 @@ class AeroDataBoxClient:
                     "X-RapidAPI-Host": settings.aerodatabox_api_host,
                 },
                 timeout=settings.aerodatabox_timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=settings.aerodatabox_max_connections,
+                    max_keepalive_connections=settings.aerodatabox_max_keepalive_connections,
+                    keepalive_expiry=settings.aerodatabox_keepalive_expiry_seconds,
+                ),
+                # A single multiplexed HTTP/2 connection serves concurrent lookups.
+                http2=settings.aerodatabox_http2_enabled,
             )
         return self._client
 
+    async def start(self) -> None:
+        """Create the pooled client at startup and optionally open a connection to it.
+
+        Called from the application lifespan. The warm-up request bypasses the rate
+        limiter and circuit breaker; its only purpose is to complete the TLS handshake
+        so the first user lookup reuses a live connection.
+        """
+        if not settings.aerodatabox_api_key:
+            logger.info("AERODATABOX_API_KEY is not configured; flight lookup is disabled")
+            return
+        client = self._get_client()
+        if not settings.aerodatabox_warmup_enabled:
+            return
+        try:
+            await client.head("/")
+        except httpx.HTTPError as exc:
+            logger.warning("AeroDataBox warm-up failed: %s", type(exc).__name__)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def metrics(self) -> AeroDataBoxMetrics:
+        return AeroDataBoxMetrics(
+            circuit_state=self._breaker.state.value,
+            circuit_consecutive_failures=self._breaker.consecutive_failures,
+            circuit_retry_after_seconds=self._breaker.retry_after,
+            rate_limit_tokens_available=self._limiter.tokens,
+            requests_total=self._requests_total,
+            retries_total=self._retries_total,
+            failures_total=self._failures_total,
+            rate_limited_total=self._rate_limited_total,
+            short_circuited_total=self._short_circuited_total,
+        )
+
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        # Full jitter keeps concurrent retries from synchronizing on the upstream.
+        ceiling = min(
+            settings.aerodatabox_retry_max_delay_seconds,
+            settings.aerodatabox_retry_base_delay_seconds * 2**attempt,
+        )
+        return random.uniform(0, ceiling)
+
     async def get_flights_by_number(
         self,
         flight_number: str,
         date_from: str,
         date_to: str,
+        *,
+        attempt_budget: Callable[[], Awaitable[bool]] | None = None,
     ) -> list[RawFlightData]:
         """Call GET /flights/number/{flightNumber}/{dateFrom}/{dateTo}.
 
         Returns a list of raw flight dicts (may be empty).
-        Raises AeroDataBoxError for any non-2xx response or network issue.
+        Raises AeroDataBoxError for any non-2xx response or network issue, and
+        immediately (without a request) while the circuit is open or the local rate
+        limit cannot be met within the request timeout. `attempt_budget` is awaited
+        before every upstream attempt, retries included; when it returns False the call
+        stops with AeroDataBoxBudgetExhausted.
         """
         client = self._get_client()
+        admitted_in = self._breaker.allow_request()
+        if admitted_in is None:
+            self._short_circuited_total += 1
+            raise AeroDataBoxError("Flight data service is temporarily unavailable")
+
+        try:
+            return await self._call_with_retries(
+                client, flight_number, date_from, date_to, attempt_budget
+            )
+        finally:
+            # A probe frees its slot even when it ended without a verdict (local rate
+            # limit, budget or cancellation), so the circuit cannot wedge half-open.
+            # Other calls leave the slot alone: a probe may be in flight.
+            if admitted_in == CircuitState.HALF_OPEN:
+                self._breaker.release_probe()
+
+    async def _call_with_retries(
+        self,
+        client: httpx.AsyncClient,
+        flight_number: str,
+        date_from: str,
+        date_to: str,
+        attempt_budget: Callable[[], Awaitable[bool]] | None,
+    ) -> list[RawFlightData]:
+        attempt = 0
+        while True:
+            if not await self._limiter.acquire(max_wait=settings.aerodatabox_timeout_seconds):
+                self._rate_limited_total += 1
+                raise AeroDataBoxError("Flight data service rate limit exceeded", 429)
+            if attempt_budget is not None and not await attempt_budget():
+                raise AeroDataBoxBudgetExhausted("Flight data call budget exhausted", 429)
+
+            self._requests_total += 1
+            try:
+                flights = await self._request(client, flight_number, date_from, date_to)
+            except AeroDataBoxError as exc:
+                if exc.retryable and attempt < settings.aerodatabox_max_retries:
+                    attempt += 1
+                    self._retries_total += 1
+                    await asyncio.sleep(self._backoff_delay(attempt))
+                    continue
+                self._failures_total += 1
+                if exc.retryable:
+                    self._breaker.record_failure()
+                else:
+                    # Auth and client errors mean the upstream answered; it is not down.
+                    self._breaker.record_success()
+                raise
+
+            self._breaker.record_success()
+            return flights
+
+    async def _request(
+        self,
+        client: httpx.AsyncClient,
+        flight_number: str,
+        date_from: str,
+        date_to: str,
+    ) -> list[RawFlightData]:
         try:
             response = await client.get(f"/flights/number/{flight_number}/{date_from}/{date_to}")
         except httpx.TimeoutException as exc:
             logger.warning("AeroDataBox request timed out for flight %s", flight_number)
-            raise AeroDataBoxError("Flight data service timed out") from exc
+            raise AeroDataBoxError("Flight data service timed out", retryable=True) from exc
         except httpx.RequestError as exc:
             logger.warning(
                 "AeroDataBox request error for flight %s: %s", flight_number, type(exc).__name__
             )
-            raise AeroDataBoxError("Flight data service is unavailable") from exc
+            raise AeroDataBoxError("Flight data service is unavailable", retryable=True) from exc
 
         # 404 means no flights found for that number/range — treat as empty, not an error
         if response.status_code == 404:
@@ -77,13 +223,16 @@ class AeroDataBoxClient:
 
         if response.status_code == 429:
             logger.warning("AeroDataBox rate limit exceeded")
-            raise AeroDataBoxError("Flight data service rate limit exceeded", response.status_code)
+            raise AeroDataBoxError(
+                "Flight data service rate limit exceeded", response.status_code, retryable=True
+            )
 
         if not response.is_success:
             logger.error("AeroDataBox returned unexpected status %d", response.status_code)
             raise AeroDataBoxError(
                 f"Flight data service returned an error ({response.status_code})",
                 response.status_code,
+                retryable=response.status_code >= 500,
             )
 
         payload = response.json()
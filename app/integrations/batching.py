@@ -0,0 +1,67 @@
+"""Micro-batching for upstream APIs that accept several inputs per request."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+type BatchSender[T, R] = Callable[[list[T]], Awaitable[list[R]]]
+
+
+class MicroBatcher[T, R]:
+    """Collect concurrent submissions for up to `window_seconds` (or until
+    `max_batch_size` are waiting), send them in one call and hand each caller its result.
+
+    A batch goes out through the `send` of the call that opened it, so every sender
+    passed to one batcher must be interchangeable. If the send fails, every caller in
+    the batch gets the exception.
+    """
+
+    def __init__(self, window_seconds: float, max_batch_size: int) -> None:
+        if window_seconds < 0 or max_batch_size < 1:
+            raise ValueError("window_seconds must be >= 0 and max_batch_size at least 1")
+        self._window_seconds = window_seconds
+        self._max_batch_size = max_batch_size
+        self._pending: list[tuple[T, asyncio.Future[R]]] = []
+        self._send: BatchSender[T, R] | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._in_flight: set[asyncio.Task[None]] = set()
+
+    async def submit(self, item: T, send: BatchSender[T, R]) -> R:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[R] = loop.create_future()
+        if not self._pending:
+            self._send = send
+        self._pending.append((item, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch or self._send is None:
+            return
+        task = asyncio.create_task(self._send_batch(self._send, batch))
+        # Keep a reference until done; the loop only holds tasks weakly.
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send_batch(
+        self, send: BatchSender[T, R], batch: list[tuple[T, asyncio.Future[R]]]
+    ) -> None:
+        try:
+            results = await send([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch of {len(batch)} returned {len(results)} results")
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            # A caller that was cancelled while waiting no longer wants its result.
+            if not future.done():
+                future.set_result(result)
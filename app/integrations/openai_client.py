@@ -1,8 +1,13 @@
+import contextlib
 import json
 from dataclasses import dataclass
+from datetime import UTC
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 from app.core.config import get_settings
+from app.integrations.batching import MicroBatcher
+from app.util.time import utc_now
 
 settings = get_settings()
 
@@ -21,6 +26,36 @@ class OpenAIModerationResult:
     raw_result: dict[str, Any] | None
 
 
+def _parse_retry_after(value: str) -> float | None:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except ValueError:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - utc_now()).total_seconds())
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Delay requested by the upstream response behind `exc` (or its cause) through
+    `retry-after-ms` or `retry-after`, which may be seconds or an HTTP date."""
+    current: BaseException | None = exc
+    while current is not None:
+        headers = getattr(getattr(current, "response", None), "headers", None)
+        if headers:
+            if value := headers.get("retry-after-ms"):
+                with contextlib.suppress(ValueError):
+                    return max(0.0, float(value) / 1000)
+            if value := headers.get("retry-after"):
+                return _parse_retry_after(value)
+        current = current.__cause__
+    return None
+
+
 def _to_openai_strict_json_schema(schema: dict[str, Any]) -> dict[str, Any]:
     """Normalize Pydantic JSON Schema for OpenAI strict structured outputs."""
     normalized = dict(schema)
@@ -42,6 +77,14 @@ def _to_openai_strict_json_schema(schema: dict[str, Any]) -> dict[str, Any]:
     return visit(normalized)
 
 
+# Shared by every client: the API builds one per request, and batching only pays off
+# when calls from different requests and worker jobs end up in the same batch.
+moderation_batcher: MicroBatcher[str, OpenAIModerationResult] = MicroBatcher(
+    window_seconds=settings.openai_moderation_batch_window_seconds,
+    max_batch_size=settings.openai_moderation_batch_max_size,
+)
+
+
 class OpenAIClient:
     def __init__(self) -> None:
         self._client: Any | None = None
@@ -94,18 +137,27 @@ class OpenAIClient:
         )
 
     async def moderate_text(self, *, text: str) -> OpenAIModerationResult:
+        """Moderate `text`, batched with concurrent calls into one upstream request."""
+        return await moderation_batcher.submit(text, self.moderate_texts)
+
+    async def moderate_texts(self, texts: list[str]) -> list[OpenAIModerationResult]:
         client = self._get_client()
         response = await client.moderations.create(
             model=settings.openai_model_moderation,
-            input=text,
+            input=texts,
         )
-        result = response.results[0]
-        categories = result.categories.model_dump()
-        category_scores = result.category_scores.model_dump()
         raw = response.model_dump(mode="json")
-        return OpenAIModerationResult(
-            flagged=bool(result.flagged),
-            categories={key: bool(value) for key, value in categories.items()},
-            category_scores={key: float(value) for key, value in category_scores.items()},
-            raw_result=raw,
-        )
+        moderations: list[OpenAIModerationResult] = []
+        for index, result in enumerate(response.results):
+            categories = result.categories.model_dump()
+            category_scores = result.category_scores.model_dump()
+            moderations.append(
+                OpenAIModerationResult(
+                    flagged=bool(result.flagged),
+                    categories={key: bool(value) for key, value in categories.items()},
+                    category_scores={key: float(value) for key, value in category_scores.items()},
+                    # Shaped like a single-input response, so stored results read the same.
+                    raw_result={**raw, "results": [raw["results"][index]]},
+                )
+            )
+        return moderations
@@ -0,0 +1,130 @@
+"""Client-side protection for paid upstream APIs: a token-bucket limiter and a circuit breaker."""
+
+import asyncio
+import time
+from collections.abc import Callable
+from enum import Enum
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity`.
+
+    Callers wait for a token rather than being rejected outright, up to `max_wait`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self._rate = rate
+        self._capacity = float(capacity)
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    async def acquire(self, max_wait: float) -> bool:
+        """Take one token, sleeping until one is available. Returns False if that would
+        take longer than `max_wait` seconds; no token is consumed in that case."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self._rate
+                if wait > max_wait:
+                    return False
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+            return True
+
+
+class CircuitState(str, Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and fails fast for
+    `reset_timeout` seconds, then lets a single probe through (half-open). A successful
+    probe closes the circuit; a failed one re-opens it."""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self._reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    @property
+    def consecutive_failures(self) -> int:
+        return self._consecutive_failures
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit admits a probe (0 when not open)."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._reset_timeout - (self._clock() - self._opened_at))
+
+    def allow_request(self) -> CircuitState | None:
+        """The state the call was admitted in, or None when it is rejected. HALF_OPEN
+        means the call took the probe and must `release_probe` if it ends without an
+        outcome."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return state
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return state
+        return None
+
+    def record_success(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give up the half-open probe slot this call took, without recording an outcome."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self._consecutive_failures >= self._failure_threshold
+        ):
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+        self._probe_in_flight = False
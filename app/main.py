@@ -10,9 +10,16 @@ from app.api.v1.error_handlers import register_exception_handlers
 from app.core.config import get_settings
 from app.core.logging import get_logger, setup_logging
 from app.db.mongo_client import get_db
+from app.integrations.aerodatabox_client import aerodatabox_client
 from app.repositories.airport import ensure_airport_indexes
+from app.repositories.flight import ensure_flight_indexes
+from app.repositories.flight_lookup_cache import ensure_flight_lookup_cache_indexes
 from app.repositories.mediation import ensure_mediation_indexes
 from app.schemas.v1.health import HealthResponse
+from app.workers.flight_change_stream_worker import run_flight_change_stream_worker
+from app.workers.flight_expiration_worker import run_flight_expiration_worker
+from app.workers.flight_tracker_worker import run_flight_tracker_worker
+from app.workers.mediation_event_relay import run_mediation_event_relay
 from app.workers.mediation_worker import run_mediation_worker
 
 settings = get_settings()
@@ -25,19 +32,65 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     await ensure_mediation_indexes(get_db())
     await ensure_airport_indexes(get_db())
+    await ensure_flight_indexes(get_db())
+    await ensure_flight_lookup_cache_indexes(get_db())
+    await aerodatabox_client.start()
     worker_stop_event: asyncio.Event | None = None
     worker_task: asyncio.Task[None] | None = None
+    expiration_stop_event: asyncio.Event | None = None
+    expiration_task: asyncio.Task[None] | None = None
+    tracker_stop_event: asyncio.Event | None = None
+    tracker_task: asyncio.Task[None] | None = None
+    change_stream_stop_event: asyncio.Event | None = None
+    change_stream_task: asyncio.Task[None] | None = None
+    event_relay_stop_event: asyncio.Event | None = None
+    event_relay_task: asyncio.Task[None] | None = None
 
     if settings.mediation_worker_enabled:
         worker_stop_event = asyncio.Event()
         worker_task = asyncio.create_task(run_mediation_worker(worker_stop_event))
+    if settings.flight_expiration_worker_enabled:
+        expiration_stop_event = asyncio.Event()
+        expiration_task = asyncio.create_task(run_flight_expiration_worker(expiration_stop_event))
+    if settings.flight_tracker_enabled and settings.aerodatabox_api_key:
+        tracker_stop_event = asyncio.Event()
+        tracker_task = asyncio.create_task(run_flight_tracker_worker(tracker_stop_event))
+    if settings.flight_change_stream_enabled:
+        change_stream_stop_event = asyncio.Event()
+        change_stream_task = asyncio.create_task(
+            run_flight_change_stream_worker(change_stream_stop_event)
+        )
+    if settings.mediation_events_backend == "mongo":
+        event_relay_stop_event = asyncio.Event()
+        event_relay_task = asyncio.create_task(run_mediation_event_relay(event_relay_stop_event))
     try:
         yield
     finally:
         if worker_stop_event:
             worker_stop_event.set()
         if worker_task:
+            # Let in-flight mediation jobs finish; cancel only past the timeout.
+            await asyncio.wait(
+                {worker_task}, timeout=settings.mediation_worker_shutdown_timeout_seconds
+            )
             worker_task.cancel()
+        if expiration_stop_event:
+            expiration_stop_event.set()
+        if expiration_task:
+            expiration_task.cancel()
+        if tracker_stop_event:
+            tracker_stop_event.set()
+        if tracker_task:
+            tracker_task.cancel()
+        if change_stream_stop_event:
+            change_stream_stop_event.set()
+        if change_stream_task:
+            change_stream_task.cancel()
+        if event_relay_stop_event:
+            event_relay_stop_event.set()
+        if event_relay_task:
+            event_relay_task.cancel()
+        await aerodatabox_client.aclose()
 
         logger.info("Application shutdown")
 
@@ -23,3 +23,20 @@ class Flight(CustomModel):
     status: FlightStatus
     created_at: datetime
     updated_at: datetime | None = None
+    # Maintained by the flight tracker: best known actual or estimated times.
+    departure_estimated_at: datetime | None = None
+    arrival_estimated_at: datetime | None = None
+    live_status: str | None = None
+    live_updated_at: datetime | None = None
+    live_next_check_at: datetime | None = None
+
+
+class FlightLiveUpdate(CustomModel):
+    """Partial update written by the flight tracker; unset fields are left untouched."""
+
+    flight_id: MongoId
+    live_next_check_at: datetime
+    departure_estimated_at: datetime | None = None
+    arrival_estimated_at: datetime | None = None
+    live_status: str | None = None
+    live_updated_at: datetime | None = None
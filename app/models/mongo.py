@@ -1,6 +1,6 @@
 from typing import Any
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
 
 # Document type alias for MongoDB documents
 type Document = dict[str, Any]
@@ -9,3 +9,4 @@ type Query = dict[str, str | int | float | bool]
 
 type AsyncDB = AsyncIOMotorDatabase[Document]
 type AsyncClient = AsyncIOMotorClient[Document]
+type AsyncCollection = AsyncIOMotorCollection[Document]
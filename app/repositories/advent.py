@@ -7,6 +7,7 @@ from pymongo import ASCENDING
 from app.core.config import get_settings
 from app.db.mongo_client import get_db
 from app.models.mongo import AsyncDB
+from app.repositories.base import MongoRepository
 from app.schemas.v1.advent import Advent
 from app.schemas.v1.base import MongoId
 from app.schemas.v1.user import UserType
@@ -14,7 +15,7 @@ from app.schemas.v1.user import UserType
 settings = get_settings()
 
 
-class AdventRepository:
+class AdventRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._collection = db[settings.advent_collection_name]
 
@@ -37,11 +38,9 @@ class AdventRepository:
         return [Advent.model_validate(doc) for doc in docs]
 
     async def create_advent(self, advent_image_ref: Advent) -> Advent:
-        result = await self._collection.insert_one(
-            advent_image_ref.model_dump(by_alias=True, exclude_none=True)
+        return await self._insert(
+            self._collection, Advent, advent_image_ref.model_dump(by_alias=True, exclude_none=True)
         )
-        doc = await self._collection.find_one({"_id": result.inserted_id})
-        return Advent.model_validate(doc)
 
     async def delete_advent_by_id(self, advent_id: MongoId) -> bool:
         result = await self._collection.delete_one({"_id": ObjectId(advent_id)})
@@ -7,13 +7,14 @@ from pymongo import ASCENDING, TEXT
 
 from app.core.config import get_settings
 from app.db.mongo_client import AsyncDB, get_db
+from app.repositories.base import MongoRepository
 from app.schemas.v1.airport import Airport
 from app.schemas.v1.base import MongoId
 
 settings = get_settings()
 
 
-class AirportRepository:
+class AirportRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._collection = db[settings.airports_collection_name]
 
@@ -54,6 +55,16 @@ class AirportRepository:
         doc = await self._collection.find_one({"_id": ObjectId(airport_id)})
         return Airport.model_validate(doc) if doc else None
 
+    async def get_airports_by_ids(self, airport_ids: list[MongoId]) -> dict[str, Airport]:
+        """Fetch many airports in one `$in` query, keyed by their id."""
+        unique_ids = list(dict.fromkeys(airport_ids))
+        if not unique_ids:
+            return {}
+        cursor = self._collection.find({"_id": {"$in": [ObjectId(i) for i in unique_ids]}})
+        docs = await cursor.to_list(length=len(unique_ids))
+        airports = [Airport.model_validate(doc) for doc in docs]
+        return {str(airport.id): airport for airport in airports}
+
     async def get_airport_by_code(self, airport_code: str) -> Airport | None:
         doc = await self._collection.find_one(
             {
@@ -66,11 +77,9 @@ class AirportRepository:
         return Airport.model_validate(doc) if doc else None
 
     async def create_airport(self, airport: Airport) -> Airport:
-        result = await self._collection.insert_one(
-            airport.model_dump(by_alias=True, exclude_none=True)
+        return await self._insert(
+            self._collection, Airport, airport.model_dump(by_alias=True, exclude_none=True)
         )
-        doc = await self._collection.find_one({"_id": result.inserted_id})
-        return Airport.model_validate(doc)
 
     async def delete_airport_by_id(self, airport_id: MongoId) -> bool:
         result = await self._collection.delete_one({"_id": ObjectId(airport_id)})
@@ -0,0 +1,25 @@
+"""Shared write helpers for the Mongo repositories."""
+
+import bson
+from pydantic import BaseModel
+
+from app.models.mongo import AsyncCollection, Document
+
+
+class MongoRepository:
+    """Base for repositories that insert documents and return them as models.
+
+    An insert returns the model built from the payload we sent plus the `inserted_id`,
+    instead of reading the document back. The payload goes through a local BSON round
+    trip first, so the model matches what a later read returns (dates truncated to
+    milliseconds, ids as ObjectIds) without a second request to the server.
+    """
+
+    @staticmethod
+    async def _insert[M: BaseModel](
+        collection: AsyncCollection, model_type: type[M], payload: Document
+    ) -> M:
+        result = await collection.insert_one(payload)
+        return model_type.model_validate(
+            {**bson.decode(bson.encode(payload)), "_id": result.inserted_id}
+        )
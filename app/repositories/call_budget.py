@@ -0,0 +1,54 @@
+from typing import Annotated, Any
+
+from fastapi import Depends
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import get_settings
+from app.db.mongo_client import AsyncDB, get_db
+
+settings = get_settings()
+
+
+class CallBudgetRepository:
+    """Token buckets for upstream quotas, shared by every process that spends them.
+
+    Each bucket is one document refilled and drawn from in a single atomic update, timed
+    by the server clock (`$$NOW`), so replicas and worker processes draw from one budget.
+    """
+
+    def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
+        self._collection = db[settings.call_budgets_collection_name]
+
+    async def acquire(self, key: str, *, rate: float, capacity: int) -> bool:
+        """Take one token from bucket `key` (refilled at `rate` tokens per second, holding
+        at most `capacity`). Returns False, consuming nothing, when the bucket is empty."""
+        elapsed_seconds = {
+            "$divide": [{"$subtract": ["$$NOW", {"$ifNull": ["$updated_at", "$$NOW"]}]}, 1000]
+        }
+        refilled = {
+            "$min": [
+                capacity,
+                {
+                    "$add": [
+                        {"$ifNull": ["$tokens", capacity]},
+                        {"$multiply": [{"$max": [elapsed_seconds, 0]}, rate]},
+                    ]
+                },
+            ]
+        }
+        pipeline: list[dict[str, Any]] = [
+            {"$set": {"tokens": refilled, "updated_at": "$$NOW"}},
+            {"$set": {"granted": {"$gte": ["$tokens", 1]}}},
+            {"$set": {"tokens": {"$cond": ["$granted", {"$subtract": ["$tokens", 1]}, "$tokens"]}}},
+        ]
+        try:
+            doc = await self._collection.find_one_and_update(
+                {"_id": key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Another process created the bucket at the same moment; it exists now.
+            doc = await self._collection.find_one_and_update(
+                {"_id": key}, pipeline, return_document=ReturnDocument.AFTER
+            )
+        return bool(doc and doc["granted"])
@@ -1,63 +1,190 @@
-from typing import Annotated
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Annotated, Any
 
 from bson import ObjectId
 from fastapi import Depends
+from pymongo import ASCENDING, DESCENDING, UpdateOne
 
 from app.core.config import get_settings
 from app.db.mongo_client import AsyncDB, get_db
-from app.models.flight import Flight
-from app.models.mongo import Query
+from app.models.flight import Flight, FlightLiveUpdate
+from app.repositories.base import MongoRepository
 from app.schemas.v1.airport import Airport
 from app.schemas.v1.base import MongoId
-from app.schemas.v1.flight import FlightStatus
+from app.schemas.v1.flight import (
+    FlightChangeEvent,
+    FlightChangeOperation,
+    FlightCursorPayload,
+    FlightStatus,
+)
+from app.util.time import utc_now
 
 settings = get_settings()
 
+_CHANGE_OPERATIONS = {
+    "insert": FlightChangeOperation.INSERT,
+    "update": FlightChangeOperation.UPDATE,
+    "replace": FlightChangeOperation.UPDATE,
+    "delete": FlightChangeOperation.DELETE,
+}
 
-class FlightRepository:
+
+def _status_query(status: FlightStatus, now: datetime) -> dict[str, Any]:
+    # Expiry is applied in bulk on a timer, so ACTIVE documents may briefly lag behind
+    # the clock. Guard on arrival_at so readers never see a flight that already landed.
+    if status == FlightStatus.ACTIVE:
+        return {"status": status, "arrival_at": {"$gt": now}}
+    return {"status": status}
+
+
+class FlightRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._flights = db[settings.flights_collection_name]
 
+    async def ensure_indexes(self) -> None:
+        await self._flights.create_index(
+            [("flight_number", ASCENDING), ("departure_at", DESCENDING)]
+        )
+        # Every listing sorts on (<time field>, _id) for keyset pagination, so _id is the
+        # trailing key of each index to keep the sort index-backed.
+        await self._flights.create_index([("departure_at", DESCENDING), ("_id", DESCENDING)])
+        await self._flights.create_index(
+            [("status", ASCENDING), ("departure_at", ASCENDING), ("_id", ASCENDING)]
+        )
+        await self._flights.create_index(
+            [
+                ("departure_airport_id", ASCENDING),
+                ("status", ASCENDING),
+                ("departure_at", ASCENDING),
+                ("_id", ASCENDING),
+            ]
+        )
+        await self._flights.create_index(
+            [
+                ("arrival_airport_id", ASCENDING),
+                ("status", ASCENDING),
+                ("arrival_at", ASCENDING),
+                ("_id", ASCENDING),
+            ]
+        )
+
+    async def _find_page(
+        self,
+        query: dict[str, Any],
+        *,
+        sort_field: str,
+        direction: int,
+        limit: int | None,
+        cursor: FlightCursorPayload | None,
+        window_from: datetime | None,
+        window_to: datetime | None,
+    ) -> list[Flight]:
+        bounds: dict[str, datetime] = {}
+        if window_from is not None:
+            bounds["$gte"] = window_from
+        if window_to is not None:
+            bounds["$lt"] = window_to
+        if bounds:
+            query = {**query, sort_field: {**query.get(sort_field, {}), **bounds}}
+
+        if cursor is not None:
+            op = "$lt" if direction == DESCENDING else "$gt"
+            query = {
+                "$and": [
+                    query,
+                    {
+                        "$or": [
+                            {sort_field: {op: cursor.sort_at}},
+                            {sort_field: cursor.sort_at, "_id": {op: ObjectId(cursor.id)}},
+                        ]
+                    },
+                ]
+            }
+
+        find = self._flights.find(query).sort([(sort_field, direction), ("_id", direction)])
+        if limit is not None:
+            find = find.limit(limit)
+        docs = await find.to_list(length=limit)
+        return [Flight.model_validate(doc) for doc in docs]
+
     async def _get_flights_by_airport(
         self,
         field: str,
         airport_id: MongoId | None,
         status: FlightStatus | None,
         sort_field: str,
+        limit: int | None,
+        cursor: FlightCursorPayload | None,
+        window_from: datetime | None,
+        window_to: datetime | None,
     ) -> list[Flight]:
         if airport_id is None:
             return []
 
-        query: Query = {field: airport_id}
+        query: dict[str, Any] = {field: airport_id}
         if status is not None:
-            query["status"] = status
+            query.update(_status_query(status, utc_now()))
 
-        cursor = self._flights.find(query).sort(sort_field, -1)
-        docs = await cursor.to_list(length=None)
-        return [Flight.model_validate(doc) for doc in docs]
+        return await self._find_page(
+            query,
+            sort_field=sort_field,
+            direction=DESCENDING,
+            limit=limit,
+            cursor=cursor,
+            window_from=window_from,
+            window_to=window_to,
+        )
 
-    async def list_flights(self) -> list[Flight]:
-        cursor = self._flights.find().sort("departure_at", -1)
-        docs = await cursor.to_list(length=None)
-        return [Flight.model_validate(doc) for doc in docs]
+    async def list_flights(
+        self,
+        *,
+        limit: int | None = None,
+        cursor: FlightCursorPayload | None = None,
+        window_from: datetime | None = None,
+        window_to: datetime | None = None,
+    ) -> list[Flight]:
+        return await self._find_page(
+            {},
+            sort_field="departure_at",
+            direction=DESCENDING,
+            limit=limit,
+            cursor=cursor,
+            window_from=window_from,
+            window_to=window_to,
+        )
 
-    async def list_active_flights(self) -> list[Flight]:
-        cursor = self._flights.find({"status": FlightStatus.ACTIVE})
-        docs = await cursor.to_list(length=None)
-        return [Flight.model_validate(doc) for doc in docs]
+    async def list_active_flights(
+        self,
+        *,
+        limit: int | None = None,
+        cursor: FlightCursorPayload | None = None,
+        window_from: datetime | None = None,
+        window_to: datetime | None = None,
+    ) -> list[Flight]:
+        return await self._find_page(
+            _status_query(FlightStatus.ACTIVE, utc_now()),
+            sort_field="departure_at",
+            direction=ASCENDING,
+            limit=limit,
+            cursor=cursor,
+            window_from=window_from,
+            window_to=window_to,
+        )
 
     async def get_most_recent_active_flight(self) -> Flight | None:
         doc = await self._flights.find_one(
-            {"status": FlightStatus.ACTIVE}, sort=[("departure_at", 1)]
+            _status_query(FlightStatus.ACTIVE, utc_now()), sort=[("departure_at", 1)]
         )
         if doc is None:
             return None
         return Flight.model_validate(doc)
 
     async def create_flight(self, flight: Flight) -> Flight:
-        result = await self._flights.insert_one(flight.model_dump(by_alias=True, exclude_none=True))
-        doc = await self._flights.find_one({"_id": result.inserted_id})
-        return Flight.model_validate(doc)
+        return await self._insert(
+            self._flights, Flight, flight.model_dump(by_alias=True, exclude_none=True)
+        )
 
     async def get_flight(self, flight_id: MongoId) -> Flight | None:
         doc = await self._flights.find_one({"_id": ObjectId(flight_id)})
@@ -65,6 +192,12 @@ class FlightRepository:
             return Flight.model_validate(doc)
         return None
 
+    async def get_flight_by_flight_number(self, flight_number: str) -> Flight | None:
+        doc = await self._flights.find_one(
+            {"flight_number": flight_number}, sort=[("departure_at", DESCENDING)]
+        )
+        return Flight.model_validate(doc) if doc else None
+
     async def update_flight(self, flight_id: MongoId, flight: Flight) -> Flight | None:
         await self._flights.update_one(
             {"_id": ObjectId(flight_id)},
@@ -72,30 +205,123 @@ class FlightRepository:
         )
         return await self.get_flight(flight_id)
 
+    async def expire_flights(self, now: datetime) -> int:
+        """Mark every ACTIVE flight that has already arrived as EXPIRED in one write."""
+        result = await self._flights.update_many(
+            {"status": FlightStatus.ACTIVE, "arrival_at": {"$lt": now}},
+            {"$set": {"status": FlightStatus.EXPIRED, "updated_at": now}},
+        )
+        return int(result.modified_count)
+
+    async def list_flights_due_for_tracking(
+        self, now: datetime, departs_before: datetime, limit: int
+    ) -> list[Flight]:
+        """ACTIVE flights departing before `departs_before` whose next live check is due."""
+        query = {
+            **_status_query(FlightStatus.ACTIVE, now),
+            "departure_at": {"$lte": departs_before},
+            "$or": [{"live_next_check_at": None}, {"live_next_check_at": {"$lte": now}}],
+        }
+        cursor = self._flights.find(query).sort("departure_at", ASCENDING).limit(limit)
+        docs = await cursor.to_list(length=limit)
+        return [Flight.model_validate(doc) for doc in docs]
+
+    async def claim_for_tracking(
+        self, flight_id: MongoId, now: datetime, lease_until: datetime
+    ) -> bool:
+        """Lease a due flight to this tracker by pushing its next check to `lease_until`.
+        False when another tracker claimed it first."""
+        result = await self._flights.update_one(
+            {
+                "_id": ObjectId(flight_id),
+                "$or": [{"live_next_check_at": None}, {"live_next_check_at": {"$lte": now}}],
+            },
+            {"$set": {"live_next_check_at": lease_until}},
+        )
+        return result.modified_count > 0
+
+    async def apply_live_updates(self, updates: list[FlightLiveUpdate]) -> int:
+        """Write a batch of tracker results in one unordered bulk write."""
+        if not updates:
+            return 0
+        result = await self._flights.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": ObjectId(update.flight_id)},
+                    {"$set": update.model_dump(exclude={"flight_id"}, exclude_none=True)},
+                )
+                for update in updates
+            ],
+            ordered=False,
+        )
+        return int(result.modified_count)
+
     async def delete_flight(self, flight_id: MongoId) -> bool:
         result = await self._flights.delete_one({"_id": ObjectId(flight_id)})
         return result.deleted_count > 0
 
     async def delete_flight_by_code(self, flight_code: str) -> bool:
-        result = await self._flights.delete_one({"code": flight_code})
+        result = await self._flights.delete_one({"flight_number": flight_code})
         return result.deleted_count > 0
 
+    @asynccontextmanager
+    async def watch_changes(self) -> AsyncIterator[AsyncIterator[FlightChangeEvent]]:
+        """Open a change stream on the collection. Requires a replica set; raises
+        OperationFailure on a standalone server."""
+        pipeline = [{"$match": {"operationType": {"$in": list(_CHANGE_OPERATIONS)}}}]
+        async with self._flights.watch(pipeline) as stream:
+
+            async def events() -> AsyncIterator[FlightChangeEvent]:
+                async for change in stream:
+                    yield FlightChangeEvent(
+                        operation=_CHANGE_OPERATIONS[change["operationType"]],
+                        flight_id=str(change["documentKey"]["_id"]),
+                    )
+
+            yield events()
+
     async def get_flights_by_departure_airport(
-        self, airport: Airport, status: FlightStatus | None = None
+        self,
+        airport: Airport,
+        status: FlightStatus | None = None,
+        *,
+        limit: int | None = None,
+        cursor: FlightCursorPayload | None = None,
+        window_from: datetime | None = None,
+        window_to: datetime | None = None,
     ) -> list[Flight]:
         return await self._get_flights_by_airport(
             field="departure_airport_id",
             airport_id=airport.id,
             status=status,
             sort_field="departure_at",
+            limit=limit,
+            cursor=cursor,
+            window_from=window_from,
+            window_to=window_to,
         )
 
     async def get_flights_by_arrival_airport(
-        self, airport: Airport, status: FlightStatus | None = None
+        self,
+        airport: Airport,
+        status: FlightStatus | None = None,
+        *,
+        limit: int | None = None,
+        cursor: FlightCursorPayload | None = None,
+        window_from: datetime | None = None,
+        window_to: datetime | None = None,
     ) -> list[Flight]:
         return await self._get_flights_by_airport(
             field="arrival_airport_id",
             airport_id=airport.id,
             status=status,
             sort_field="arrival_at",
+            limit=limit,
+            cursor=cursor,
+            window_from=window_from,
+            window_to=window_to,
         )
+
+
+async def ensure_flight_indexes(db: AsyncDB) -> None:
+    await FlightRepository(db).ensure_indexes()
@@ -0,0 +1,37 @@
+from typing import Annotated
+
+from fastapi import Depends
+from pymongo import ASCENDING
+
+from app.core.config import get_settings
+from app.db.mongo_client import AsyncDB, get_db
+from app.schemas.v1.flight_lookup import FlightLookupCacheEntry
+from app.util.time import utc_now
+
+settings = get_settings()
+
+
+class FlightLookupCacheRepository:
+    """Shared store for normalized AeroDataBox lookups, keyed by flight number and window."""
+
+    def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
+        self._collection = db[settings.flight_lookup_cache_collection_name]
+
+    async def ensure_indexes(self) -> None:
+        # Mongo's TTL monitor deletes documents once they can no longer be served stale.
+        await self._collection.create_index([("stale_until", ASCENDING)], expireAfterSeconds=0)
+
+    async def get_entry(self, key: str) -> FlightLookupCacheEntry | None:
+        # The TTL monitor only runs about once a minute, so retention is also enforced on read.
+        doc = await self._collection.find_one({"_id": key, "stale_until": {"$gt": utc_now()}})
+        return FlightLookupCacheEntry.model_validate(doc) if doc else None
+
+    async def put_entry(self, key: str, entry: FlightLookupCacheEntry) -> None:
+        await self._collection.replace_one({"_id": key}, entry.model_dump(), upsert=True)
+
+    async def clear(self) -> None:
+        await self._collection.delete_many({})
+
+
+async def ensure_flight_lookup_cache_indexes(db: AsyncDB) -> None:
+    await FlightLookupCacheRepository(db).ensure_indexes()
@@ -6,6 +6,7 @@ from fastapi import Depends
 from app.core.config import get_settings
 from app.db.mongo_client import get_db
 from app.models.mongo import AsyncDB
+from app.repositories.base import MongoRepository
 from app.schemas.v1.base import MongoId
 from app.schemas.v1.image import ImageCursorPayload, ImageMetadata, ImageMetadataUpdate
 from app.schemas.v1.user import UserType
@@ -14,16 +15,14 @@ from app.util.time import utc_now
 settings = get_settings()
 
 
-class ImageMetadataRepository:
+class ImageMetadataRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._collection = db[settings.image_metadata_collection_name]
 
     async def create_image_metadata(self, metadata: ImageMetadata) -> ImageMetadata:
-        result = await self._collection.insert_one(
-            metadata.model_dump(by_alias=True, exclude_none=True)
+        return await self._insert(
+            self._collection, ImageMetadata, metadata.model_dump(by_alias=True, exclude_none=True)
         )
-        doc = await self._collection.find_one({"_id": result.inserted_id})
-        return ImageMetadata.model_validate(doc)
 
     async def get_by_user_type(self, user_type: UserType) -> list[ImageMetadata]:
         cursor = self._collection.find({"uploaded_by": user_type, "deleted_at": None}).sort(
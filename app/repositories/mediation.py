@@ -1,5 +1,7 @@
-from collections.abc import Mapping
-from datetime import timedelta
+import random
+from collections.abc import AsyncIterator, Collection, Mapping
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 from typing import Annotated, Any
 
 from bson import ObjectId
@@ -9,7 +11,9 @@ from pymongo.errors import DuplicateKeyError
 
 from app.core.config import get_settings
 from app.db.mongo_client import AsyncDB, get_db
-from app.schemas.v1.base import MongoId
+from app.models.mongo import Document
+from app.repositories.base import MongoRepository
+from app.schemas.v1.base import MongoId, datetime_to_sortable_str
 from app.schemas.v1.mediation import (
     AIJobStatus,
     MediationAdvice,
@@ -18,6 +22,8 @@ from app.schemas.v1.mediation import (
     MediationAIReflection,
     MediationAuthorType,
     MediationComment,
+    MediationCommentCursorPayload,
+    MediationEvent,
     MediationModerationResult,
     MediationPerspective,
     MediationSession,
@@ -35,7 +41,64 @@ def _oid(value: MongoId | str | None) -> ObjectId | None:
     return ObjectId(value) if value else None
 
 
-class MediationSessionRepository:
+def job_rank_at(created_at: datetime, priority: int, queued_in_session: int) -> datetime:
+    """Claim order of a job (earliest first), see `mediation_job_priority_step_seconds`."""
+    return created_at + timedelta(
+        seconds=priority * settings.mediation_job_priority_step_seconds
+        + queued_in_session * settings.mediation_job_session_fairness_seconds
+    )
+
+
+def retry_delay_seconds(attempts: int, retry_after: float | None = None) -> float:
+    """Backoff before retrying a job that has failed `attempts` times, never shorter
+    than an upstream `retry_after`."""
+    ceiling = min(
+        settings.mediation_job_retry_max_delay_seconds,
+        settings.mediation_job_retry_base_delay_seconds * 2 ** max(attempts - 1, 0),
+    )
+    # Equal jitter: retries of jobs that failed together spread out, but never fire early.
+    delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+    return max(delay, retry_after or 0.0)
+
+
+def _due(now: datetime) -> dict[str, Any]:
+    return {"$or": [{"next_attempt_at": None}, {"next_attempt_at": {"$lte": now}}]}
+
+
+def _lease_expired(stale_before: datetime) -> dict[str, Any]:
+    """Filter for jobs whose worker has not heartbeated since `stale_before`. Jobs
+    claimed before leases existed have no heartbeat and fall back to started_at."""
+    return {
+        "$or": [
+            {"heartbeat_at": {"$lte": stale_before}},
+            {"heartbeat_at": None, "started_at": {"$lte": stale_before}},
+            {"heartbeat_at": None, "started_at": None},
+        ]
+    }
+
+
+# Everything a session list item is built from.
+_SESSION_LIST_PROJECTION = {
+    field: 1
+    for field in (
+        "title",
+        "description",
+        "created_by_user_type",
+        "status",
+        "safety_status",
+        "created_at",
+        "updated_at",
+        "resolved_at",
+        "archived_at",
+        "resolved_by_user_types",
+        "archived_by_user_types",
+        "latest_advice_id",
+        "perspective_statuses",
+    )
+}
+
+
+class MediationSessionRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._collection = db[settings.mediation_sessions_collection_name]
 
@@ -45,12 +108,20 @@ class MediationSessionRepository:
         await self._collection.create_index([("safety_status", ASCENDING)])
 
     async def create(self, session: MediationSession) -> MediationSession:
-        result = await self._collection.insert_one(session.serialize())
-        doc = await self._collection.find_one({"_id": result.inserted_id})
-        return MediationSession.model_validate(doc)
-
-    async def list_all(self) -> list[MediationSession]:
-        docs = await self._collection.find({}).sort("created_at", DESCENDING).to_list(length=None)
+        return await self._insert(self._collection, MediationSession, session.serialize())
+
+    async def list_page(
+        self, *, limit: int, before_id: MongoId | None = None
+    ) -> list[MediationSession]:
+        """Newest sessions first. Ids grow with creation time, so `_id` is both the sort
+        and the keyset, served by the default index."""
+        query: dict[str, Any] = {"_id": {"$lt": _oid(before_id)}} if before_id else {}
+        docs = (
+            await self._collection.find(query, _SESSION_LIST_PROJECTION)
+            .sort("_id", DESCENDING)
+            .limit(limit)
+            .to_list(length=limit)
+        )
         return [MediationSession.model_validate(doc) for doc in docs]
 
     async def get_by_id(self, session_id: MongoId) -> MediationSession | None:
@@ -125,9 +196,30 @@ class MediationSessionRepository:
         )
 
 
+def session_summary_write(doc: Mapping[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Filter and update that copy a perspective's status onto its session. One field per
+    user, so the two users' updates never overwrite each other, and each only moves
+    forward: a transition that lands after a newer one for the same user is dropped."""
+    user_type = doc["user_type"]
+    synced_at = f"perspective_status_updated_at.{user_type}"
+    return (
+        {
+            "_id": _oid(doc["session_id"]),
+            "$or": [{synced_at: {"$exists": False}}, {synced_at: {"$lte": doc["updated_at"]}}],
+        },
+        {
+            "$set": {
+                f"perspective_statuses.{user_type}": doc["status"],
+                synced_at: doc["updated_at"],
+            }
+        },
+    )
+
+
 class MediationPerspectiveRepository:
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._collection = db[settings.mediation_perspectives_collection_name]
+        self._sessions = db[settings.mediation_sessions_collection_name]
 
     async def ensure_indexes(self) -> None:
         await self._collection.create_index(
@@ -135,6 +227,9 @@ class MediationPerspectiveRepository:
         )
         await self._collection.create_index([("session_id", ASCENDING), ("status", ASCENDING)])
 
+    async def _sync_session_summary(self, doc: Mapping[str, Any]) -> None:
+        await self._sessions.update_one(*session_summary_write(doc))
+
     async def get_by_session_and_user(
         self, session_id: MongoId, user_type: UserType
     ) -> MediationPerspective | None:
@@ -159,6 +254,7 @@ class MediationPerspectiveRepository:
             upsert=True,
             return_document=ReturnDocument.AFTER,
         )
+        await self._sync_session_summary(doc)
         return MediationPerspective.model_validate(doc)
 
     async def mark_pending_review(self, perspective_id: MongoId) -> MediationPerspective | None:
@@ -174,6 +270,8 @@ class MediationPerspectiveRepository:
             },
             return_document=ReturnDocument.AFTER,
         )
+        if doc:
+            await self._sync_session_summary(doc)
         return MediationPerspective.model_validate(doc) if doc else None
 
     async def lock_perspective(
@@ -194,6 +292,8 @@ class MediationPerspectiveRepository:
             },
             return_document=ReturnDocument.AFTER,
         )
+        if doc:
+            await self._sync_session_summary(doc)
         return MediationPerspective.model_validate(doc) if doc else None
 
     async def mark_flagged(
@@ -211,6 +311,8 @@ class MediationPerspectiveRepository:
             },
             return_document=ReturnDocument.AFTER,
         )
+        if doc:
+            await self._sync_session_summary(doc)
         return MediationPerspective.model_validate(doc) if doc else None
 
     async def count_locked_for_session(self, session_id: MongoId) -> int:
@@ -229,7 +331,7 @@ class MediationPerspectiveRepository:
         return [MediationPerspective.model_validate(doc) for doc in docs]
 
 
-class MediationModerationRepository:
+class MediationModerationRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._collection = db[settings.mediation_moderation_results_collection_name]
 
@@ -237,12 +339,10 @@ class MediationModerationRepository:
         await self._collection.create_index([("entity_type", ASCENDING), ("entity_id", ASCENDING)])
 
     async def insert(self, result: MediationModerationResult) -> MediationModerationResult:
-        inserted = await self._collection.insert_one(result.serialize())
-        doc = await self._collection.find_one({"_id": inserted.inserted_id})
-        return MediationModerationResult.model_validate(doc)
+        return await self._insert(self._collection, MediationModerationResult, result.serialize())
 
 
-class MediationAIRepository:
+class MediationAIRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._reflections = db[settings.mediation_ai_reflections_collection_name]
         self._advices = db[settings.mediation_advices_collection_name]
@@ -255,9 +355,7 @@ class MediationAIRepository:
         await self._advices.create_index([("session_id", ASCENDING), ("created_at", DESCENDING)])
 
     async def insert_reflection(self, reflection: MediationAIReflection) -> MediationAIReflection:
-        result = await self._reflections.insert_one(reflection.serialize())
-        doc = await self._reflections.find_one({"_id": result.inserted_id})
-        return MediationAIReflection.model_validate(doc)
+        return await self._insert(self._reflections, MediationAIReflection, reflection.serialize())
 
     async def get_reflection_for_user(
         self, session_id: MongoId, user_type: UserType
@@ -269,9 +367,7 @@ class MediationAIRepository:
         return MediationAIReflection.model_validate(doc) if doc else None
 
     async def insert_advice(self, advice: MediationAdvice) -> MediationAdvice:
-        result = await self._advices.insert_one(advice.serialize())
-        doc = await self._advices.find_one({"_id": result.inserted_id})
-        return MediationAdvice.model_validate(doc)
+        return await self._insert(self._advices, MediationAdvice, advice.serialize())
 
     async def get_latest_advice(self, session_id: MongoId) -> MediationAdvice | None:
         doc = await self._advices.find_one(
@@ -281,12 +377,10 @@ class MediationAIRepository:
         return MediationAdvice.model_validate(doc) if doc else None
 
     async def insert_ai_comment(self, comment: MediationComment) -> MediationComment:
-        result = await self._comments.insert_one(comment.serialize())
-        doc = await self._comments.find_one({"_id": result.inserted_id})
-        return MediationComment.model_validate(doc)
+        return await self._insert(self._comments, MediationComment, comment.serialize())
 
 
-class MediationCommentRepository:
+class MediationCommentRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._collection = db[settings.mediation_comments_collection_name]
 
@@ -294,6 +388,10 @@ class MediationCommentRepository:
         await self._collection.create_index(
             [("session_id", ASCENDING), ("parent_comment_id", ASCENDING), ("created_at", ASCENDING)]
         )
+        # Keyset pagination and tail reads over a session's whole discussion.
+        await self._collection.create_index(
+            [("session_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)]
+        )
 
     async def create_user_comment(
         self,
@@ -313,9 +411,7 @@ class MediationCommentRepository:
             created_at=now,
             moderation_result_id=moderation_result_id,
         )
-        result = await self._collection.insert_one(comment.serialize())
-        doc = await self._collection.find_one({"_id": result.inserted_id})
-        return MediationComment.model_validate(doc)
+        return await self._insert(self._collection, MediationComment, comment.serialize())
 
     async def create_ai_comment(
         self,
@@ -334,18 +430,51 @@ class MediationCommentRepository:
             created_at=now,
             ai_job_id=ai_job_id,
         )
-        result = await self._collection.insert_one(comment.serialize())
-        doc = await self._collection.find_one({"_id": result.inserted_id})
-        return MediationComment.model_validate(doc)
+        return await self._insert(self._collection, MediationComment, comment.serialize())
 
-    async def list_for_session(self, session_id: MongoId) -> list[MediationComment]:
+    async def list_page(
+        self,
+        session_id: MongoId,
+        *,
+        limit: int,
+        cursor: MediationCommentCursorPayload | None = None,
+        since: datetime | None = None,
+    ) -> list[MediationComment]:
+        """Oldest first: comments after `cursor` and, with `since`, created after it."""
+        query: dict[str, Any] = {"session_id": session_id}
+        if since is not None:
+            query["created_at"] = {"$gt": datetime_to_sortable_str(since)}
+        if cursor is not None:
+            created_at = datetime_to_sortable_str(cursor.created_at)
+            query = {
+                "$and": [
+                    query,
+                    {
+                        "$or": [
+                            {"created_at": {"$gt": created_at}},
+                            {"created_at": created_at, "_id": {"$gt": _oid(cursor.id)}},
+                        ]
+                    },
+                ]
+            }
         docs = (
-            await self._collection.find({"session_id": session_id})
-            .sort("created_at", ASCENDING)
-            .to_list(length=None)
+            await self._collection.find(query)
+            .sort([("created_at", ASCENDING), ("_id", ASCENDING)])
+            .limit(limit)
+            .to_list(length=limit)
         )
         return [MediationComment.model_validate(doc) for doc in docs]
 
+    async def list_recent(self, session_id: MongoId, limit: int) -> list[MediationComment]:
+        """The newest `limit` comments, oldest first; reads only those from the index."""
+        docs = (
+            await self._collection.find({"session_id": session_id})
+            .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit)
+            .to_list(length=limit)
+        )
+        return [MediationComment.model_validate(doc) for doc in reversed(docs)]
+
     async def get_by_id(self, comment_id: MongoId) -> MediationComment | None:
         doc = await self._collection.find_one({"_id": _oid(comment_id)})
         return MediationComment.model_validate(doc) if doc else None
@@ -357,24 +486,87 @@ class MediationJobRepository:
 
     async def ensure_indexes(self) -> None:
         await self._collection.create_index([("idempotency_key", ASCENDING)], unique=True)
-        await self._collection.create_index([("status", ASCENDING), ("created_at", ASCENDING)])
+        # Claims match on status, sort on rank_at and skip jobs whose retry is not yet due.
+        await self._collection.create_index(
+            [("status", ASCENDING), ("rank_at", ASCENDING), ("next_attempt_at", ASCENDING)]
+        )
+        await self._collection.create_index([("session_id", ASCENDING), ("status", ASCENDING)])
+        await self._collection.create_index([("session_id", ASCENDING), ("created_at", DESCENDING)])
+        # At most one PROCESSING job per session across every worker process, so a
+        # session's jobs run one at a time, in rank order.
+        await self._collection.create_index(
+            [("session_id", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"status": AIJobStatus.PROCESSING},
+            name="one_processing_job_per_session",
+        )
 
     async def create_job_if_not_exists(self, job: MediationAIJob) -> MediationAIJob:
+        # The session's queue depth sets the new job's rank. It is counted first, in its own
+        # round trip, because an update cannot read other documents.
+        queued = await self._collection.count_documents(
+            {"session_id": job.session_id, "status": AIJobStatus.PENDING}
+        )
+        job = job.model_copy(update={"rank_at": job_rank_at(job.created_at, job.priority, queued)})
+
+        async def upsert() -> Document | None:
+            return await self._collection.find_one_and_update(
+                {"idempotency_key": job.idempotency_key},
+                {"$setOnInsert": job.serialize()},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+
+        # The same write whether the job is new or already queued: the upsert returns the
+        # stored job, including the state a worker may have moved it to since, with no
+        # separate existence check or read-back.
         try:
-            result = await self._collection.insert_one(job.serialize())
-            doc = await self._collection.find_one({"_id": result.inserted_id})
+            doc = await upsert()
         except DuplicateKeyError:
-            doc = await self._collection.find_one({"idempotency_key": job.idempotency_key})
+            # Two concurrent upserts of the same key: the loser's retry matches the winner's
+            # job, or inserts again if that job was deleted in between.
+            doc = await upsert()
+        if doc is None:
+            raise RuntimeError(f"Upsert of job {job.idempotency_key!r} returned no document")
         return MediationAIJob.model_validate(doc)
 
-    async def get_latest_by_type(
-        self, session_id: MongoId, job_type: MediationAIJobType
-    ) -> MediationAIJob | None:
-        doc = await self._collection.find_one(
-            {"session_id": session_id, "job_type": job_type},
-            sort=[("created_at", DESCENDING)],
-        )
-        return MediationAIJob.model_validate(doc) if doc else None
+    @asynccontextmanager
+    async def watch_claimable(self) -> AsyncIterator[AsyncIterator[None]]:
+        """Change stream that yields whenever a job may have become claimable: a PENDING
+        insert, or an update back to PENDING (a retry). Requires a replica set; raises
+        OperationFailure on a standalone server."""
+        pipeline = [
+            {
+                "$match": {
+                    "$or": [
+                        {"operationType": "insert", "fullDocument.status": AIJobStatus.PENDING},
+                        {
+                            "operationType": "update",
+                            "updateDescription.updatedFields.status": AIJobStatus.PENDING,
+                        },
+                    ]
+                }
+            }
+        ]
+        async with self._collection.watch(pipeline) as stream:
+
+            async def changes() -> AsyncIterator[None]:
+                async for _ in stream:
+                    yield None
+
+            yield changes()
+
+    async def latest_status_by_type(
+        self, session_id: MongoId
+    ) -> dict[MediationAIJobType, AIJobStatus]:
+        """Status of the newest job of each type in the session, in one round trip."""
+        pipeline: list[dict[str, Any]] = [
+            {"$match": {"session_id": session_id}},
+            {"$sort": {"created_at": DESCENDING}},
+            {"$group": {"_id": "$job_type", "status": {"$first": "$status"}}},
+        ]
+        docs = await self._collection.aggregate(pipeline).to_list(length=None)
+        return {MediationAIJobType(doc["_id"]): AIJobStatus(doc["status"]) for doc in docs}
 
     async def fail_exhausted_stale_processing_jobs(self, stale_after_seconds: float) -> int:
         now = utc_now()
@@ -383,11 +575,7 @@ class MediationJobRepository:
             {
                 "status": AIJobStatus.PROCESSING,
                 "$expr": {"$gte": ["$attempts", "$max_attempts"]},
-                "$or": [
-                    {"started_at": {"$lte": stale_before}},
-                    {"started_at": None},
-                    {"started_at": {"$exists": False}},
-                ],
+                **_lease_expired(stale_before),
             },
             {
                 "$set": {
@@ -400,78 +588,175 @@ class MediationJobRepository:
         return int(result.modified_count)
 
     async def claim_next_pending_job(
-        self, stale_after_seconds: float | None = None
+        self,
+        stale_after_seconds: float | None = None,
+        *,
+        owner: str | None = None,
+        job_types: Collection[MediationAIJobType] | None = None,
+        exclude_session_ids: Collection[str] = (),
     ) -> MediationAIJob | None:
         now = utc_now()
-        retryable_status_filter: dict[str, Any] = {"status": AIJobStatus.PENDING}
+        retryable_status_filter: dict[str, Any] = {"status": AIJobStatus.PENDING, **_due(now)}
         if stale_after_seconds is not None:
             stale_before = now - timedelta(seconds=stale_after_seconds)
             retryable_status_filter = {
                 "$or": [
-                    {"status": AIJobStatus.PENDING},
-                    {
-                        "status": AIJobStatus.PROCESSING,
-                        "$or": [
-                            {"started_at": {"$lte": stale_before}},
-                            {"started_at": None},
-                            {"started_at": {"$exists": False}},
-                        ],
-                    },
+                    {"status": AIJobStatus.PENDING, **_due(now)},
+                    {"status": AIJobStatus.PROCESSING, **_lease_expired(stale_before)},
                 ]
             }
-        doc = await self._collection.find_one_and_update(
-            {
-                **retryable_status_filter,
-                "$expr": {"$lt": ["$attempts", "$max_attempts"]},
-            },
-            {
-                "$set": {
-                    "status": AIJobStatus.PROCESSING,
-                    "started_at": now,
-                    "updated_at": now,
-                },
-                "$inc": {"attempts": 1},
+        claimable: dict[str, Any] = {"$expr": {"$lt": ["$attempts", "$max_attempts"]}}
+        if job_types is not None:
+            claimable["job_type"] = {"$in": list(job_types)}
+        claim_filter = {**retryable_status_filter, **claimable}
+        claim = {
+            "$set": {
+                "status": AIJobStatus.PROCESSING,
+                "lease_owner": owner,
+                "started_at": now,
+                "heartbeat_at": now,
+                "updated_at": now,
             },
-            sort=[("created_at", ASCENDING)],
-            return_document=ReturnDocument.AFTER,
+            "$inc": {"attempts": 1},
+        }
+        excluded = set(exclude_session_ids)
+        while True:
+            query = {**claim_filter}
+            if excluded:
+                query["session_id"] = {"$nin": sorted(excluded)}
+            try:
+                doc = await self._collection.find_one_and_update(
+                    query,
+                    claim,
+                    sort=[("rank_at", ASCENDING), ("created_at", ASCENDING)],
+                    return_document=ReturnDocument.AFTER,
+                )
+            except DuplicateKeyError as exc:
+                # The best-ranked job belongs to a session that already has a PROCESSING
+                # job, possibly in another process. Reclaim that job if its lease expired,
+                # otherwise leave the session alone and claim from the next one.
+                session_id = (exc.details or {}).get("keyValue", {}).get("session_id")
+                if session_id is None or session_id in excluded:
+                    raise
+                if stale_after_seconds is not None:
+                    doc = await self._collection.find_one_and_update(
+                        {
+                            **claimable,
+                            "session_id": session_id,
+                            "status": AIJobStatus.PROCESSING,
+                            **_lease_expired(stale_before),
+                        },
+                        claim,
+                        return_document=ReturnDocument.AFTER,
+                    )
+                    if doc:
+                        return MediationAIJob.model_validate(doc)
+                excluded.add(session_id)
+                continue
+            return MediationAIJob.model_validate(doc) if doc else None
+
+    async def next_retry_at(self) -> datetime | None:
+        """When the earliest scheduled retry becomes due; None if no retry is waiting."""
+        doc = await self._collection.find_one(
+            {"status": AIJobStatus.PENDING, "next_attempt_at": {"$gt": utc_now()}},
+            {"next_attempt_at": 1},
+            sort=[("next_attempt_at", ASCENDING)],
         )
-        return MediationAIJob.model_validate(doc) if doc else None
+        if not doc:
+            return None
+        next_attempt_at: datetime = doc["next_attempt_at"]
+        return next_attempt_at if next_attempt_at.tzinfo else next_attempt_at.replace(tzinfo=UTC)
+
+    async def heartbeat(self, job_id: MongoId, owner: str) -> bool:
+        """Extend `owner`'s lease on a PROCESSING job. False means the lease was lost,
+        i.e. the job was reclaimed by another worker or already finished."""
+        result = await self._collection.update_one(
+            {"_id": _oid(job_id), "status": AIJobStatus.PROCESSING, "lease_owner": owner},
+            {"$set": {"heartbeat_at": utc_now()}},
+        )
+        return result.matched_count > 0
+
+    def _owned(self, job_id: MongoId, owner: str | None) -> dict[str, Any]:
+        # With an owner, a worker whose lease was taken over cannot overwrite the result.
+        query: dict[str, Any] = {"_id": _oid(job_id)}
+        if owner is not None:
+            query["lease_owner"] = owner
+        return query
 
-    async def mark_completed(self, job_id: MongoId) -> MediationAIJob | None:
+    async def mark_completed(
+        self, job_id: MongoId, owner: str | None = None
+    ) -> MediationAIJob | None:
         now = utc_now()
         doc = await self._collection.find_one_and_update(
-            {"_id": _oid(job_id)},
+            self._owned(job_id, owner),
             {"$set": {"status": AIJobStatus.COMPLETED, "completed_at": now, "updated_at": now}},
             return_document=ReturnDocument.AFTER,
         )
         return MediationAIJob.model_validate(doc) if doc else None
 
     async def mark_failed_or_retry(
-        self, job_id: MongoId, error_message: str
+        self,
+        job_id: MongoId,
+        error_message: str,
+        owner: str | None = None,
+        retry_after: float | None = None,
     ) -> MediationAIJob | None:
-        current = await self._collection.find_one({"_id": _oid(job_id)})
+        """Fail the job for good once its attempts are used up, otherwise put it back
+        in the queue after a backoff (at least `retry_after` seconds when given)."""
+        current = await self._collection.find_one(self._owned(job_id, owner))
         if not current:
             return None
-        status = (
-            AIJobStatus.FAILED
-            if int(current.get("attempts", 0)) >= int(current.get("max_attempts", 3))
-            else AIJobStatus.PENDING
-        )
+        attempts = int(current.get("attempts", 0))
         now = utc_now()
+        update: dict[str, Any] = {
+            "error_message": error_message[:2000],
+            "lease_owner": None,
+            "heartbeat_at": None,
+            "updated_at": now,
+        }
+        if attempts >= int(current.get("max_attempts", 3)):
+            update["status"] = AIJobStatus.FAILED
+        else:
+            update["status"] = AIJobStatus.PENDING
+            update["next_attempt_at"] = now + timedelta(
+                seconds=retry_delay_seconds(attempts, retry_after)
+            )
         doc = await self._collection.find_one_and_update(
-            {"_id": _oid(job_id)},
-            {
-                "$set": {
-                    "status": status,
-                    "error_message": error_message[:2000],
-                    "updated_at": now,
-                }
-            },
+            self._owned(job_id, owner),
+            {"$set": update},
             return_document=ReturnDocument.AFTER,
         )
         return MediationAIJob.model_validate(doc) if doc else None
 
 
+class MediationEventRepository:
+    def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
+        self._collection = db[settings.mediation_events_collection_name]
+
+    async def ensure_indexes(self) -> None:
+        # Events only need to outlive delivery; the TTL index keeps the collection small.
+        await self._collection.create_index(
+            [("created_at", ASCENDING)],
+            expireAfterSeconds=settings.mediation_events_ttl_seconds,
+        )
+
+    async def insert(self, event: MediationEvent) -> None:
+        await self._collection.insert_one(event.model_dump(by_alias=True, exclude_none=True))
+
+    @asynccontextmanager
+    async def watch_inserts(self) -> AsyncIterator[AsyncIterator[MediationEvent]]:
+        """Open a change stream of newly inserted events. Requires a replica set; raises
+        OperationFailure on a standalone server."""
+        pipeline = [{"$match": {"operationType": "insert"}}]
+        async with self._collection.watch(pipeline) as stream:
+
+            async def events() -> AsyncIterator[MediationEvent]:
+                async for change in stream:
+                    yield MediationEvent.model_validate(change["fullDocument"])
+
+            yield events()
+
+
 async def ensure_mediation_indexes(db: AsyncDB) -> None:
     await MediationSessionRepository(db).ensure_indexes()
     await MediationPerspectiveRepository(db).ensure_indexes()
@@ -479,3 +764,4 @@ async def ensure_mediation_indexes(db: AsyncDB) -> None:
     await MediationAIRepository(db).ensure_indexes()
     await MediationCommentRepository(db).ensure_indexes()
     await MediationJobRepository(db).ensure_indexes()
+    await MediationEventRepository(db).ensure_indexes()
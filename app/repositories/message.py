@@ -7,13 +7,14 @@ from fastapi import Depends
 from app.core.config import get_settings
 from app.db.mongo_client import get_db
 from app.models.mongo import AsyncDB
+from app.repositories.base import MongoRepository
 from app.schemas.v1.base import MongoId
 from app.schemas.v1.message import Message
 
 settings = get_settings()
 
 
-class MessageRepository:
+class MessageRepository(MongoRepository):
     def __init__(self, db: AsyncDB = Depends(get_db)) -> None:
         self._collection = db[settings.messages_collection_name]
 
@@ -32,11 +33,9 @@ class MessageRepository:
         return Message.model_validate(doc) if doc else None
 
     async def create(self, message: Message) -> Message:
-        result = await self._collection.insert_one(
-            message.model_dump(by_alias=True, exclude_none=True)
+        return await self._insert(
+            self._collection, Message, message.model_dump(by_alias=True, exclude_none=True)
         )
-        doc = await self._collection.find_one({"_id": result.inserted_id})
-        return Message.model_validate(doc)
 
     async def update(self, message_id: MongoId, data: Mapping[str, Any]) -> Message | None:
         result = await self._collection.update_one({"_id": ObjectId(message_id)}, {"$set": data})
@@ -5,13 +5,14 @@ from fastapi import Depends
 from app.core.config import get_settings
 from app.db.mongo_client import get_db
 from app.models.mongo import AsyncDB
+from app.repositories.base import MongoRepository
 from app.schemas.v1.session import Session
 from app.util.time import utc_now
 
 settings = get_settings()
 
 
-class SessionRepository:
+class SessionRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._sessions = db[settings.sessions_collection_name]
 
@@ -43,8 +44,6 @@ class SessionRepository:
         return Session.model_validate(doc) if doc else None
 
     async def create_session(self, session_data: Session) -> Session:
-        result = await self._sessions.insert_one(
-            session_data.model_dump(by_alias=True, exclude_none=True)
+        return await self._insert(
+            self._sessions, Session, session_data.model_dump(by_alias=True, exclude_none=True)
         )
-        doc = await self._sessions.find_one({"_id": result.inserted_id})
-        return Session.model_validate(doc)
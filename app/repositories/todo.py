@@ -6,6 +6,7 @@ from fastapi import Depends
 
 from app.core.config import get_settings
 from app.db.mongo_client import AsyncDB, get_db
+from app.repositories.base import MongoRepository
 from app.schemas.v1.base import MongoId
 from app.schemas.v1.todo import Todo
 from app.util.time import utc_now
@@ -13,7 +14,7 @@ from app.util.time import utc_now
 settings = get_settings()
 
 
-class TodoRepository:
+class TodoRepository(MongoRepository):
     def __init__(self, db: Annotated[AsyncDB, Depends(get_db)]) -> None:
         self._collection = db[settings.todos_collection_name]
 
@@ -32,11 +33,9 @@ class TodoRepository:
         return Todo.model_validate(doc) if doc else None
 
     async def create_todo(self, todo: Todo) -> Todo:
-        result = await self._collection.insert_one(
-            todo.model_dump(by_alias=True, exclude_none=True)
+        return await self._insert(
+            self._collection, Todo, todo.model_dump(by_alias=True, exclude_none=True)
         )
-        doc = await self._collection.find_one({"_id": result.inserted_id})
-        return Todo.model_validate(doc)
 
     async def update_todo(self, todo_id: MongoId, data: Mapping[str, Any]) -> Todo | None:
         result = await self._collection.update_one({"_id": ObjectId(todo_id)}, {"$set": data})
@@ -8,6 +8,7 @@ from pydantic import (
     BaseModel,
     BeforeValidator,
     Field,
+    PlainSerializer,
     WithJsonSchema,
     model_validator,
 )
@@ -22,6 +23,18 @@ def datetime_to_utc_str(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%dT%H:%M:%S%z")
 
 
+def datetime_to_sortable_str(dt: datetime) -> str:
+    """UTC ISO string with a fixed-width fraction. Pydantic leaves the fraction out at
+    whole seconds, and "...:00Z" sorts after "...:00.5Z" as text."""
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+# For datetimes stored by `CustomModel.serialize` that queries sort or compare on.
+SortableDatetime = Annotated[datetime, PlainSerializer(datetime_to_sortable_str, when_used="json")]
+
+
 def validate_mongo_id(v: Any) -> str:
     if isinstance(v, ObjectId):
         v = str(v)
@@ -1,10 +1,11 @@
 from datetime import datetime
+from enum import Enum
 
 from pydantic import Field
 
 from app.models.flight import FlightNumber, FlightStatus
 from app.schemas.v1.airport import Airport, IcaoCode
-from app.schemas.v1.base import CustomModel, DefaultMongoIdField
+from app.schemas.v1.base import CustomModel, DefaultMongoIdField, MongoId
 
 
 class FlightBase(CustomModel):
@@ -20,6 +21,10 @@ class Flight(FlightBase):
     arrival_airport: Airport
     created_at: datetime
     updated_at: datetime | None = None
+    departure_estimated_at: datetime | None = None
+    arrival_estimated_at: datetime | None = None
+    live_status: str | None = None
+    live_updated_at: datetime | None = None
 
 
 class FlightCreate(FlightBase):
@@ -35,3 +40,34 @@ class FlightUpdate(CustomModel):
     status: FlightStatus | None = None
     departure_airport_icao: IcaoCode | None = None
     arrival_airport_icao: IcaoCode | None = None
+
+
+class FlightCursorPayload(CustomModel):
+    """Cursor payload for keyset pagination over (sort field, _id)."""
+
+    sort_at: datetime
+    id: MongoId
+
+
+class FlightPageResponse(CustomModel):
+    """Response model for keyset-paginated flight listings."""
+
+    items: list[Flight]
+    next_cursor: str | None = None
+
+
+class FlightChangeOperation(str, Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class FlightChangeEvent(CustomModel):
+    """A write to the flights collection, pushed to open flight streams.
+
+    `flight_id` is None when the writer does not know which document(s) changed, e.g.
+    a bulk expiry or a delete by flight number.
+    """
+
+    operation: FlightChangeOperation
+    flight_id: MongoId | None = None
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from app.schemas.v1.base import CustomModel
 
 
@@ -28,4 +30,27 @@ class FlightLookupResponse(CustomModel):
     query: str
     normalized_flight_number: str
     cached: bool
+    # Set on cached responses: seconds since the upstream fetch, and whether it is past its TTL.
+    stale: bool = False
+    age_seconds: int | None = None
     candidates: list[FlightLookupCandidate]
+
+
+class FlightLookupCacheEntry(CustomModel):
+    response: FlightLookupResponse
+    stored_at: datetime
+    expires_at: datetime
+    # Retention limit: past expires_at the entry is only served stale, after this never.
+    stale_until: datetime
+
+
+class AeroDataBoxMetrics(CustomModel):
+    circuit_state: str
+    circuit_consecutive_failures: int
+    circuit_retry_after_seconds: float
+    rate_limit_tokens_available: float
+    requests_total: int
+    retries_total: int
+    failures_total: int
+    rate_limited_total: int
+    short_circuited_total: int
@@ -1,10 +1,10 @@
 from datetime import datetime
 from enum import Enum
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import ConfigDict, Field, field_validator
+from pydantic import ConfigDict, Field, field_validator, model_validator
 
-from app.schemas.v1.base import CustomModel, DefaultMongoIdField, MongoId
+from app.schemas.v1.base import CustomModel, DefaultMongoIdField, MongoId, SortableDatetime
 from app.schemas.v1.user import UserType
 
 
@@ -40,6 +40,16 @@ class MediationAIJobType(str, Enum):
     COMMENT_RESPONSE = "COMMENT_RESPONSE"
 
 
+# Lower runs first. Moderation unblocks a whole session and comment replies have a
+# user waiting; reflections are private and can wait longest.
+DEFAULT_JOB_PRIORITIES: dict[MediationAIJobType, int] = {
+    MediationAIJobType.PERSPECTIVE_MODERATION: 0,
+    MediationAIJobType.COMMENT_RESPONSE: 1,
+    MediationAIJobType.SHARED_MEDIATION_ADVICE: 1,
+    MediationAIJobType.PRIVATE_REFLECTION: 2,
+}
+
+
 class AIJobStatus(str, Enum):
     PENDING = "PENDING"
     PROCESSING = "PROCESSING"
@@ -61,6 +71,16 @@ class MediationEntityType(str, Enum):
     AI_COMMENT = "AI_COMMENT"
 
 
+class MediationEventType(str, Enum):
+    JOB_CLAIMED = "JOB_CLAIMED"
+    JOB_FAILED = "JOB_FAILED"
+    PERSPECTIVE_STATUS_CHANGED = "PERSPECTIVE_STATUS_CHANGED"
+    REFLECTION_AVAILABLE = "REFLECTION_AVAILABLE"
+    ADVICE_AVAILABLE = "ADVICE_AVAILABLE"
+    COMMENT_ADDED = "COMMENT_ADDED"
+    STATUS_CHANGED = "STATUS_CHANGED"
+
+
 class MediationProvider(str, Enum):
     OPENAI = "OPENAI"
     INTERNAL = "INTERNAL"
@@ -141,6 +161,9 @@ class MediationSession(CustomModel):
     resolved_by_user_types: list[UserType] = Field(default_factory=list)
     archived_by_user_types: list[UserType] = Field(default_factory=list)
     latest_advice_id: MongoId | None = None
+    # Mirrors each perspective's status so listing sessions needs no perspective lookups;
+    # kept in sync by MediationPerspectiveRepository.
+    perspective_statuses: dict[UserType, PerspectiveStatus] = Field(default_factory=dict)
 
 
 class MediationPerspective(CustomModel):
@@ -182,7 +205,7 @@ class MediationAIReflection(CustomModel):
     model: str
     prompt_version: str
     openai_response_id: str | None = None
-    created_at: datetime
+    created_at: SortableDatetime
     moderation_result_id: MongoId | None = None
 
 
@@ -193,7 +216,7 @@ class MediationAdvice(CustomModel):
     model: str
     prompt_version: str
     openai_response_id: str | None = None
-    created_at: datetime
+    created_at: SortableDatetime
     superseded_by_id: MongoId | None = None
     moderation_result_id: MongoId | None = None
 
@@ -205,7 +228,7 @@ class MediationComment(CustomModel):
     author_type: MediationAuthorType
     author_user_type: UserType | None = None
     content: str
-    created_at: datetime
+    created_at: SortableDatetime
     updated_at: datetime | None = None
     moderation_result_id: MongoId | None = None
     ai_job_id: MongoId | None = None
@@ -232,14 +255,29 @@ class MediationAIJob(CustomModel):
     source_entity_id: MongoId | None = None
     source_entity_type: str | None = None
     idempotency_key: str
+    priority: int = 0
+    # Claim order; set by the repository from created_at, priority and session backlog.
+    rank_at: SortableDatetime | None = None
     attempts: int = 0
     max_attempts: int = 3
+    # A retried job is not claimed before this time.
+    next_attempt_at: datetime | None = None
     error_message: str | None = None
-    created_at: datetime
+    created_at: SortableDatetime
     updated_at: datetime
     started_at: datetime | None = None
+    lease_owner: str | None = None
+    heartbeat_at: datetime | None = None
     completed_at: datetime | None = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def default_priority(cls, data: Any) -> Any:
+        if isinstance(data, dict) and data.get("priority") is None and "job_type" in data:
+            job_type = MediationAIJobType(data["job_type"])
+            return {**data, "priority": DEFAULT_JOB_PRIORITIES[job_type]}
+        return data
+
 
 class MediationSessionCreate(CustomModel):
     title: str = Field(min_length=1, max_length=120)
@@ -310,6 +348,20 @@ class MediationSessionListItem(CustomModel):
     archived_at: datetime | None = None
 
 
+class MediationCommentCursorPayload(CustomModel):
+    """Cursor payload for keyset pagination over comments' (created_at, _id)."""
+
+    created_at: datetime
+    id: MongoId
+
+
+class MediationSessionPageResponse(CustomModel):
+    """Response model for keyset-paginated mediation session listings."""
+
+    items: list[MediationSessionListItem]
+    next_cursor: MongoId | None = None
+
+
 class PerspectiveResponse(MediationPerspective):
     pass
 
@@ -323,6 +375,13 @@ class MediationCommentResponse(MediationComment):
     pass
 
 
+class MediationCommentPageResponse(CustomModel):
+    """Response model for keyset-paginated comment listings, oldest first."""
+
+    items: list[MediationCommentResponse]
+    next_cursor: str | None = None
+
+
 class MediationSessionDetailResponse(CustomModel):
     id: MongoId
     title: str
@@ -346,7 +405,9 @@ class MediationSessionDetailResponse(CustomModel):
     other_perspective_status: Literal["NOT_STARTED", "DRAFT", "SUBMITTED"]
     advice_status: Literal["NONE", "PROCESSING", "AVAILABLE", "FAILED", "BLOCKED"]
     advice: SharedMediationAdviceOutput | None = None
+    # The first page of comments, oldest first; page on through /comments from the cursor.
     comments: list[MediationCommentResponse]
+    comments_next_cursor: str | None = None
 
 
 class SubmitPerspectiveResponse(CustomModel):
@@ -370,3 +431,23 @@ class AdviceEndpointResponse(CustomModel):
 class CommentCreateResponse(CustomModel):
     comment: MediationCommentResponse
     job: MediationAIJob | None
+
+
+class MediationEvent(CustomModel):
+    """A change to a mediation session, pushed to the session's subscribers.
+
+    Events carry identifiers and statuses only; clients fetch content through the
+    regular endpoints. Events with a `recipient_user_type` are private to that user.
+    """
+
+    id: DefaultMongoIdField = None
+    session_id: MongoId
+    event_type: MediationEventType
+    entity_id: MongoId | None = None
+    job_type: MediationAIJobType | None = None
+    user_type: UserType | None = None
+    perspective_status: PerspectiveStatus | None = None
+    status: MediationSessionStatus | None = None
+    safety_status: SafetyStatus | None = None
+    recipient_user_type: UserType | None = None
+    created_at: datetime
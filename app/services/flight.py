@@ -1,4 +1,5 @@
 import asyncio
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import Depends
@@ -9,9 +10,13 @@ from app.repositories.flight import FlightRepository
 from app.schemas.v1.airport import Airport
 from app.schemas.v1.base import MongoId
 from app.schemas.v1.flight import Flight as FlightSchema
-from app.schemas.v1.flight import FlightCreate, FlightStatus, FlightUpdate
+from app.schemas.v1.flight import FlightChangeOperation, FlightCreate, FlightStatus, FlightUpdate
+from app.services.flight_events import publish_flight_change
+from app.util.flight import decode_flight_cursor, encode_flight_cursor
 from app.util.time import utc_now
 
+type FlightPage = tuple[list[FlightSchema], str | None]
+
 
 class FlightService:
     def __init__(
@@ -23,25 +28,61 @@ class FlightService:
         self._airports = airports
 
     async def _to_schema(self, flight: FlightModel) -> FlightSchema:
-        departure_airport = await self._airports.get_airport_by_id(flight.departure_airport_id)
-        arrival_airport = await self._airports.get_airport_by_id(flight.arrival_airport_id)
-
-        if departure_airport is None or arrival_airport is None:
-            raise ValueError("Airport not found")
-
-        return FlightSchema(
-            **flight.model_dump(),
-            departure_airport=departure_airport,
-            arrival_airport=arrival_airport,
-        )
+        return (await self._map_list_to_schema([flight]))[0]
 
     async def _map_list_to_schema(self, flights: list[FlightModel]) -> list[FlightSchema]:
-        return [await self._to_schema(f) for f in flights]
+        # Resolve every referenced airport with a single query instead of two per flight.
+        airport_ids = [
+            airport_id
+            for f in flights
+            for airport_id in (f.departure_airport_id, f.arrival_airport_id)
+        ]
+        airports = await self._airports.get_airports_by_ids(airport_ids)
+        now = utc_now()
 
-    async def get_all_flights(self) -> list[FlightSchema]:
-        await self.check_flights_for_expiration()
-        flights = await self._flights.list_flights()
-        return await self._map_list_to_schema(flights)
+        result: list[FlightSchema] = []
+        for f in flights:
+            departure_airport = airports.get(f.departure_airport_id)
+            arrival_airport = airports.get(f.arrival_airport_id)
+            if departure_airport is None or arrival_airport is None:
+                raise ValueError("Airport not found")
+            payload = f.model_dump()
+            if f.status == FlightStatus.ACTIVE and f.arrival_at <= now:
+                # Not yet swept by the expiration worker; report what it will become.
+                payload["status"] = FlightStatus.EXPIRED
+            result.append(
+                FlightSchema(
+                    **payload,
+                    departure_airport=departure_airport,
+                    arrival_airport=arrival_airport,
+                )
+            )
+        return result
+
+    async def _to_page(self, flights: list[FlightModel], limit: int, sort_field: str) -> FlightPage:
+        # Repositories are asked for limit + 1 rows; the extra one only signals a next page.
+        has_more = len(flights) > limit
+        items = flights[:limit]
+        next_cursor = None
+        if has_more and items:
+            last_item = items[-1]
+            next_cursor = encode_flight_cursor(getattr(last_item, sort_field), str(last_item.id))
+        return await self._map_list_to_schema(items), next_cursor
+
+    async def get_all_flights(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        window_from: datetime | None = None,
+        window_to: datetime | None = None,
+    ) -> FlightPage:
+        flights = await self._flights.list_flights(
+            limit=limit + 1,
+            cursor=decode_flight_cursor(cursor) if cursor else None,
+            window_from=window_from,
+            window_to=window_to,
+        )
+        return await self._to_page(flights, limit, "departure_at")
 
     async def create_flight(self, flight: FlightCreate) -> FlightSchema:
         departure_airport, arrival_airport = await asyncio.gather(
@@ -69,25 +110,22 @@ class FlightService:
 
         new_flight = FlightModel(**payload)
         created_flight = await self._flights.create_flight(new_flight)
+        publish_flight_change(FlightChangeOperation.INSERT, created_flight.id)
         return await self._to_schema(created_flight)
 
     async def get_flight_by_id(self, flight_id: MongoId) -> FlightSchema | None:
-        await self.check_flights_for_expiration()
         flight = await self._flights.get_flight(flight_id)
         if flight is None:
             return None
         return await self._to_schema(flight)
 
     async def get_flight_by_flight_number(self, flight_number: str) -> FlightSchema | None:
-        await self.check_flights_for_expiration()
-        flights = await self._flights.list_flights()
-        for flight in flights:
-            if flight.flight_number == flight_number:
-                return await self._to_schema(flight)
-        return None
+        flight = await self._flights.get_flight_by_flight_number(flight_number)
+        if flight is None:
+            return None
+        return await self._to_schema(flight)
 
     async def get_next_flight(self) -> FlightSchema | None:
-        await self.check_flights_for_expiration()
         flight = await self._flights.get_most_recent_active_flight()
         if flight is None:
             return None
@@ -110,6 +148,15 @@ class FlightService:
                 )
             updates["departure_airport_id"] = departure_airport.id
 
+        if {"flight_number", "departure_at"} & updates.keys():
+            # Tracked times belong to the old flight; let the tracker pick up the new one.
+            updates.update(
+                departure_estimated_at=None,
+                arrival_estimated_at=None,
+                live_status=None,
+                live_updated_at=None,
+                live_next_check_at=None,
+            )
         updates["updated_at"] = utc_now()
 
         updated_flight = await self._flights.update_flight(
@@ -118,48 +165,80 @@ class FlightService:
 
         if updated_flight is None:
             return None
+        publish_flight_change(FlightChangeOperation.UPDATE, updated_flight.id)
         return await self._to_schema(updated_flight)
 
     async def delete_flight_by_id(self, flight_id: MongoId) -> bool:
-        return await self._flights.delete_flight(flight_id)
+        deleted = await self._flights.delete_flight(flight_id)
+        if deleted:
+            publish_flight_change(FlightChangeOperation.DELETE, flight_id)
+        return deleted
 
     async def delete_flight_by_code(self, flight_code: str) -> bool:
-        return await self._flights.delete_flight_by_code(flight_code)
+        deleted = await self._flights.delete_flight_by_code(flight_code)
+        if deleted:
+            publish_flight_change(FlightChangeOperation.DELETE)
+        return deleted
 
-    async def get_active_flights(self) -> list[FlightSchema]:
-        await self.check_flights_for_expiration()
-        flights = await self._flights.list_active_flights()
-        return await self._map_list_to_schema(flights)
+    async def get_active_flights(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        window_from: datetime | None = None,
+        window_to: datetime | None = None,
+    ) -> FlightPage:
+        flights = await self._flights.list_active_flights(
+            limit=limit + 1,
+            cursor=decode_flight_cursor(cursor) if cursor else None,
+            window_from=window_from,
+            window_to=window_to,
+        )
+        return await self._to_page(flights, limit, "departure_at")
 
     async def get_most_recent_active_flight(self) -> FlightSchema | None:
-        await self.check_flights_for_expiration()
         flight = await self._flights.get_most_recent_active_flight()
         if flight is None:
             return None
         return await self._to_schema(flight)
 
-    async def get_flights_by_arrival_airport(self, airport: Airport) -> list[FlightSchema]:
-        await self.check_flights_for_expiration()
+    async def get_flights_by_arrival_airport(
+        self,
+        airport: Airport,
+        limit: int,
+        cursor: str | None = None,
+        window_from: datetime | None = None,
+        window_to: datetime | None = None,
+    ) -> FlightPage:
         flights = await self._flights.get_flights_by_arrival_airport(
-            airport, status=FlightStatus.ACTIVE
+            airport,
+            status=FlightStatus.ACTIVE,
+            limit=limit + 1,
+            cursor=decode_flight_cursor(cursor) if cursor else None,
+            window_from=window_from,
+            window_to=window_to,
         )
-        return await self._map_list_to_schema(flights)
+        return await self._to_page(flights, limit, "arrival_at")
 
-    async def get_flights_by_departure_airport(self, airport: Airport) -> list[FlightSchema]:
-        await self.check_flights_for_expiration()
+    async def get_flights_by_departure_airport(
+        self,
+        airport: Airport,
+        limit: int,
+        cursor: str | None = None,
+        window_from: datetime | None = None,
+        window_to: datetime | None = None,
+    ) -> FlightPage:
         flights = await self._flights.get_flights_by_departure_airport(
-            airport, status=FlightStatus.ACTIVE
+            airport,
+            status=FlightStatus.ACTIVE,
+            limit=limit + 1,
+            cursor=decode_flight_cursor(cursor) if cursor else None,
+            window_from=window_from,
+            window_to=window_to,
         )
-        return await self._map_list_to_schema(flights)
+        return await self._to_page(flights, limit, "departure_at")
 
-    async def check_flights_for_expiration(self) -> None:
-        now = utc_now()
-        flights = await self._flights.list_active_flights()
-        for flight in flights:
-            if flight.arrival_at < now:
-                if flight.id is None:
-                    continue
-                expired_flight = flight.model_copy(
-                    update={"status": FlightStatus.EXPIRED, "updated_at": now}
-                )
-                await self._flights.update_flight(flight.id, expired_flight)
+    async def expire_flights(self) -> int:
+        expired = await self._flights.expire_flights(utc_now())
+        if expired:
+            publish_flight_change(FlightChangeOperation.UPDATE)
+        return expired
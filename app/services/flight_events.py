@@ -0,0 +1,34 @@
+"""Change notifications for the flights collection.
+
+Writers publish through `publish_flight_change` and open streams subscribe to
+`flight_broker`. When the change-stream relay is running it is the single source of
+events, because it also sees writes made by other processes; in-process publishes are
+then suppressed so subscribers do not receive every change twice.
+"""
+
+from app.schemas.v1.base import MongoId
+from app.schemas.v1.flight import FlightChangeEvent, FlightChangeOperation
+from app.util.pubsub import Broker
+
+FLIGHTS_TOPIC = "flights"
+
+flight_broker: Broker[FlightChangeEvent] = Broker()
+
+_change_stream_active = False
+
+
+def set_change_stream_active(active: bool) -> None:
+    global _change_stream_active
+    _change_stream_active = active
+
+
+def relay_flight_change(event: FlightChangeEvent) -> None:
+    flight_broker.publish(FLIGHTS_TOPIC, event)
+
+
+def publish_flight_change(
+    operation: FlightChangeOperation, flight_id: MongoId | None = None
+) -> None:
+    if _change_stream_active:
+        return
+    relay_flight_change(FlightChangeEvent(operation=operation, flight_id=flight_id))
@@ -1,21 +1,35 @@
+import asyncio
 import hashlib
 import re
-import time
-from datetime import date, timedelta
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 
 from app.core.config import get_settings
+from app.core.logging import get_logger
 from app.integrations.aerodatabox_client import AeroDataBoxError, RawFlightData, aerodatabox_client
 from app.schemas.v1.exceptions import BadRequestException, ServiceUnavailableException
 from app.schemas.v1.flight_lookup import (
     FlightLookupAirport,
+    FlightLookupCacheEntry,
     FlightLookupCandidate,
     FlightLookupResponse,
 )
+from app.services.flight_lookup_cache import FlightLookupCache, build_flight_lookup_cache
+from app.util.time import utc_now
 
 settings = get_settings()
 
-# Module-level TTL cache: (normalized_flight_number, date_window_key) -> (monotonic_time, response)
-_cache: dict[tuple[str, str], tuple[float, FlightLookupResponse]] = {}
+logger = get_logger(__name__)
+
+# Keyed per day by "<normalized_flight_number>|<date_from>:<date_to>"; see
+# flight_lookup_cache for the tiers.
+_cache: FlightLookupCache = build_flight_lookup_cache()
+
+# Strong references to stale-while-revalidate refreshes so they are not garbage collected.
+_background_tasks: set[asyncio.Task[None]] = set()
+
+# Upstream calls currently in flight, keyed by (normalized_flight_number, date_window_key).
+_inflight: dict[tuple[str, str], asyncio.Future[list[RawFlightData]]] = {}
 
 _FLIGHT_NUMBER_RE = re.compile(r"^[A-Z]{2,3}\d+$")
 
@@ -96,58 +110,203 @@ def _normalize_candidate(raw: dict) -> FlightLookupCandidate:
     )
 
 
+def _release_inflight(key: tuple[str, str], future: asyncio.Future[list[RawFlightData]]) -> None:
+    if _inflight.get(key) is future:
+        del _inflight[key]
+    # Mark the error as retrieved so an abandoned call does not log "never retrieved".
+    if not future.cancelled():
+        future.exception()
+
+
+async def _fetch_flights_coalesced(
+    normalized: str, window_key: str, date_from: str, date_to: str
+) -> list[RawFlightData]:
+    """Share one upstream call between concurrent lookups of the same flight and window.
+
+    Errors reach every waiter and are never cached; the next lookup after a failure
+    starts a fresh call. The shared call is shielded so a disconnecting caller does
+    not cancel it for the others.
+    """
+    key = (normalized, window_key)
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(
+            aerodatabox_client.get_flights_by_number(normalized, date_from, date_to)
+        )
+        _inflight[key] = future
+        future.add_done_callback(lambda done: _release_inflight(key, done))
+    return await asyncio.shield(future)
+
+
+def _build_response(
+    raw_flight_number: str, normalized: str, raw_flights: list[RawFlightData]
+) -> FlightLookupResponse:
+    candidates = sorted(
+        [_normalize_candidate(r.data) for r in raw_flights],
+        key=lambda c: c.scheduled_departure_time_utc or "",
+    )
+    return FlightLookupResponse(
+        query=raw_flight_number,
+        normalized_flight_number=normalized,
+        cached=False,
+        candidates=candidates,
+    )
+
+
+async def _store(cache_key: str, response: FlightLookupResponse) -> None:
+    ttl = (
+        settings.aerodatabox_cache_ttl_success_seconds
+        if response.candidates
+        else settings.aerodatabox_cache_ttl_no_results_seconds
+    )
+    # Entries are kept past expiry for as long as either stale window may still serve them.
+    stale_window = max(
+        settings.aerodatabox_cache_stale_while_revalidate_seconds,
+        settings.aerodatabox_cache_stale_if_error_seconds,
+    )
+    stored_at = utc_now()
+    expires_at = stored_at + timedelta(seconds=ttl)
+    await _cache.set(
+        cache_key,
+        FlightLookupCacheEntry(
+            response=response,
+            stored_at=stored_at,
+            expires_at=expires_at,
+            stale_until=expires_at + timedelta(seconds=stale_window),
+        ),
+    )
+
+
+@dataclass
+class _DayLookup:
+    """Candidates for one day of a lookup window, and where they came from."""
+
+    candidates: list[FlightLookupCandidate]
+    stored_at: datetime | None = None  # Set when served from cache.
+    stale: bool = False
+
+
+def _day_window(day: date) -> tuple[str, str]:
+    return day.isoformat(), (day + timedelta(days=1)).isoformat()
+
+
+async def _fetch_day(normalized: str, day: date) -> FlightLookupResponse:
+    date_from, date_to = _day_window(day)
+    window_key = f"{date_from}:{date_to}"
+    raw_flights = await _fetch_flights_coalesced(normalized, window_key, date_from, date_to)
+    response = _build_response(normalized, normalized, raw_flights)
+    await _store(f"{normalized}|{window_key}", response)
+    return response
+
+
+async def _refresh_day(normalized: str, day: date) -> None:
+    try:
+        await _fetch_day(normalized, day)
+    except AeroDataBoxError as exc:
+        logger.warning("Background refresh of %s on %s failed: %s", normalized, day, exc)
+    except Exception:
+        logger.exception("Background refresh of %s on %s failed", normalized, day)
+
+
+def _schedule_refresh(normalized: str, day: date) -> None:
+    date_from, date_to = _day_window(day)
+    if (normalized, f"{date_from}:{date_to}") in _inflight:
+        return
+    task = asyncio.create_task(_refresh_day(normalized, day))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _lookup_day(normalized: str, day: date) -> _DayLookup:
+    """Serve one day from cache when possible, otherwise fetch and cache it.
+
+    Expired entries are still served while they are within the stale-while-revalidate
+    window (a background task refreshes them), and within the stale-if-error window
+    when AeroDataBox fails.
+    """
+    date_from, date_to = _day_window(day)
+    entry = await _cache.get(f"{normalized}|{date_from}:{date_to}")
+    now = utc_now()
+    if entry:
+        cached = _DayLookup(entry.response.candidates, stored_at=entry.stored_at)
+        if now < entry.expires_at:
+            return cached
+        cached.stale = True
+        revalidate_until = entry.expires_at + timedelta(
+            seconds=settings.aerodatabox_cache_stale_while_revalidate_seconds
+        )
+        if now < revalidate_until:
+            _schedule_refresh(normalized, day)
+            return cached
+
+    try:
+        response = await _fetch_day(normalized, day)
+    except AeroDataBoxError as exc:
+        if entry and now < entry.expires_at + timedelta(
+            seconds=settings.aerodatabox_cache_stale_if_error_seconds
+        ):
+            logger.warning(
+                "Serving stale lookup for %s on %s after provider error: %s", normalized, day, exc
+            )
+            return cached
+        raise
+    return _DayLookup(response.candidates)
+
+
 async def lookup_flight(
     raw_flight_number: str, on_date: date | None = None
 ) -> FlightLookupResponse:
     """Validate, cache-check, call AeroDataBox, normalize, and cache the result.
 
-    When `on_date` is provided, the AeroDataBox window is narrowed to that single
-    day — useful when adding flights far in advance, since the default 7-day
-    window only ever surfaces flights leaving in the next week.
+    When `on_date` is provided, the lookup is narrowed to that single day — useful
+    when adding flights far in advance, since the default 7-day window only ever
+    surfaces flights leaving in the next week.
+
+    Lookups are cached per day: a window is split into single-day lookups that run
+    with bounded concurrency, so overlapping windows share cache entries. Candidates
+    from neighbouring days are merged and deduplicated by candidate id.
     """
     normalized = normalize_flight_number(raw_flight_number)
 
     if on_date is not None:
-        date_from = on_date
-        date_to = on_date + timedelta(days=1)
+        days = [on_date]
     else:
-        date_from = date.today()
-        date_to = date_from + timedelta(days=settings.aerodatabox_lookup_window_days)
-    date_from_str = date_from.isoformat()
-    date_to_str = date_to.isoformat()
-    window_key = f"{date_from_str}:{date_to_str}"
-    cache_key = (normalized, window_key)
-
-    cached_entry = _cache.get(cache_key)
-    if cached_entry:
-        inserted_at, cached_response = cached_entry
-        ttl = (
-            settings.aerodatabox_cache_ttl_success_seconds
-            if cached_response.candidates
-            else settings.aerodatabox_cache_ttl_no_results_seconds
-        )
-        if time.monotonic() - inserted_at < ttl:
-            return cached_response.model_copy(update={"cached": True})
+        today = date.today()
+        days = [
+            today + timedelta(days=offset)
+            for offset in range(settings.aerodatabox_lookup_window_days)
+        ]
 
-    try:
-        raw_flights: list[RawFlightData] = await aerodatabox_client.get_flights_by_number(
-            normalized, date_from_str, date_to_str
-        )
-    except AeroDataBoxError as exc:
-        raise ServiceUnavailableException(
-            "Flight lookup is temporarily unavailable. You can still enter the flight manually."
-        ) from exc
+    semaphore = asyncio.Semaphore(settings.aerodatabox_lookup_concurrency)
 
-    candidates = sorted(
-        [_normalize_candidate(r.data) for r in raw_flights],
-        key=lambda c: c.scheduled_departure_time_utc or "",
-    )
+    async def lookup_bounded(day: date) -> _DayLookup:
+        async with semaphore:
+            return await _lookup_day(normalized, day)
+
+    results = await asyncio.gather(*(lookup_bounded(day) for day in days), return_exceptions=True)
+    day_lookups: list[_DayLookup] = []
+    for result in results:
+        if isinstance(result, AeroDataBoxError):
+            raise ServiceUnavailableException(
+                "Flight lookup is temporarily unavailable. You can still enter the flight manually."
+            ) from result
+        if isinstance(result, BaseException):
+            raise result
+        day_lookups.append(result)
+
+    merged: dict[str, FlightLookupCandidate] = {}
+    for day_lookup in day_lookups:
+        for candidate in day_lookup.candidates:
+            merged.setdefault(candidate.id, candidate)
 
-    response = FlightLookupResponse(
+    cached_at = [d.stored_at for d in day_lookups if d.stored_at is not None]
+    cached = len(cached_at) == len(day_lookups)
+    return FlightLookupResponse(
         query=raw_flight_number,
         normalized_flight_number=normalized,
-        cached=False,
-        candidates=candidates,
+        cached=cached,
+        stale=any(d.stale for d in day_lookups),
+        # Age of the oldest day served from cache.
+        age_seconds=int((utc_now() - min(cached_at)).total_seconds()) if cached else None,
+        candidates=sorted(merged.values(), key=lambda c: c.scheduled_departure_time_utc or ""),
     )
-    _cache[cache_key] = (time.monotonic(), response)
-    return response
@@ -0,0 +1,129 @@
+"""Cache tiers for AeroDataBox flight lookups.
+
+Every tier implements `FlightLookupCache`. The default stack is a bounded in-process
+TTL-LRU in front of a Mongo collection with a TTL index, so repeated lookups are
+served locally while hits are shared between workers and survive restarts.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Protocol
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.mongo_client import AsyncDB, get_db
+from app.repositories.flight_lookup_cache import FlightLookupCacheRepository
+from app.schemas.v1.flight_lookup import FlightLookupCacheEntry
+from app.util.time import utc_now
+
+settings = get_settings()
+
+logger = get_logger(__name__)
+
+
+class FlightLookupCache(Protocol):
+    async def get(self, key: str) -> FlightLookupCacheEntry | None: ...
+
+    async def set(self, key: str, entry: FlightLookupCacheEntry) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class MemoryFlightLookupCache:
+    """Bounded in-process TTL-LRU; the least recently used entry is evicted when full.
+
+    Entries are dropped once `stale_until` passes; freshness is decided by the caller.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, FlightLookupCacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> FlightLookupCacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.stale_until <= utc_now():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: FlightLookupCacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class MongoFlightLookupCache:
+    """Shared tier backed by `FlightLookupCacheRepository`.
+
+    The database is resolved on first use so importing the lookup service never opens
+    a connection. Mongo errors are logged and treated as misses: a cache outage must
+    not turn into a lookup outage.
+    """
+
+    def __init__(self, db_factory: Callable[[], AsyncDB] = get_db) -> None:
+        self._db_factory = db_factory
+        self._repository: FlightLookupCacheRepository | None = None
+
+    def _repo(self) -> FlightLookupCacheRepository:
+        if self._repository is None:
+            self._repository = FlightLookupCacheRepository(self._db_factory())
+        return self._repository
+
+    async def get(self, key: str) -> FlightLookupCacheEntry | None:
+        try:
+            return await self._repo().get_entry(key)
+        except Exception:
+            logger.exception("Shared flight lookup cache read failed for %s", key)
+            return None
+
+    async def set(self, key: str, entry: FlightLookupCacheEntry) -> None:
+        try:
+            await self._repo().put_entry(key, entry)
+        except Exception:
+            logger.exception("Shared flight lookup cache write failed for %s", key)
+
+    async def clear(self) -> None:
+        await self._repo().clear()
+
+
+class TieredFlightLookupCache:
+    """Reads tiers in order and back-fills the faster tiers on a hit; writes go to all."""
+
+    def __init__(self, *tiers: FlightLookupCache) -> None:
+        self._tiers = tiers
+
+    async def get(self, key: str) -> FlightLookupCacheEntry | None:
+        for index, tier in enumerate(self._tiers):
+            entry = await tier.get(key)
+            if entry is not None:
+                for faster in self._tiers[:index]:
+                    await faster.set(key, entry)
+                return entry
+        return None
+
+    async def set(self, key: str, entry: FlightLookupCacheEntry) -> None:
+        for tier in self._tiers:
+            await tier.set(key, entry)
+
+    async def clear(self) -> None:
+        for tier in self._tiers:
+            await tier.clear()
+
+
+def build_flight_lookup_cache() -> FlightLookupCache:
+    memory = MemoryFlightLookupCache(settings.aerodatabox_cache_max_entries)
+    if not settings.aerodatabox_cache_shared_enabled:
+        return memory
+    return TieredFlightLookupCache(memory, MongoFlightLookupCache())
@@ -0,0 +1,178 @@
+"""Refreshes live departure/arrival times of ACTIVE flights from AeroDataBox.
+
+Flights are polled more often as departure approaches, and every upstream call
+(retries included) is drawn from one budget kept in Mongo, so tracking can never
+exhaust the RapidAPI quota that interactive lookups depend on, however many processes
+run a tracker. Each flight is leased to one tracker before it is polled.
+"""
+
+from datetime import datetime, timedelta
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.integrations.aerodatabox_client import (
+    AeroDataBoxBudgetExhausted,
+    AeroDataBoxClient,
+    AeroDataBoxError,
+    RawFlightData,
+    aerodatabox_client,
+)
+from app.models.flight import Flight, FlightLiveUpdate
+from app.repositories.airport import AirportRepository
+from app.repositories.call_budget import CallBudgetRepository
+from app.repositories.flight import FlightRepository
+from app.schemas.v1.flight import FlightChangeOperation
+from app.services.flight_events import publish_flight_change
+from app.util.time import utc_now
+
+settings = get_settings()
+
+logger = get_logger(__name__)
+
+# (time until departure, poll interval): the first tier the flight falls within applies.
+_POLL_TIERS: tuple[tuple[timedelta, timedelta], ...] = (
+    (timedelta(hours=1), timedelta(minutes=5)),
+    (timedelta(hours=6), timedelta(minutes=20)),
+    (timedelta(hours=24), timedelta(hours=2)),
+)
+_POLL_INTERVAL_FAR = timedelta(hours=6)
+_POLL_INTERVAL_AIRBORNE = timedelta(minutes=15)
+# A provider flight further than this from our scheduled departure is a different flight.
+_MATCH_TOLERANCE = timedelta(hours=6)
+_BUDGET_KEY = "flight-tracker"
+
+
+def poll_interval(flight: Flight, now: datetime) -> timedelta:
+    departure_at = flight.departure_estimated_at or flight.departure_at
+    until_departure = departure_at - now
+    if until_departure <= timedelta(0):
+        return _POLL_INTERVAL_AIRBORNE
+    for horizon, interval in _POLL_TIERS:
+        if until_departure <= horizon:
+            return interval
+    return _POLL_INTERVAL_FAR
+
+
+def _parse_utc(node: dict, *keys: str) -> datetime | None:
+    """First available `<key>.utc` timestamp, e.g. "2026-06-25 10:30Z"."""
+    for key in keys:
+        value = (node.get(key) or {}).get("utc")
+        if value:
+            try:
+                return datetime.fromisoformat(value.replace(" ", "T", 1))
+            except ValueError:
+                continue
+    return None
+
+
+def _best_time(node: dict) -> datetime | None:
+    # Runway time is the actual movement; revised and predicted are estimates.
+    return _parse_utc(node, "runwayTime", "revisedTime", "predictedTime")
+
+
+def match_flight(
+    flight: Flight, departure_icao: str | None, raw_flights: list[RawFlightData]
+) -> dict | None:
+    """Pick the provider record for `flight`: same departure airport (when known) and
+    the scheduled departure closest to ours."""
+    best: tuple[timedelta, dict] | None = None
+    for raw in raw_flights:
+        departure = raw.data.get("departure") or {}
+        icao = (departure.get("airport") or {}).get("icao")
+        if departure_icao and icao and icao.upper() != departure_icao.upper():
+            continue
+        scheduled = _parse_utc(departure, "scheduledTime")
+        if scheduled is None:
+            continue
+        distance = abs(scheduled - flight.departure_at)
+        if distance <= _MATCH_TOLERANCE and (best is None or distance < best[0]):
+            best = (distance, raw.data)
+    return best[1] if best else None
+
+
+class FlightTracker:
+    def __init__(
+        self,
+        flights: FlightRepository,
+        airports: AirportRepository,
+        budget: CallBudgetRepository,
+        client: AeroDataBoxClient = aerodatabox_client,
+    ) -> None:
+        self._flights = flights
+        self._airports = airports
+        self._budget = budget
+        self._client = client
+
+    async def _spend_call(self) -> bool:
+        limit = settings.flight_tracker_max_calls_per_hour
+        return await self._budget.acquire(_BUDGET_KEY, rate=limit / 3600, capacity=limit)
+
+    async def track_due_flights(self, now: datetime | None = None) -> int:
+        """Poll every flight whose check is due, within budget. Returns flights updated."""
+        now = now or utc_now()
+        due = await self._flights.list_flights_due_for_tracking(
+            now,
+            departs_before=now + timedelta(hours=settings.flight_tracker_horizon_hours),
+            limit=settings.flight_tracker_max_calls_per_hour,
+        )
+        if not due:
+            return 0
+        airports = await self._airports.get_airports_by_ids([f.departure_airport_id for f in due])
+        lease_until = now + timedelta(seconds=settings.flight_tracker_lease_seconds)
+
+        updates: list[FlightLiveUpdate] = []
+        released: list[FlightLiveUpdate] = []
+        for flight in due:
+            if not await self._flights.claim_for_tracking(str(flight.id), now, lease_until):
+                continue  # Another tracker is polling it.
+            airport = airports.get(flight.departure_airport_id)
+            try:
+                updates.append(await self._poll(flight, airport.icao if airport else None, now))
+            except AeroDataBoxBudgetExhausted:
+                # Hand the lease back so the first pass with budget to spare picks it up.
+                released.append(FlightLiveUpdate(flight_id=str(flight.id), live_next_check_at=now))
+                break
+
+        await self._flights.apply_live_updates(updates + released)
+        for update in updates:
+            if update.live_updated_at is not None:
+                publish_flight_change(FlightChangeOperation.UPDATE, update.flight_id)
+        return len(updates)
+
+    async def _poll(
+        self, flight: Flight, departure_icao: str | None, now: datetime
+    ) -> FlightLiveUpdate:
+        next_check = FlightLiveUpdate(
+            flight_id=str(flight.id), live_next_check_at=now + poll_interval(flight, now)
+        )
+        # Query the neighbouring days too: AeroDataBox windows are in local dates.
+        date_from = (flight.departure_at - timedelta(days=1)).date().isoformat()
+        date_to = (flight.departure_at + timedelta(days=1)).date().isoformat()
+        try:
+            raw_flights = await self._client.get_flights_by_number(
+                flight.flight_number, date_from, date_to, attempt_budget=self._spend_call
+            )
+        except AeroDataBoxBudgetExhausted:
+            raise
+        except AeroDataBoxError as exc:
+            logger.warning("Live status poll for %s failed: %s", flight.flight_number, exc)
+            return next_check
+
+        match = match_flight(flight, departure_icao, raw_flights)
+        if match is None:
+            logger.info("No live status found for %s", flight.flight_number)
+            return next_check
+
+        update = next_check.model_copy(
+            update={
+                "departure_estimated_at": _best_time(match.get("departure") or {}),
+                "arrival_estimated_at": _best_time(match.get("arrival") or {}),
+                "live_status": match.get("status"),
+                "live_updated_at": now,
+            }
+        )
+        # Re-plan the cadence around the revised departure time.
+        tracked = flight.model_copy(
+            update={"departure_estimated_at": update.departure_estimated_at}
+        )
+        return update.model_copy(update={"live_next_check_at": now + poll_interval(tracked, now)})
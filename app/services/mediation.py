@@ -1,7 +1,11 @@
-from typing import Annotated, Literal
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import datetime
+from typing import Annotated, Any, Literal
 
 from fastapi import Depends
 
+from app.core.config import get_settings
 from app.repositories.mediation import (
     MediationAIRepository,
     MediationCommentRepository,
@@ -16,11 +20,15 @@ from app.schemas.v1.mediation import (
     AdviceEndpointResponse,
     AIJobStatus,
     CommentCreateResponse,
+    MediationAdvice,
     MediationAIJob,
     MediationAIJobType,
+    MediationAIReflection,
     MediationCommentCreate,
+    MediationCommentCursorPayload,
     MediationCommentResponse,
     MediationEntityType,
+    MediationEventType,
     MediationModerationResult,
     MediationPerspective,
     MediationPerspectiveDraftUpdate,
@@ -37,10 +45,17 @@ from app.schemas.v1.mediation import (
     SubmitPerspectiveResponse,
 )
 from app.schemas.v1.user import UserType
+from app.services.mediation_events import publish_mediation_event
 from app.services.mediation_safety import MediationSafetyService, ModerationDecision
+from app.util.mediation import decode_comment_cursor, encode_comment_cursor
 from app.util.time import utc_now
 from app.util.user import get_other_user_type
 
+settings = get_settings()
+
+type MediationSessionPage = tuple[list[MediationSessionListItem], str | None]
+type MediationCommentPage = tuple[list[MediationCommentResponse], str | None]
+
 ALL_MEDIATION_USER_TYPES = {UserType.JORIS, UserType.DANFENG}
 
 
@@ -62,6 +77,32 @@ class MediationService:
         self._moderation = moderation_repo
         self._jobs = job_repo
         self._safety = safety_service
+        # The service is built per request, so this memoizes lookups for one request.
+        self._lookups: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def _cached[T](self, key: Hashable, load: Callable[[], Awaitable[T]]) -> asyncio.Future[T]:
+        """Run `load` at most once per request, even when awaited concurrently."""
+        if key not in self._lookups:
+            self._lookups[key] = asyncio.ensure_future(load())
+        return self._lookups[key]
+
+    def _reflection_lookup(
+        self, session_id: MongoId, current_user_type: UserType
+    ) -> asyncio.Future[MediationAIReflection | None]:
+        return self._cached(
+            ("reflection", session_id, current_user_type),
+            lambda: self._ai.get_reflection_for_user(session_id, current_user_type),
+        )
+
+    def _advice_lookup(self, session_id: MongoId) -> asyncio.Future[MediationAdvice | None]:
+        return self._cached(("advice", session_id), lambda: self._ai.get_latest_advice(session_id))
+
+    def _job_status_lookup(
+        self, session_id: MongoId
+    ) -> asyncio.Future[dict[MediationAIJobType, AIJobStatus]]:
+        return self._cached(
+            ("job_statuses", session_id), lambda: self._jobs.latest_status_by_type(session_id)
+        )
 
     async def _get_session_or_404(self, session_id: MongoId) -> MediationSession:
         session = await self._sessions.get_by_id(session_id)
@@ -69,6 +110,14 @@ class MediationService:
             raise NotFoundException("Mediation session", session_id)
         return session
 
+    async def _publish_status(self, session: MediationSession) -> None:
+        await publish_mediation_event(
+            str(session.id),
+            MediationEventType.STATUS_CHANGED,
+            status=session.status,
+            safety_status=session.safety_status,
+        )
+
     def _assert_session_writable(self, session: MediationSession) -> None:
         if session.status == MediationSessionStatus.ARCHIVED:
             raise ConflictException("Session is archived")
@@ -194,13 +243,23 @@ class MediationService:
     async def _reflection_status(
         self, session_id: MongoId, current_user_type: UserType
     ) -> tuple[Literal["NONE", "PROCESSING", "AVAILABLE", "FAILED"], object | None]:
-        reflection = await self._ai.get_reflection_for_user(session_id, current_user_type)
+        reflection, job_statuses = await asyncio.gather(
+            self._reflection_lookup(session_id, current_user_type),
+            self._job_status_lookup(session_id),
+        )
+        return self._reflection_status_of(reflection, job_statuses)
+
+    @staticmethod
+    def _reflection_status_of(
+        reflection: MediationAIReflection | None,
+        job_statuses: dict[MediationAIJobType, AIJobStatus],
+    ) -> tuple[Literal["NONE", "PROCESSING", "AVAILABLE", "FAILED"], object | None]:
         if reflection:
             return "AVAILABLE", reflection.content
-        job = await self._jobs.get_latest_by_type(session_id, MediationAIJobType.PRIVATE_REFLECTION)
-        if job and job.status in {AIJobStatus.PENDING, AIJobStatus.PROCESSING}:
+        job_status = job_statuses.get(MediationAIJobType.PRIVATE_REFLECTION)
+        if job_status in {AIJobStatus.PENDING, AIJobStatus.PROCESSING}:
             return "PROCESSING", None
-        if job and job.status == AIJobStatus.FAILED:
+        if job_status == AIJobStatus.FAILED:
             return "FAILED", None
         return "NONE", None
 
@@ -209,15 +268,25 @@ class MediationService:
     ) -> tuple[Literal["NONE", "PROCESSING", "AVAILABLE", "FAILED", "BLOCKED"], object | None]:
         if session.safety_status == SafetyStatus.BLOCKED:
             return "BLOCKED", None
-        advice = await self._ai.get_latest_advice(str(session.id))
+        advice, job_statuses = await asyncio.gather(
+            self._advice_lookup(str(session.id)), self._job_status_lookup(str(session.id))
+        )
+        return self._advice_status_of(session, advice, job_statuses)
+
+    @staticmethod
+    def _advice_status_of(
+        session: MediationSession,
+        advice: MediationAdvice | None,
+        job_statuses: dict[MediationAIJobType, AIJobStatus],
+    ) -> tuple[Literal["NONE", "PROCESSING", "AVAILABLE", "FAILED", "BLOCKED"], object | None]:
+        if session.safety_status == SafetyStatus.BLOCKED:
+            return "BLOCKED", None
         if advice:
             return "AVAILABLE", advice.content
-        job = await self._jobs.get_latest_by_type(
-            str(session.id), MediationAIJobType.SHARED_MEDIATION_ADVICE
-        )
-        if job and job.status in {AIJobStatus.PENDING, AIJobStatus.PROCESSING}:
+        job_status = job_statuses.get(MediationAIJobType.SHARED_MEDIATION_ADVICE)
+        if job_status in {AIJobStatus.PENDING, AIJobStatus.PROCESSING}:
             return "PROCESSING", None
-        if job and job.status == AIJobStatus.FAILED:
+        if job_status == AIJobStatus.FAILED:
             return "FAILED", None
         return "NONE", None
 
@@ -237,15 +306,18 @@ class MediationService:
             )
         )
 
-    async def list_sessions(self, current_user_type: UserType) -> list[MediationSessionListItem]:
-        sessions = await self._sessions.list_all()
+    async def list_sessions(
+        self, current_user_type: UserType, limit: int, cursor: MongoId | None = None
+    ) -> MediationSessionPage:
+        sessions = await self._sessions.list_page(limit=limit + 1, before_id=cursor)
+        has_more = len(sessions) > limit
+        sessions = sessions[:limit]
         result: list[MediationSessionListItem] = []
         other_user_type = get_other_user_type(current_user_type)
         for session in sessions:
             session_id = str(session.id)
-            perspectives = await self._perspectives.list_for_session(session_id)
-            has_my_perspective = any(item.user_type == current_user_type for item in perspectives)
-            has_other_perspective = any(item.user_type == other_user_type for item in perspectives)
+            has_my_perspective = current_user_type in session.perspective_statuses
+            has_other_perspective = other_user_type in session.perspective_statuses
             has_marked_resolved, other_has_marked_resolved = self._agreement_flags(
                 session.resolved_by_user_types, current_user_type
             )
@@ -273,31 +345,57 @@ class MediationService:
                     archived_at=session.archived_at,
                 )
             )
-        return result
+        next_cursor = str(sessions[-1].id) if has_more and sessions else None
+        return result, next_cursor
+
+    async def get_session(self, session_id: MongoId) -> MediationSession:
+        return await self._get_session_or_404(session_id)
 
     async def get_session_detail(
         self, session_id: MongoId, current_user_type: UserType
     ) -> MediationSessionDetailResponse:
-        session = await self._get_session_or_404(session_id)
-        perspectives = await self._perspectives.list_for_session(session_id)
+        # Every lookup is independent of the others, so they share one round trip. Comments
+        # are read up front too: they cannot exist before advice, so the read is cheap
+        # whenever they end up hidden. The first page is embedded; the rest is paged
+        # through /comments from `comments_next_cursor`.
+        lookups: list[asyncio.Future[Any]] = [
+            asyncio.ensure_future(self._get_session_or_404(session_id)),
+            asyncio.ensure_future(self._perspectives.list_for_session(session_id)),
+            asyncio.ensure_future(self._comment_page(session_id, settings.max_page_size)),
+            self._reflection_lookup(session_id, current_user_type),
+            self._advice_lookup(session_id),
+            self._job_status_lookup(session_id),
+        ]
+        try:
+            (
+                session,
+                perspectives,
+                (comments, comments_next_cursor),
+                reflection,
+                advice,
+                job_statuses,
+            ) = await asyncio.gather(*lookups)
+        except BaseException:
+            # A missing session fails the request: stop the reads still in flight.
+            for lookup in lookups:
+                lookup.cancel()
+            raise
         my_perspective = next(
             (item for item in perspectives if item.user_type == current_user_type), None
         )
         other_user_type = get_other_user_type(current_user_type)
-        reflection_status, reflection = await self._reflection_status(session_id, current_user_type)
-        advice_status, advice = await self._advice_status(session)
+        reflection_status, reflection = self._reflection_status_of(reflection, job_statuses)
+        advice_status, advice = self._advice_status_of(session, advice, job_statuses)
         has_marked_resolved, other_has_marked_resolved = self._agreement_flags(
             session.resolved_by_user_types, current_user_type
         )
         has_marked_archived, other_has_marked_archived = self._agreement_flags(
             session.archived_by_user_types, current_user_type
         )
-        comments = (
-            await self._comments.list_for_session(session_id)
-            if advice_status == "AVAILABLE"
-            or session.status == MediationSessionStatus.DISCUSSION_OPEN
-            else []
-        )
+        if not (
+            advice_status == "AVAILABLE" or session.status == MediationSessionStatus.DISCUSSION_OPEN
+        ):
+            comments, comments_next_cursor = [], None
         return MediationSessionDetailResponse(
             id=str(session.id),
             title=session.title,
@@ -323,7 +421,8 @@ class MediationService:
             other_perspective_status=self._other_status(perspectives, other_user_type),
             advice_status=advice_status,
             advice=advice,
-            comments=[MediationCommentResponse(**comment.model_dump()) for comment in comments],
+            comments=comments,
+            comments_next_cursor=comments_next_cursor,
         )
 
     async def get_my_perspective(
@@ -346,11 +445,20 @@ class MediationService:
             PerspectiveStatus.SUBMITTED_PENDING_REVIEW,
         }:
             raise ConflictException("Perspective is already submitted")
-        return await self._perspectives.upsert_draft(
+        perspective = await self._perspectives.upsert_draft(
             session_id,
             current_user_type,
             payload.model_dump(),
         )
+        if existing is None:
+            await publish_mediation_event(
+                session_id,
+                MediationEventType.PERSPECTIVE_STATUS_CHANGED,
+                entity_id=str(perspective.id),
+                user_type=current_user_type,
+                perspective_status=PerspectiveStatus.DRAFT,
+            )
+        return perspective
 
     async def submit_my_perspective(
         self, session_id: MongoId, current_user_type: UserType
@@ -377,6 +485,13 @@ class MediationService:
             raise ConflictException("Perspective is already submitted")
 
         created_jobs = [await self._create_perspective_moderation_job(session_id, str(pending.id))]
+        await publish_mediation_event(
+            session_id,
+            MediationEventType.PERSPECTIVE_STATUS_CHANGED,
+            entity_id=str(pending.id),
+            user_type=current_user_type,
+            perspective_status=pending.status,
+        )
 
         return SubmitPerspectiveResponse(
             perspective=PerspectiveResponse(**pending.model_dump()),
@@ -416,13 +531,39 @@ class MediationService:
             raise ConflictException("Session is blocked for safety review")
 
     async def list_comments(
-        self, session_id: MongoId, current_user_type: UserType
-    ) -> list[MediationCommentResponse]:
+        self,
+        session_id: MongoId,
+        current_user_type: UserType,
+        limit: int,
+        cursor: str | None = None,
+        since: datetime | None = None,
+    ) -> MediationCommentPage:
         del current_user_type
         session = await self._get_session_or_404(session_id)
         await self._assert_comments_available(session)
-        comments = await self._comments.list_for_session(session_id)
-        return [MediationCommentResponse(**comment.model_dump()) for comment in comments]
+        return await self._comment_page(
+            session_id, limit, decode_comment_cursor(cursor) if cursor else None, since
+        )
+
+    async def _comment_page(
+        self,
+        session_id: MongoId,
+        limit: int,
+        cursor: MediationCommentCursorPayload | None = None,
+        since: datetime | None = None,
+    ) -> MediationCommentPage:
+        comments = await self._comments.list_page(
+            session_id, limit=limit + 1, cursor=cursor, since=since
+        )
+        has_more = len(comments) > limit
+        comments = comments[:limit]
+        next_cursor = None
+        if has_more and comments:
+            last = comments[-1]
+            next_cursor = encode_comment_cursor(last.created_at, str(last.id))
+        return [
+            MediationCommentResponse(**comment.model_dump()) for comment in comments
+        ], next_cursor
 
     async def create_comment(
         self,
@@ -463,6 +604,9 @@ class MediationService:
         )
         if decision.should_block_normal_mediation:
             await self._sessions.set_safety_status(session_id, SafetyStatus.BLOCKED)
+            await publish_mediation_event(
+                session_id, MediationEventType.STATUS_CHANGED, safety_status=SafetyStatus.BLOCKED
+            )
             raise ConflictException(decision.user_message or "Comment blocked for safety")
 
         comment = await self._comments.create_user_comment(
@@ -473,8 +617,19 @@ class MediationService:
             str(moderation.id),
         )
         job = await self._create_comment_response_job(session_id, str(comment.id))
+        await publish_mediation_event(
+            session_id,
+            MediationEventType.COMMENT_ADDED,
+            entity_id=str(comment.id),
+            user_type=current_user_type,
+        )
         if session.status == MediationSessionStatus.AI_ADVICE_AVAILABLE:
             await self._sessions.set_status(session_id, MediationSessionStatus.DISCUSSION_OPEN)
+            await publish_mediation_event(
+                session_id,
+                MediationEventType.STATUS_CHANGED,
+                status=MediationSessionStatus.DISCUSSION_OPEN,
+            )
         return CommentCreateResponse(
             comment=MediationCommentResponse(**comment.model_dump()),
             job=job,
@@ -493,6 +648,8 @@ class MediationService:
         resolved_by.add(current_user_type)
         finalize = resolved_by == ALL_MEDIATION_USER_TYPES
         updated = await self._sessions.mark_resolved(session_id, list(resolved_by), finalize)
+        if updated:
+            await self._publish_status(updated)
         return updated or session
 
     async def unresolve_session(
@@ -507,6 +664,8 @@ class MediationService:
         resolved_by = self._agreement_set(session.resolved_by_user_types)
         resolved_by.discard(current_user_type)
         updated = await self._sessions.unmark_resolved(session_id, list(resolved_by))
+        if updated:
+            await self._publish_status(updated)
         return updated or session
 
     async def archive_session(
@@ -523,6 +682,8 @@ class MediationService:
             or archived_by == ALL_MEDIATION_USER_TYPES
         )
         updated = await self._sessions.mark_archived(session_id, list(archived_by), finalize)
+        if updated:
+            await self._publish_status(updated)
         return updated or session
 
     async def unarchive_session(
@@ -535,4 +696,6 @@ class MediationService:
         archived_by = self._agreement_set(session.archived_by_user_types)
         archived_by.discard(current_user_type)
         updated = await self._sessions.unmark_archived(session_id, list(archived_by))
+        if updated:
+            await self._publish_status(updated)
         return updated or session
@@ -29,7 +29,9 @@ from app.schemas.v1.mediation import (
     MediationAIJobType,
     MediationAIReflection,
     MediationEntityType,
+    MediationEventType,
     MediationModerationResult,
+    MediationPerspective,
     MediationProvider,
     MediationSessionStatus,
     PerspectiveStatus,
@@ -37,11 +39,15 @@ from app.schemas.v1.mediation import (
     SafetyStatus,
     SharedMediationAdviceOutput,
 )
+from app.services.mediation_events import publish_mediation_event
 from app.services.mediation_safety import MediationSafetyService, ModerationDecision
 from app.util.time import utc_now
 
 settings = get_settings()
 
+# Most recent comments given to the model as discussion context.
+_COMMENT_CONTEXT_SIZE = 20
+
 
 class MediationAIService:
     def __init__(
@@ -64,6 +70,27 @@ class MediationAIService:
         self._safety = safety_service
         self._openai = openai_client
 
+    async def _set_status(self, session_id: str, status: MediationSessionStatus) -> None:
+        await self._sessions.set_status(session_id, status)
+        await publish_mediation_event(session_id, MediationEventType.STATUS_CHANGED, status=status)
+
+    async def _set_safety_status(self, session_id: str, safety_status: SafetyStatus) -> None:
+        await self._sessions.set_safety_status(session_id, safety_status)
+        await publish_mediation_event(
+            session_id, MediationEventType.STATUS_CHANGED, safety_status=safety_status
+        )
+
+    async def _publish_perspective_status(
+        self, perspective: MediationPerspective, status: PerspectiveStatus
+    ) -> None:
+        await publish_mediation_event(
+            perspective.session_id,
+            MediationEventType.PERSPECTIVE_STATUS_CHANGED,
+            entity_id=str(perspective.id),
+            user_type=perspective.user_type,
+            perspective_status=status,
+        )
+
     async def process_job(self, job: MediationAIJob) -> None:
         if job.job_type == MediationAIJobType.PERSPECTIVE_MODERATION:
             await self.moderate_perspective_submission(job)
@@ -149,7 +176,7 @@ class MediationAIService:
             await self._create_private_reflection_job(job.session_id, str(perspective.id))
             locked_count = await self._perspectives.count_locked_for_session(job.session_id)
             if locked_count >= 2:
-                await self._sessions.set_status(
+                await self._set_status(
                     job.session_id, MediationSessionStatus.AI_MEDIATION_PROCESSING
                 )
                 await self._create_shared_advice_job(job.session_id)
@@ -161,33 +188,32 @@ class MediationAIService:
         moderation = await self._persist_perspective_moderation(job, decision)
         if decision.should_block_normal_mediation:
             await self._perspectives.mark_flagged(str(perspective.id), str(moderation.id))
-            await self._sessions.set_safety_status(job.session_id, SafetyStatus.BLOCKED)
+            await self._publish_perspective_status(perspective, PerspectiveStatus.FLAGGED)
+            await self._set_safety_status(job.session_id, SafetyStatus.BLOCKED)
             return
 
         locked = await self._perspectives.lock_perspective(str(perspective.id), str(moderation.id))
         if not locked:
             return
+        await self._publish_perspective_status(perspective, PerspectiveStatus.LOCKED)
 
         await self._create_private_reflection_job(job.session_id, str(locked.id))
         locked_count = await self._perspectives.count_locked_for_session(job.session_id)
         if locked_count == 1:
-            await self._sessions.set_status(
+            await self._set_status(
                 job.session_id, MediationSessionStatus.PARTIAL_PERSPECTIVE_SUBMITTED
             )
         else:
-            await self._sessions.set_status(
-                job.session_id, MediationSessionStatus.AI_MEDIATION_PROCESSING
-            )
+            await self._set_status(job.session_id, MediationSessionStatus.AI_MEDIATION_PROCESSING)
             await self._create_shared_advice_job(job.session_id)
 
     async def _persist_output_moderation(
         self,
         *,
-        output_text: str,
+        decision: ModerationDecision,
         entity_type: MediationEntityType,
         entity_id: str,
     ) -> MediationModerationResult:
-        decision = await self._safety.moderate_ai_output(output_text)
         result = MediationModerationResult(
             entity_type=entity_type,
             entity_id=entity_id,
@@ -207,7 +233,7 @@ class MediationAIService:
         self, job: MediationAIJob, decision: ModerationDecision
     ) -> None:
         if decision.should_block_normal_mediation:
-            await self._sessions.set_safety_status(job.session_id, SafetyStatus.BLOCKED)
+            await self._set_safety_status(job.session_id, SafetyStatus.BLOCKED)
             raise RuntimeError("AI output blocked by moderation")
 
     async def generate_private_reflection(self, job: MediationAIJob) -> None:
@@ -236,11 +262,11 @@ class MediationAIService:
         decision = await self._safety.moderate_ai_output(content.model_dump_json())
         await self._block_if_output_unsafe(job, decision)
         moderation = await self._persist_output_moderation(
-            output_text=content.model_dump_json(),
+            decision=decision,
             entity_type=MediationEntityType.AI_REFLECTION,
             entity_id=f"pending_reflection:{job.id}",
         )
-        await self._ai.insert_reflection(
+        reflection = await self._ai.insert_reflection(
             MediationAIReflection(
                 session_id=job.session_id,
                 perspective_id=str(perspective.id),
@@ -253,6 +279,12 @@ class MediationAIService:
                 moderation_result_id=str(moderation.id),
             )
         )
+        await publish_mediation_event(
+            job.session_id,
+            MediationEventType.REFLECTION_AVAILABLE,
+            entity_id=str(reflection.id),
+            recipient_user_type=perspective.user_type,
+        )
 
     async def generate_shared_advice(self, job: MediationAIJob) -> None:
         session = await self._sessions.get_by_id(job.session_id)
@@ -277,8 +309,9 @@ class MediationAIService:
             safety_identifier=f"mediation:{job.session_id}:shared",
         )
         content = SharedMediationAdviceOutput.model_validate(result.parsed)
+        decision = await self._safety.moderate_ai_output(content.model_dump_json())
         moderation = await self._persist_output_moderation(
-            output_text=content.model_dump_json(),
+            decision=decision,
             entity_type=MediationEntityType.AI_ADVICE,
             entity_id=f"pending_advice:{job.id}",
         )
@@ -294,6 +327,12 @@ class MediationAIService:
             )
         )
         await self._sessions.set_latest_advice(job.session_id, str(advice.id))
+        await publish_mediation_event(
+            job.session_id,
+            MediationEventType.ADVICE_AVAILABLE,
+            entity_id=str(advice.id),
+            status=MediationSessionStatus.AI_ADVICE_AVAILABLE,
+        )
 
     async def generate_comment_response(self, job: MediationAIJob) -> None:
         if not job.source_entity_id:
@@ -305,13 +344,13 @@ class MediationAIService:
         if not comment:
             raise NotFoundException("Mediation comment", job.source_entity_id)
         advice = await self._ai.get_latest_advice(job.session_id)
-        comments = await self._comments.list_for_session(job.session_id)
+        comments = await self._comments.list_recent(job.session_id, _COMMENT_CONTEXT_SIZE)
         user_input = json.dumps(
             {
                 "session": session.model_dump(mode="json"),
                 "advice": advice.content.model_dump(mode="json") if advice else None,
                 "new_comment": comment.model_dump(mode="json"),
-                "recent_comments": [item.model_dump(mode="json") for item in comments[-20:]],
+                "recent_comments": [item.model_dump(mode="json") for item in comments],
             },
             ensure_ascii=True,
         )
@@ -327,17 +366,20 @@ class MediationAIService:
         decision = await self._safety.moderate_ai_output(content.model_dump_json())
         await self._block_if_output_unsafe(job, decision)
         await self._persist_output_moderation(
-            output_text=content.model_dump_json(),
+            decision=decision,
             entity_type=MediationEntityType.AI_COMMENT,
             entity_id=f"pending_ai_comment:{job.id}",
         )
-        await self._comments.create_ai_comment(
+        ai_comment = await self._comments.create_ai_comment(
             job.session_id,
             str(comment.id),
             content.response,
             str(job.id) if job.id else None,
         )
+        await publish_mediation_event(
+            job.session_id, MediationEventType.COMMENT_ADDED, entity_id=str(ai_comment.id)
+        )
         if content.should_pause_discussion:
-            await self._sessions.set_safety_status(job.session_id, SafetyStatus.NEEDS_REVIEW)
+            await self._set_safety_status(job.session_id, SafetyStatus.NEEDS_REVIEW)
         elif session.status == MediationSessionStatus.AI_ADVICE_AVAILABLE:
-            await self._sessions.set_status(job.session_id, MediationSessionStatus.DISCUSSION_OPEN)
+            await self._set_status(job.session_id, MediationSessionStatus.DISCUSSION_OPEN)
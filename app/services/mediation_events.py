@@ -0,0 +1,56 @@
+"""Per-session push channel for mediation clients.
+
+`publish_mediation_event` is called after every write a client would otherwise poll
+for. With the "memory" backend events go straight to `mediation_broker`. With the
+"mongo" backend they are inserted into a TTL collection, and the relay worker feeds
+them back into each process's broker from a change stream, so events published by a
+separate worker process still reach API subscribers.
+"""
+
+from typing import Any
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.mongo_client import get_db
+from app.repositories.mediation import MediationEventRepository
+from app.schemas.v1.base import MongoId
+from app.schemas.v1.mediation import MediationEvent, MediationEventType
+from app.util.pubsub import Broker
+from app.util.time import utc_now
+
+settings = get_settings()
+
+logger = get_logger(__name__)
+
+mediation_broker: Broker[MediationEvent] = Broker()
+
+_repository: MediationEventRepository | None = None
+
+
+def _repo() -> MediationEventRepository:
+    global _repository
+    if _repository is None:
+        _repository = MediationEventRepository(get_db())
+    return _repository
+
+
+def relay_mediation_event(event: MediationEvent) -> None:
+    mediation_broker.publish(str(event.session_id), event)
+
+
+async def publish_mediation_event(
+    session_id: MongoId, event_type: MediationEventType, **fields: Any
+) -> None:
+    """Publish an event for `session_id`. Never raises: a lost notification must not
+    fail the write that caused it, and clients can always fall back to polling."""
+    event = MediationEvent(
+        session_id=session_id, event_type=event_type, created_at=utc_now(), **fields
+    )
+    if settings.mediation_events_backend != "mongo":
+        relay_mediation_event(event)
+        return
+    try:
+        await _repo().insert(event)
+    except Exception:
+        logger.exception("Storing mediation event %s failed", event_type.value)
+        relay_mediation_event(event)
@@ -1,11 +1,16 @@
+import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Annotated
 
 from fastapi import Depends
 
+from app.core.config import get_settings
 from app.integrations.openai_client import OpenAIClient, OpenAIModerationResult
 from app.schemas.v1.mediation import SafetyStatus
 
+settings = get_settings()
+
 
 @dataclass(frozen=True)
 class ModerationDecision:
@@ -18,9 +23,43 @@ class ModerationDecision:
     user_message: str | None = None
 
 
+class ModerationDecisionCache:
+    """Bounded LRU of upstream moderation decisions keyed by a hash of the text."""
+
+    def __init__(self, max_entries: int) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, ModerationDecision] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> ModerationDecision | None:
+        decision = self._entries.get(key)
+        if decision is not None:
+            self._entries.move_to_end(key)
+        return decision
+
+    def set(self, key: str, decision: ModerationDecision) -> None:
+        self._entries[key] = decision
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+# Shared by every service instance: the API builds one per request.
+moderation_decision_cache = ModerationDecisionCache(settings.mediation_moderation_cache_max_entries)
+
+
 class MediationSafetyService:
     def __init__(self, openai_client: Annotated[OpenAIClient, Depends()]) -> None:
         self._openai = openai_client
+        self._cache = moderation_decision_cache
 
     def _decision_from_result(self, result: OpenAIModerationResult) -> ModerationDecision:
         blocking_categories = {
@@ -90,9 +129,14 @@ class MediationSafetyService:
         internal = self._internal_keyword_decision(text)
         if internal:
             return internal
+        key = self._cache.key(text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
         try:
             result = await self._openai.moderate_text(text=text)
         except RuntimeError:
+            # Not cached: the next attempt should reach the moderation API again.
             return ModerationDecision(
                 flagged=False,
                 safety_status=SafetyStatus.NORMAL,
@@ -101,7 +145,9 @@ class MediationSafetyService:
                 raw_result=None,
                 should_block_normal_mediation=False,
             )
-        return self._decision_from_result(result)
+        decision = self._decision_from_result(result)
+        self._cache.set(key, decision)
+        return decision
 
     def _bypassed_decision(self) -> ModerationDecision:
         return ModerationDecision(
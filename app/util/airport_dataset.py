@@ -0,0 +1,252 @@
+"""Compact binary encoding of the bundled airport dataset.
+
+``app/data/airports.json`` stays the source of truth; ``scripts/build_airport_dataset.py``
+compiles it into ``app/data/airports.bin`` which can be memory-mapped and read without
+parsing the whole file. Layout (little-endian, version 1):
+
+    header        magic "CDAP", u16 version, u16 reserved, u32 count, u32 strings_size
+    icao          count * 4 ASCII bytes, sorted ascending (enables binary search)
+    iata          count * 3 ASCII bytes
+    padding       zero bytes up to the next 8-byte boundary
+    latitude      count * float64
+    longitude     count * float64
+    string refs   count * 3 * (u32 offset, u32 length) for name, city, country
+    strings       UTF-8 string table, each distinct value stored once
+"""
+
+import json
+import mmap
+import struct
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any, Self
+
+from app.schemas.v1.airport import AirportCreate
+
+MAGIC = b"CDAP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHII")
+_FLOAT = struct.Struct("<d")
+_STRING_REF = struct.Struct("<II")
+_ICAO_WIDTH = 4
+_IATA_WIDTH = 3
+_STRING_FIELDS = ("name", "city", "country")
+
+
+def _align8(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def encode_airport_dataset(rows: Iterable[AirportCreate]) -> bytes:
+    """Serialize airports into the binary layout described in the module docstring."""
+    airports = sorted(rows, key=lambda a: a.icao)
+    count = len(airports)
+
+    strings = bytearray()
+    string_offsets: dict[str, tuple[int, int]] = {}
+
+    def intern(value: str) -> tuple[int, int]:
+        ref = string_offsets.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = (len(strings), len(encoded))
+            strings.extend(encoded)
+            string_offsets[value] = ref
+        return ref
+
+    icao = bytearray()
+    iata = bytearray()
+    latitudes = bytearray()
+    longitudes = bytearray()
+    refs = bytearray()
+    for airport in airports:
+        icao.extend(airport.icao.encode("ascii"))
+        iata.extend(airport.iata.encode("ascii"))
+        latitudes.extend(_FLOAT.pack(airport.latitude))
+        longitudes.extend(_FLOAT.pack(airport.longitude))
+        for field in _STRING_FIELDS:
+            refs.extend(_STRING_REF.pack(*intern(getattr(airport, field))))
+
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, 0, count, len(strings)))
+    out.extend(icao)
+    out.extend(iata)
+    out.extend(b"\x00" * (_align8(len(out)) - len(out)))
+    out.extend(latitudes)
+    out.extend(longitudes)
+    out.extend(refs)
+    out.extend(strings)
+    return bytes(out)
+
+
+def write_airport_dataset(rows: Iterable[AirportCreate], path: Path) -> int:
+    """Encode `rows` and write them to `path`. Returns the number of bytes written."""
+    data = encode_airport_dataset(rows)
+    path.write_bytes(data)
+    return len(data)
+
+
+class AirportRecord:
+    """Lazy view over one airport in an `AirportDataset`; fields decode on access."""
+
+    __slots__ = ("_dataset", "_index")
+
+    def __init__(self, dataset: AirportDataset, index: int) -> None:
+        self._dataset = dataset
+        self._index = index
+
+    @property
+    def icao(self) -> str:
+        return self._dataset._icao(self._index)
+
+    @property
+    def iata(self) -> str:
+        return self._dataset._iata(self._index)
+
+    @property
+    def name(self) -> str:
+        return self._dataset._string(self._index, 0)
+
+    @property
+    def city(self) -> str:
+        return self._dataset._string(self._index, 1)
+
+    @property
+    def country(self) -> str:
+        return self._dataset._string(self._index, 2)
+
+    @property
+    def latitude(self) -> float:
+        return self._dataset._float(self._dataset._lat_offset, self._index)
+
+    @property
+    def longitude(self) -> float:
+        return self._dataset._float(self._dataset._lon_offset, self._index)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "icao": self.icao,
+            "iata": self.iata,
+            "name": self.name,
+            "city": self.city,
+            "country": self.country,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+        }
+
+    def to_airport_create(self) -> AirportCreate:
+        return AirportCreate.model_validate(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"AirportRecord(icao={self.icao!r}, iata={self.iata!r})"
+
+
+class AirportDataset:
+    """Read-only, memory-mapped access to a binary airport dataset.
+
+    Only the header is decoded on open; every other field is read straight from the
+    mapped pages when a record is accessed, so opening is O(1) regardless of size.
+
+    Usage:
+        with AirportDataset.open(path) as dataset:
+            airport = dataset.find_by_icao("EHAM")
+    """
+
+    def __init__(self, buffer: Any, *, mapped: mmap.mmap | None = None) -> None:
+        self._buf = memoryview(buffer)
+        self._mmap = mapped
+        if len(self._buf) < _HEADER.size:
+            raise ValueError("Airport dataset is truncated")
+        magic, version, _, count, strings_size = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an airport dataset file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported airport dataset version {version}")
+
+        self._count: int = count
+        self._icao_offset = _HEADER.size
+        self._iata_offset = self._icao_offset + count * _ICAO_WIDTH
+        self._lat_offset = _align8(self._iata_offset + count * _IATA_WIDTH)
+        self._lon_offset = self._lat_offset + count * _FLOAT.size
+        self._refs_offset = self._lon_offset + count * _FLOAT.size
+        self._strings_offset = self._refs_offset + count * len(_STRING_FIELDS) * _STRING_REF.size
+        if self._strings_offset + strings_size != len(self._buf):
+            raise ValueError("Airport dataset size does not match its header")
+
+    @classmethod
+    def open(cls, path: Path) -> Self:
+        with path.open("rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, mapped=mapped)
+
+    def close(self) -> None:
+        self._buf.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> AirportRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Airport index out of range")
+        return AirportRecord(self, index)
+
+    def __iter__(self) -> Iterator[AirportRecord]:
+        for index in range(self._count):
+            yield AirportRecord(self, index)
+
+    def _icao_bytes(self, index: int) -> bytes:
+        start = self._icao_offset + index * _ICAO_WIDTH
+        return bytes(self._buf[start : start + _ICAO_WIDTH])
+
+    def _icao(self, index: int) -> str:
+        return self._icao_bytes(index).decode("ascii")
+
+    def _iata(self, index: int) -> str:
+        start = self._iata_offset + index * _IATA_WIDTH
+        return bytes(self._buf[start : start + _IATA_WIDTH]).decode("ascii")
+
+    def _float(self, column_offset: int, index: int) -> float:
+        return _FLOAT.unpack_from(self._buf, column_offset + index * _FLOAT.size)[0]
+
+    def _string(self, index: int, field: int) -> str:
+        ref_at = self._refs_offset + (index * len(_STRING_FIELDS) + field) * _STRING_REF.size
+        offset, length = _STRING_REF.unpack_from(self._buf, ref_at)
+        start = self._strings_offset + offset
+        return bytes(self._buf[start : start + length]).decode("utf-8")
+
+    def find_by_icao(self, icao: str) -> AirportRecord | None:
+        """Binary search the sorted ICAO column."""
+        target = icao.upper().encode("ascii", errors="replace")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._icao_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._icao_bytes(lo) == target:
+            return AirportRecord(self, lo)
+        return None
+
+    def find_by_iata(self, iata: str) -> AirportRecord | None:
+        target = iata.upper()
+        return next((record for record in self if record.iata == target), None)
+
+
+def load_airport_rows(path: Path) -> list[Mapping[str, Any]]:
+    """Load raw airport rows from either the binary dataset or the JSON source."""
+    if path.suffix == ".bin":
+        with AirportDataset.open(path) as dataset:
+            return [record.to_dict() for record in dataset]
+    return json.loads(path.read_text(encoding="utf-8"))
@@ -1,6 +1,14 @@
+import base64
+import binascii
+import json
+from datetime import UTC, datetime
 from enum import Enum
 
+from bson import ObjectId
+
 from app.schemas.v1.airport import AirportCode
+from app.schemas.v1.exceptions import BadRequestException
+from app.schemas.v1.flight import FlightCursorPayload
 
 
 class AirportCodeType(Enum):
@@ -10,3 +18,36 @@ class AirportCodeType(Enum):
 
 def get_airport_code_type(airport_code: AirportCode) -> AirportCodeType:
     return AirportCodeType.IATA if len(airport_code) == 3 else AirportCodeType.ICAO
+
+
+def encode_flight_cursor(sort_at: datetime, flight_id: str) -> str:
+    sort_at_utc = sort_at.astimezone(UTC) if sort_at.tzinfo else sort_at.replace(tzinfo=UTC)
+    payload = {"sort_at": sort_at_utc.isoformat(), "id": flight_id}
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_flight_cursor(cursor: str) -> FlightCursorPayload:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        decoded = base64.urlsafe_b64decode(cursor + padding)
+        payload: dict[str, object] = json.loads(decoded.decode("utf-8"))
+
+        sort_at_value = payload.get("sort_at")
+        flight_id = payload.get("id")
+
+        if not isinstance(sort_at_value, str) or not isinstance(flight_id, str):
+            raise ValueError("Cursor payload is missing required fields")
+
+        sort_at = datetime.fromisoformat(sort_at_value)
+        if sort_at.tzinfo is None:
+            sort_at = sort_at.replace(tzinfo=UTC)
+        else:
+            sort_at = sort_at.astimezone(UTC)
+
+        if not ObjectId.is_valid(flight_id):
+            raise ValueError("Invalid flight id")
+
+        return FlightCursorPayload(sort_at=sort_at, id=flight_id)
+    except (ValueError, TypeError, json.JSONDecodeError, binascii.Error) as exc:
+        raise BadRequestException("Invalid cursor") from exc
@@ -0,0 +1,34 @@
+import base64
+import binascii
+import json
+from datetime import UTC, datetime
+
+from bson import ObjectId
+
+from app.schemas.v1.exceptions import BadRequestException
+from app.schemas.v1.mediation import MediationCommentCursorPayload
+
+
+def encode_comment_cursor(created_at: datetime, comment_id: str) -> str:
+    payload = {"created_at": created_at.astimezone(UTC).isoformat(), "id": comment_id}
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_comment_cursor(cursor: str) -> MediationCommentCursorPayload:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload: dict[str, object] = json.loads(base64.urlsafe_b64decode(cursor + padding))
+
+        created_at_value = payload.get("created_at")
+        comment_id = payload.get("id")
+        if not isinstance(created_at_value, str) or not isinstance(comment_id, str):
+            raise ValueError("Cursor payload is missing required fields")
+        if not ObjectId.is_valid(comment_id):
+            raise ValueError("Invalid comment id")
+
+        return MediationCommentCursorPayload(
+            created_at=datetime.fromisoformat(created_at_value), id=comment_id
+        )
+    except (ValueError, TypeError, json.JSONDecodeError, binascii.Error) as exc:
+        raise BadRequestException("Invalid cursor") from exc
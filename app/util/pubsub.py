@@ -0,0 +1,41 @@
+"""In-process publish/subscribe for pushing change notifications to open streams."""
+
+import asyncio
+import contextlib
+from collections import defaultdict
+from collections.abc import Iterator
+
+
+class Broker[T]:
+    """Fan events out to every subscriber of a topic.
+
+    Each subscriber gets its own bounded queue. Publishing never blocks: when a slow
+    subscriber's queue is full, its oldest event is dropped to make room, so streams
+    built on top should treat events as hints to re-read state rather than as a log.
+    """
+
+    def __init__(self, max_queue_size: int = 100) -> None:
+        self._max_queue_size = max_queue_size
+        self._subscribers: defaultdict[str, set[asyncio.Queue[T]]] = defaultdict(set)
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscribers.get(topic, ()))
+
+    def publish(self, topic: str, event: T) -> None:
+        for queue in tuple(self._subscribers.get(topic, ())):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    @contextlib.contextmanager
+    def subscribe(self, topic: str) -> Iterator[asyncio.Queue[T]]:
+        queue: asyncio.Queue[T] = asyncio.Queue(maxsize=self._max_queue_size)
+        self._subscribers[topic].add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[topic]
@@ -0,0 +1,11 @@
+"""Server-sent events framing (https://html.spec.whatwg.org/multipage/server-sent-events.html)."""
+
+import json
+from typing import Any
+
+# Comment lines are ignored by EventSource but keep proxies from closing idle streams.
+SSE_HEARTBEAT = ": heartbeat\n\n"
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
@@ -0,0 +1,102 @@
+"""Run the mediation worker outside the web process.
+
+    python -m app.workers [--processes M]
+
+Each process runs one `run_mediation_worker` pool. Jobs are leased per process, so any
+number of these can run next to (or instead of) the in-process worker of the API.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import signal
+import sys
+
+from app.core.config import get_settings
+from app.core.logging import setup_logging
+from app.db.mongo_client import get_db
+from app.repositories.mediation import ensure_mediation_indexes
+from app.workers.mediation_worker import run_mediation_worker, worker_id
+
+settings = get_settings()
+
+
+async def _serve() -> None:
+    logger = setup_logging()
+    owner = worker_id()
+    if settings.mediation_events_backend != "mongo":
+        logger.warning(
+            "MEDIATION_EVENTS_BACKEND is not 'mongo'; session events from this worker "
+            "will not reach API clients"
+        )
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop_event.set)
+
+    await ensure_mediation_indexes(get_db())
+    logger.info("Mediation worker %s started", owner)
+    worker = asyncio.create_task(run_mediation_worker(stop_event, owner))
+    stopping = asyncio.create_task(stop_event.wait())
+    await asyncio.wait({worker, stopping}, return_when=asyncio.FIRST_COMPLETED)
+    if not worker.done():
+        # Give in-flight jobs the same grace period as the in-process worker.
+        await asyncio.wait({worker}, timeout=settings.mediation_worker_shutdown_timeout_seconds)
+    if not worker.done():
+        logger.warning(
+            "Mediation worker %s did not stop within %ss; cancelling its running jobs",
+            owner,
+            settings.mediation_worker_shutdown_timeout_seconds,
+        )
+        worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await worker
+    stopping.cancel()
+    if not worker.cancelled():
+        # Surface a worker that crashed rather than stopped.
+        worker.result()
+    logger.info("Mediation worker %s stopped", owner)
+
+
+def _run_process() -> None:
+    asyncio.run(_serve())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run mediation AI workers.")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.mediation_worker_processes,
+        help="Number of worker processes (default: MEDIATION_WORKER_PROCESSES).",
+    )
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _run_process()
+        return 0
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_run_process, name=f"mediation-worker-{index}")
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def stop_children(signum: int, _frame: object) -> None:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, stop_children)
+    signal.signal(signal.SIGINT, stop_children)
+    for process in processes:
+        process.join()
+    return 1 if any(process.exitcode for process in processes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import asyncio
+import contextlib
+
+from pymongo.errors import OperationFailure
+
+from app.core import logging
+from app.core.config import get_settings
+from app.db.mongo_client import get_db
+from app.repositories.flight import FlightRepository
+from app.services.flight_events import relay_flight_change, set_change_stream_active
+
+settings = get_settings()
+logger = logging.get_logger(__name__)
+
+# "The $changeStream stage is only supported on replica sets"
+_CHANGE_STREAMS_UNSUPPORTED = 40573
+_RESTART_DELAY_SECONDS = 5.0
+
+
+async def run_flight_change_stream_worker(stop_event: asyncio.Event | None = None) -> None:
+    """Relay flight writes from a Mongo change stream into the in-process broker.
+
+    On a standalone server change streams are unavailable; the worker then exits and
+    streams fall back to the events published by this process.
+    """
+    repository = FlightRepository(get_db())
+
+    while stop_event is None or not stop_event.is_set():
+        try:
+            async with repository.watch_changes() as changes:
+                set_change_stream_active(True)
+                async for event in changes:
+                    relay_flight_change(event)
+        except OperationFailure as exc:
+            if exc.code == _CHANGE_STREAMS_UNSUPPORTED:
+                logger.warning("Change streams unavailable; flight streams use in-process events")
+                return
+            logger.exception("Flight change stream failed")
+        except Exception:
+            logger.exception("Flight change stream failed")
+        finally:
+            set_change_stream_active(False)
+
+        if stop_event is None:
+            await asyncio.sleep(_RESTART_DELAY_SECONDS)
+            continue
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop_event.wait(), timeout=_RESTART_DELAY_SECONDS)
@@ -0,0 +1,33 @@
+import asyncio
+import contextlib
+
+from app.core import logging
+from app.core.config import get_settings
+from app.db.mongo_client import get_db
+from app.repositories.airport import AirportRepository
+from app.repositories.flight import FlightRepository
+from app.services.flight import FlightService
+
+settings = get_settings()
+logger = logging.get_logger(__name__)
+
+
+async def run_flight_expiration_worker(stop_event: asyncio.Event | None = None) -> None:
+    db = get_db()
+    service = FlightService(flights=FlightRepository(db), airports=AirportRepository(db))
+
+    while stop_event is None or not stop_event.is_set():
+        try:
+            expired = await service.expire_flights()
+            if expired:
+                logger.info("Expired %d flight(s)", expired)
+        except Exception:
+            logger.exception("Flight expiration sweep failed")
+
+        if stop_event is None:
+            await asyncio.sleep(settings.flight_expiration_interval_seconds)
+            continue
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(
+                stop_event.wait(), timeout=settings.flight_expiration_interval_seconds
+            )
@@ -0,0 +1,38 @@
+import asyncio
+import contextlib
+
+from app.core import logging
+from app.core.config import get_settings
+from app.db.mongo_client import get_db
+from app.repositories.airport import AirportRepository
+from app.repositories.call_budget import CallBudgetRepository
+from app.repositories.flight import FlightRepository
+from app.services.flight_tracker import FlightTracker
+
+settings = get_settings()
+logger = logging.get_logger(__name__)
+
+
+async def run_flight_tracker_worker(stop_event: asyncio.Event | None = None) -> None:
+    db = get_db()
+    tracker = FlightTracker(
+        flights=FlightRepository(db),
+        airports=AirportRepository(db),
+        budget=CallBudgetRepository(db),
+    )
+
+    while stop_event is None or not stop_event.is_set():
+        try:
+            tracked = await tracker.track_due_flights()
+            if tracked:
+                logger.info("Refreshed live status of %d flight(s)", tracked)
+        except Exception:
+            logger.exception("Flight tracker pass failed")
+
+        if stop_event is None:
+            await asyncio.sleep(settings.flight_tracker_interval_seconds)
+            continue
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(
+                stop_event.wait(), timeout=settings.flight_tracker_interval_seconds
+            )
@@ -0,0 +1,44 @@
+import asyncio
+import contextlib
+
+from pymongo.errors import OperationFailure
+
+from app.core import logging
+from app.core.config import get_settings
+from app.db.mongo_client import get_db
+from app.repositories.mediation import MediationEventRepository
+from app.services.mediation_events import relay_mediation_event
+
+settings = get_settings()
+logger = logging.get_logger(__name__)
+
+# "The $changeStream stage is only supported on replica sets"
+_CHANGE_STREAMS_UNSUPPORTED = 40573
+_RESTART_DELAY_SECONDS = 5.0
+
+
+async def run_mediation_event_relay(stop_event: asyncio.Event | None = None) -> None:
+    """Feed events stored by the "mongo" backend into this process's broker."""
+    repository = MediationEventRepository(get_db())
+
+    while stop_event is None or not stop_event.is_set():
+        try:
+            async with repository.watch_inserts() as events:
+                async for event in events:
+                    relay_mediation_event(event)
+        except OperationFailure as exc:
+            if exc.code == _CHANGE_STREAMS_UNSUPPORTED:
+                logger.error(
+                    "MEDIATION_EVENTS_BACKEND=mongo requires a replica set; "
+                    "mediation events will not be delivered"
+                )
+                return
+            logger.exception("Mediation event relay failed")
+        except Exception:
+            logger.exception("Mediation event relay failed")
+
+        if stop_event is None:
+            await asyncio.sleep(_RESTART_DELAY_SECONDS)
+            continue
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop_event.wait(), timeout=_RESTART_DELAY_SECONDS)
@@ -1,9 +1,16 @@
 import asyncio
+import contextlib
+import os
+import socket
+from collections import Counter
+from uuid import uuid4
+
+from pymongo.errors import OperationFailure
 
 from app.core import logging
 from app.core.config import get_settings
 from app.db.mongo_client import get_db
-from app.integrations.openai_client import OpenAIClient
+from app.integrations.openai_client import OpenAIClient, retry_after_seconds
 from app.repositories.mediation import (
     MediationAIRepository,
     MediationCommentRepository,
@@ -12,14 +19,218 @@ from app.repositories.mediation import (
     MediationPerspectiveRepository,
     MediationSessionRepository,
 )
+from app.schemas.v1.mediation import (
+    AIJobStatus,
+    MediationAIJob,
+    MediationAIJobType,
+    MediationEventType,
+)
 from app.services.mediation_ai import MediationAIService
+from app.services.mediation_events import publish_mediation_event
 from app.services.mediation_safety import MediationSafetyService
+from app.util.time import utc_now
 
 settings = get_settings()
 logger = logging.get_logger(__name__)
 
+# "The $changeStream stage is only supported on replica sets"
+_CHANGE_STREAMS_UNSUPPORTED = 40573
+_RESTART_DELAY_SECONDS = 5.0
+
+
+async def _wait(stop_event: asyncio.Event | None, timeout: float) -> None:
+    if stop_event is None:
+        await asyncio.sleep(timeout)
+        return
+    with contextlib.suppress(TimeoutError):
+        await asyncio.wait_for(stop_event.wait(), timeout=timeout)
+
+
+def _stopped(stop_event: asyncio.Event | None) -> bool:
+    return stop_event is not None and stop_event.is_set()
+
+
+async def _watch_for_jobs(
+    jobs: MediationJobRepository,
+    wake: asyncio.Event,
+    stream_active: asyncio.Event,
+    stop_event: asyncio.Event | None,
+) -> None:
+    """Set `wake` whenever a job becomes claimable. Exits if change streams are
+    unsupported, leaving the worker on fast polling."""
+    while not _stopped(stop_event):
+        try:
+            async with jobs.watch_claimable() as changes:
+                stream_active.set()
+                # The stream only reports changes after it opened; look once more.
+                wake.set()
+                async for _ in changes:
+                    wake.set()
+        except OperationFailure as exc:
+            if exc.code == _CHANGE_STREAMS_UNSUPPORTED:
+                logger.info("Change streams unavailable; mediation worker falls back to polling")
+                return
+            logger.exception("Mediation job change stream failed")
+        except Exception:
+            logger.exception("Mediation job change stream failed")
+        finally:
+            stream_active.clear()
+        await _wait(stop_event, _RESTART_DELAY_SECONDS)
+
+
+async def _sweep_stale_jobs(
+    jobs: MediationJobRepository, wake: asyncio.Event, stop_event: asyncio.Event | None
+) -> None:
+    while not _stopped(stop_event):
+        try:
+            failed = await jobs.fail_exhausted_stale_processing_jobs(
+                settings.mediation_job_lease_seconds
+            )
+            if failed:
+                logger.warning("Failed %d stale mediation job(s)", failed)
+        except Exception:
+            logger.exception("Stale mediation job sweep failed")
+        # Jobs that went stale with attempts left produce no change event; let the
+        # worker re-check so they are reclaimed on this timer too.
+        wake.set()
+        await _wait(stop_event, settings.mediation_stale_job_sweep_interval_seconds)
+
+
+async def _idle_timeout(jobs: MediationJobRepository, stream_active: asyncio.Event) -> float:
+    """How long to wait for a wake-up before claiming again. Scheduled retries produce
+    no change event when they fall due, so never sleep past the earliest one."""
+    timeout = (
+        settings.mediation_worker_fallback_poll_interval_seconds
+        if stream_active.is_set()
+        else settings.mediation_worker_poll_interval_seconds
+    )
+    try:
+        next_retry_at = await jobs.next_retry_at()
+    except Exception:
+        logger.exception("Looking up the next mediation job retry failed")
+        return timeout
+    if next_retry_at is None:
+        return timeout
+    return min(timeout, max(0.0, (next_retry_at - utc_now()).total_seconds()))
+
+
+def worker_id() -> str:
+    """Lease owner id, unique per worker run and readable in the jobs collection."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+async def _keep_lease(
+    jobs: MediationJobRepository, job_id: str, owner: str, processing: asyncio.Future[None]
+) -> None:
+    """Heartbeat until cancelled. If the lease is lost, another worker has reclaimed the
+    job, so stop processing it here rather than finish a second copy."""
+    while True:
+        await asyncio.sleep(settings.mediation_job_heartbeat_interval_seconds)
+        try:
+            if await jobs.heartbeat(job_id, owner):
+                continue
+        except Exception:
+            # Keep going: a missed beat or two is within the lease.
+            logger.exception("Heartbeat for mediation job %s failed", job_id)
+            continue
+        logger.warning("Lost the lease on mediation job %s; abandoning it", job_id)
+        processing.cancel()
+        return
 
-async def run_mediation_worker(stop_event: asyncio.Event | None = None) -> None:
+
+async def _process_claimed_job(
+    service: MediationAIService,
+    jobs: MediationJobRepository,
+    job: MediationAIJob,
+    owner: str,
+) -> None:
+    job_id = str(job.id)
+    await publish_mediation_event(
+        job.session_id,
+        MediationEventType.JOB_CLAIMED,
+        entity_id=job_id,
+        job_type=job.job_type,
+    )
+    processing = asyncio.ensure_future(service.process_job(job))
+    lease = asyncio.create_task(_keep_lease(jobs, job_id, owner, processing))
+    try:
+        await processing
+        await jobs.mark_completed(job_id, owner)
+    except asyncio.CancelledError:
+        if not lease.done():
+            raise
+    except Exception as exc:
+        logger.exception("Mediation AI job failed")
+        failed = await jobs.mark_failed_or_retry(
+            job_id, str(exc), owner, retry_after=retry_after_seconds(exc)
+        )
+        if failed and failed.status == AIJobStatus.FAILED:
+            await publish_mediation_event(
+                job.session_id,
+                MediationEventType.JOB_FAILED,
+                entity_id=job_id,
+                job_type=job.job_type,
+            )
+    finally:
+        lease.cancel()
+        processing.cancel()
+
+
+class _InFlightJobs:
+    """Jobs running in this worker, by task, with the bookkeeping needed to decide what
+    may be claimed next."""
+
+    def __init__(self) -> None:
+        self._jobs: dict[asyncio.Task[None], MediationAIJob] = {}
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def tasks(self) -> set[asyncio.Task[None]]:
+        return set(self._jobs)
+
+    def add(self, task: asyncio.Task[None], job: MediationAIJob) -> None:
+        self._jobs[task] = job
+        task.add_done_callback(self._jobs.pop)
+
+    def session_ids(self) -> list[str]:
+        # One job per session at a time keeps each session's jobs in rank order. Passing
+        # these saves a doomed claim; the jobs index enforces it across processes.
+        return sorted({job.session_id for job in self._jobs.values()})
+
+    def claimable_job_types(self) -> list[MediationAIJobType]:
+        running = Counter(job.job_type for job in self._jobs.values())
+        limits = settings.mediation_worker_job_type_limits
+        return [
+            job_type
+            for job_type in MediationAIJobType
+            if running[job_type] < limits.get(job_type.value, settings.mediation_worker_concurrency)
+        ]
+
+
+async def _wait_for_wake(
+    wake: asyncio.Event, stop_event: asyncio.Event | None, timeout: float
+) -> None:
+    waiters = [asyncio.ensure_future(wake.wait())]
+    if stop_event is not None:
+        waiters.append(asyncio.ensure_future(stop_event.wait()))
+    try:
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+async def run_mediation_worker(
+    stop_event: asyncio.Event | None = None, owner: str | None = None
+) -> None:
+    """Claim and run up to `mediation_worker_concurrency` jobs at once.
+
+    Once `stop_event` is set no new jobs are claimed and the worker returns after the
+    in-flight jobs finish. Cancelling the worker cancels them; their leases then lapse
+    and another worker reclaims them.
+    """
     db = get_db()
     openai_client = OpenAIClient()
     safety = MediationSafetyService(openai_client)
@@ -35,18 +246,39 @@ async def run_mediation_worker(stop_event: asyncio.Event | None = None) -> None:
         openai_client=openai_client,
     )
 
-    while stop_event is None or not stop_event.is_set():
-        stale_after = settings.mediation_job_processing_timeout_seconds
-        await jobs.fail_exhausted_stale_processing_jobs(stale_after)
-        job = await jobs.claim_next_pending_job(stale_after)
-        if not job:
-            await asyncio.sleep(settings.mediation_worker_poll_interval_seconds)
-            continue
-        try:
-            await service.process_job(job)
-            if job.id:
-                await jobs.mark_completed(str(job.id))
-        except Exception as exc:
-            logger.exception("Mediation AI job failed")
-            if job.id:
-                await jobs.mark_failed_or_retry(str(job.id), str(exc))
+    wake = asyncio.Event()
+    stream_active = asyncio.Event()
+    helpers = [asyncio.create_task(_sweep_stale_jobs(jobs, wake, stop_event))]
+    if settings.mediation_worker_change_stream_enabled:
+        helpers.append(asyncio.create_task(_watch_for_jobs(jobs, wake, stream_active, stop_event)))
+    in_flight = _InFlightJobs()
+    owner = owner or worker_id()
+
+    try:
+        while not _stopped(stop_event):
+            wake.clear()
+            job_types = in_flight.claimable_job_types()
+            if len(in_flight) < settings.mediation_worker_concurrency and job_types:
+                job = await jobs.claim_next_pending_job(
+                    settings.mediation_job_lease_seconds,
+                    owner=owner,
+                    job_types=job_types,
+                    exclude_session_ids=in_flight.session_ids(),
+                )
+                if job:
+                    task = asyncio.create_task(_process_claimed_job(service, jobs, job, owner))
+                    in_flight.add(task, job)
+                    # A finished job frees a slot and possibly its session's next job.
+                    task.add_done_callback(lambda _: wake.set())
+                    continue
+
+            await _wait_for_wake(wake, stop_event, await _idle_timeout(jobs, stream_active))
+
+        if in_flight:
+            logger.info("Waiting for %d in-flight mediation job(s)", len(in_flight))
+            await asyncio.wait(in_flight.tasks)
+    finally:
+        for task in in_flight.tasks:
+            task.cancel()
+        for helper in helpers:
+            helper.cancel()
@@ -0,0 +1,33 @@
+"""Copy each mediation perspective's status onto its session document.
+
+Sessions created before `perspective_statuses` existed list as having no
+perspectives until this has run once. It is idempotent.
+
+Usage:
+    python scripts/backfill_mediation_session_summaries.py
+"""
+
+import asyncio
+
+from app.core.config import get_settings
+from app.db.mongo_client import get_db
+from app.repositories.mediation import session_summary_write
+
+
+async def main() -> None:
+    settings = get_settings()
+    db = get_db()
+    perspectives = db[settings.mediation_perspectives_collection_name]
+    sessions = db[settings.mediation_sessions_collection_name]
+
+    updated = 0
+    projection = {"session_id": 1, "user_type": 1, "status": 1, "updated_at": 1}
+    async for doc in perspectives.find({}, projection):
+        # Conditional on updated_at, so it never overwrites a newer live transition.
+        result = await sessions.update_one(*session_summary_write(doc))
+        updated += result.modified_count
+    print({"sessions_updated": updated})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
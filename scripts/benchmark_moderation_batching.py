@@ -0,0 +1,134 @@
+"""Benchmark batched against unbatched moderation calls on a local stub server.
+
+Starts a stub of the OpenAI moderations endpoint that takes a fixed latency per request
+and serves a limited number of requests at once (like an upstream rate limit), then fires
+`--calls` concurrent moderations through `OpenAIClient` both ways.
+
+Usage:
+    python scripts/benchmark_moderation_batching.py --calls 500 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import time
+
+import uvicorn
+from fastapi import FastAPI
+
+CATEGORIES = (
+    "harassment",
+    "harassment/threatening",
+    "hate",
+    "hate/threatening",
+    "illicit",
+    "illicit/violent",
+    "self-harm",
+    "self-harm/instructions",
+    "self-harm/intent",
+    "sexual",
+    "sexual/minors",
+    "violence",
+    "violence/graphic",
+)
+
+
+def build_stub(latency_seconds: float, max_in_flight: int, counter: dict[str, int]) -> FastAPI:
+    stub = FastAPI()
+    in_flight = asyncio.Semaphore(max_in_flight)
+
+    @stub.post("/v1/moderations")
+    async def moderations(payload: dict) -> dict:
+        texts = payload["input"] if isinstance(payload["input"], list) else [payload["input"]]
+        async with in_flight:
+            counter["requests"] += 1
+            await asyncio.sleep(latency_seconds)
+        return {
+            "id": "modr-stub",
+            "model": payload.get("model", "omni-moderation-latest"),
+            "results": [
+                {
+                    "flagged": False,
+                    "categories": dict.fromkeys(CATEGORIES, False),
+                    "category_scores": dict.fromkeys(CATEGORIES, 0.0),
+                    "category_applied_input_types": {name: ["text"] for name in CATEGORIES},
+                }
+                for _ in texts
+            ],
+        }
+
+    return stub
+
+
+async def run(label: str, calls: int, concurrency: int, moderate, counter: dict[str, int]) -> None:
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        async with gate:
+            started = time.perf_counter()
+            await moderate(f"Message number {index}")
+            latencies.append(time.perf_counter() - started)
+
+    counter["requests"] = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(calls)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    print(
+        f"{label:<10}{calls / elapsed:>10.0f}/s{counter['requests']:>10}"
+        f"{statistics.median(latencies) * 1000:>10.0f}"
+        f"{latencies[int(0.99 * (len(latencies) - 1))] * 1000:>10.0f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--upstream-max-in-flight", type=int, default=8)
+    args = parser.parse_args()
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    os.environ["OPENAI_API_KEY"] = "stub-key"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+
+    # Imported after the environment points the client at the stub.
+    from app.integrations.openai_client import OpenAIClient, settings
+
+    settings.openai_api_key = "stub-key"
+    counter = {"requests": 0}
+    stub = build_stub(args.latency_ms / 1000, args.upstream_max_in_flight, counter)
+    server = uvicorn.Server(uvicorn.Config(stub, port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    client = OpenAIClient()
+
+    async def unbatched(text: str) -> None:
+        await client.moderate_texts([text])
+
+    async def batched(text: str) -> None:
+        await client.moderate_text(text=text)
+
+    print(
+        f"{args.calls} calls, {args.concurrency} concurrent, {args.latency_ms:.0f} ms stub "
+        f"latency, {args.upstream_max_in_flight} upstream requests in flight"
+    )
+    print(f"{'mode':<10}{'throughput':>12}{'requests':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    try:
+        await run("unbatched", args.calls, args.concurrency, unbatched, counter)
+        await run("batched", args.calls, args.concurrency, batched, counter)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""Compile the bundled airport JSON into the binary, memory-mappable dataset.
+
+``app/data/airports.json`` remains the source of truth; re-run this script after
+editing it so ``app/data/airports.bin`` stays in sync. Rows that fail validation are
+reported and left out, exactly as the seeder would skip them.
+
+Usage:
+    python scripts/build_airport_dataset.py
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from app.core.logging import get_logger, setup_logging
+from app.schemas.v1.airport import AirportCreate
+from app.util.airport_dataset import write_airport_dataset
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "app" / "data"
+
+logger = get_logger(__name__)
+
+
+def main() -> None:
+    setup_logging()
+
+    parser = argparse.ArgumentParser(description="Build the binary airport dataset.")
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=DATA_DIR / "airports.json",
+        help="Path to the airports JSON dataset (defaults to app/data/airports.json).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DATA_DIR / "airports.bin",
+        help="Where to write the binary dataset (defaults to app/data/airports.bin).",
+    )
+    args = parser.parse_args()
+
+    rows = json.loads(args.source.read_text(encoding="utf-8"))
+    airports: list[AirportCreate] = []
+    for row in rows:
+        try:
+            airports.append(AirportCreate.model_validate(row))
+        except Exception as exc:
+            logger.warning("Skipping invalid row %s: %s", row.get("icao", "?"), exc)
+
+    size = write_airport_dataset(airports, args.output)
+    logger.info(
+        "Wrote %d airport(s) to %s (%d bytes, source %d bytes)",
+        len(airports),
+        args.output,
+        size,
+        args.source.stat().st_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
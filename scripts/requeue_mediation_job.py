@@ -22,7 +22,13 @@ async def main() -> None:
                 "error_message": None,
                 "updated_at": utc_now(),
             },
-            "$unset": {"started_at": "", "completed_at": ""},
+            "$unset": {
+                "started_at": "",
+                "completed_at": "",
+                "lease_owner": "",
+                "heartbeat_at": "",
+                "next_attempt_at": "",
+            },
         },
     )
     print({"matched": result.matched_count, "modified": result.modified_count})
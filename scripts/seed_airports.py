@@ -4,13 +4,16 @@ The dataset lives at ``app/data/airports.json`` and is committed to the repo, so
 this script needs no network access. It is idempotent: airports are upserted by
 their (unique) ICAO code, so re-running it never creates duplicates.
 
+By default the compiled binary copy (``app/data/airports.bin``, built by
+``scripts/build_airport_dataset.py``) is memory-mapped instead of parsing the JSON;
+``--data-file`` accepts either format.
+
 Usage:
     python scripts/seed_airports.py
 """
 
 import argparse
 import asyncio
-import json
 from pathlib import Path
 
 from app.core.config import get_settings
@@ -18,9 +21,15 @@ from app.core.logging import get_logger, setup_logging
 from app.db.mongo_client import get_db
 from app.repositories.airport import ensure_airport_indexes
 from app.schemas.v1.airport import AirportCreate
+from app.util.airport_dataset import load_airport_rows
 from app.util.time import utc_now
 
-DATA_FILE = Path(__file__).resolve().parent.parent / "app" / "data" / "airports.json"
+DATA_DIR = Path(__file__).resolve().parent.parent / "app" / "data"
+DATA_FILE = (
+    DATA_DIR / "airports.bin"
+    if (DATA_DIR / "airports.bin").exists()
+    else DATA_DIR / "airports.json"
+)
 
 logger = get_logger(__name__)
 
@@ -33,7 +42,10 @@ async def main() -> None:
         "--data-file",
         type=Path,
         default=DATA_FILE,
-        help="Path to the airports JSON dataset (defaults to app/data/airports.json).",
+        help=(
+            "Path to the airports dataset, .bin or .json "
+            "(defaults to app/data/airports.bin, falling back to airports.json)."
+        ),
     )
     args = parser.parse_args()
 
@@ -46,7 +58,7 @@ async def main() -> None:
     collection = db[settings.airports_collection_name]
 
     logger.info("Loading dataset from %s", args.data_file)
-    rows = json.loads(args.data_file.read_text(encoding="utf-8"))
+    rows = load_airport_rows(args.data_file)
     logger.info("Loaded %d row(s); beginning upserts", len(rows))
 
     now = utc_now()
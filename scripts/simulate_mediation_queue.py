@@ -0,0 +1,171 @@
+"""Simulate the mediation job queue and report queue-wait percentiles per policy.
+
+Compares plain FIFO claiming with the ranked order the worker uses (priority, aging and
+per-session fairness, see `job_rank_at`) on the same synthetic workload: a number of
+ordinary sessions plus one chatty session that floods the queue with comment replies.
+
+Usage:
+    python scripts/simulate_mediation_queue.py --workers 4 --sessions 200
+"""
+
+import argparse
+import heapq
+import random
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from app.repositories.mediation import job_rank_at
+from app.schemas.v1.mediation import DEFAULT_JOB_PRIORITIES, MediationAIJobType
+
+EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+
+# Mean seconds a worker spends on each job type.
+SERVICE_SECONDS = {
+    MediationAIJobType.PERSPECTIVE_MODERATION: 1.0,
+    MediationAIJobType.COMMENT_RESPONSE: 6.0,
+    MediationAIJobType.SHARED_MEDIATION_ADVICE: 20.0,
+    MediationAIJobType.PRIVATE_REFLECTION: 12.0,
+}
+
+
+@dataclass
+class Job:
+    arrived_at: float
+    session_id: str
+    job_type: MediationAIJobType
+    service_seconds: float
+    rank: float = 0.0
+    started_at: float | None = None
+
+
+def build_workload(args: argparse.Namespace, rng: random.Random) -> list[Job]:
+    jobs: list[Job] = []
+
+    def add(at: float, session_id: str, job_type: MediationAIJobType) -> None:
+        service = rng.expovariate(1 / SERVICE_SECONDS[job_type])
+        jobs.append(Job(at, session_id, job_type, service))
+
+    for index in range(args.sessions):
+        session_id = f"session-{index}"
+        at = rng.uniform(0, args.duration)
+        # Two perspectives, each moderated and reflected on, then shared advice.
+        for _ in range(2):
+            at += rng.expovariate(1 / 30)
+            add(at, session_id, MediationAIJobType.PERSPECTIVE_MODERATION)
+            add(at, session_id, MediationAIJobType.PRIVATE_REFLECTION)
+        add(at, session_id, MediationAIJobType.SHARED_MEDIATION_ADVICE)
+        for _ in range(rng.randint(0, 3)):
+            at += rng.expovariate(1 / 60)
+            add(at, session_id, MediationAIJobType.COMMENT_RESPONSE)
+
+    at = 0.0
+    while True:
+        at += rng.expovariate(args.chatty_rate)
+        if at >= args.duration:
+            break
+        add(at, "chatty", MediationAIJobType.COMMENT_RESPONSE)
+
+    return sorted(jobs, key=lambda job: job.arrived_at)
+
+
+def simulate(workload: list[Job], workers: int, ranked: bool) -> list[Job]:
+    """Run the workload; a worker picks the lowest-ranked queued job whose session has
+    nothing in flight, like `claim_next_pending_job` with `exclude_session_ids`."""
+    jobs = [
+        Job(job.arrived_at, job.session_id, job.job_type, job.service_seconds) for job in workload
+    ]
+    queued: list[Job] = []
+    queued_per_session: defaultdict[str, int] = defaultdict(int)
+    busy_sessions: set[str] = set()
+    # (finishes_at, sequence, job) for every job in flight.
+    running: list[tuple[float, int, Job]] = []
+    idle = workers
+    sequence = 0
+    now = 0.0
+    pending = iter(jobs)
+    next_job = next(pending, None)
+
+    while next_job is not None or queued or running:
+        next_arrival = next_job.arrived_at if next_job else float("inf")
+        next_finish = running[0][0] if running else float("inf")
+        now = min(next_arrival, next_finish)
+
+        if next_finish <= next_arrival:
+            _, _, done = heapq.heappop(running)
+            busy_sessions.discard(done.session_id)
+            idle += 1
+        else:
+            job = next_job
+            if ranked:
+                created_at = EPOCH + timedelta(seconds=job.arrived_at)
+                rank_at = job_rank_at(
+                    created_at,
+                    DEFAULT_JOB_PRIORITIES[job.job_type],
+                    queued_per_session[job.session_id],
+                )
+                job.rank = (rank_at - EPOCH).total_seconds()
+            else:
+                job.rank = job.arrived_at
+            queued.append(job)
+            queued_per_session[job.session_id] += 1
+            next_job = next(pending, None)
+
+        while idle and queued:
+            claimable = [job for job in queued if job.session_id not in busy_sessions]
+            if not claimable:
+                break
+            job = min(claimable, key=lambda item: (item.rank, item.arrived_at))
+            queued.remove(job)
+            queued_per_session[job.session_id] -= 1
+            busy_sessions.add(job.session_id)
+            job.started_at = now
+            idle -= 1
+            sequence += 1
+            heapq.heappush(running, (now + job.service_seconds, sequence, job))
+
+    return jobs
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(name: str, jobs: list[Job]) -> None:
+    groups: defaultdict[str, list[float]] = defaultdict(list)
+    for job in jobs:
+        wait = job.started_at - job.arrived_at
+        groups[job.job_type.value].append(wait)
+        groups["chatty session" if job.session_id == "chatty" else "other sessions"].append(wait)
+
+    print(f"\n{name}")
+    print(f"{'group':<26}{'jobs':>6}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for group, waits in groups.items():
+        print(
+            f"{group:<26}{len(waits):>6}{statistics.fmean(waits):>9.1f}"
+            f"{percentile(waits, 0.5):>9.1f}{percentile(waits, 0.9):>9.1f}"
+            f"{percentile(waits, 0.99):>9.1f}{max(waits):>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=3600, help="seconds of arrivals")
+    parser.add_argument(
+        "--chatty-rate", type=float, default=0.2, help="comment jobs per second, one session"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    workload = build_workload(args, random.Random(args.seed))
+    print(f"{len(workload)} jobs, {args.workers} workers, waits in seconds")
+    report("FIFO (created_at)", simulate(workload, args.workers, ranked=False))
+    report("Ranked (priority, aging, fairness)", simulate(workload, args.workers, ranked=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from fastapi import Depends
 from app.core.config import get_settings
 from app.db.mongo_client import AsyncDB, get_test_db
 from app.repositories.airport import AirportRepository
+from app.repositories.flight import FlightRepository
 from app.repositories.todo import TodoRepository
 from app.schemas.v1.airport import Airport, AirportCreate
 from app.schemas.v1.todo import Todo, TodoCreate, TodoUpdate
@@ -141,6 +142,22 @@ async def airport_service_real(airport_repository_real: Annotated[AirportReposit
     return AirportService(repo=airport_repository_real)
 
 
+# Flight integration test fixtures (real database)
+@pytest_asyncio.fixture
+async def flight_test_db() -> AsyncGenerator[AsyncDB]:
+    """Real database connection for flight integration tests."""
+    db = get_test_db()
+    collection = db[settings.flights_collection_name]
+    await collection.delete_many({})
+    yield db
+    await collection.delete_many({})
+
+
+@pytest_asyncio.fixture
+async def flight_repository_real(flight_test_db: Annotated[AsyncDB, Depends(get_test_db)]):
+    return FlightRepository(db=flight_test_db)
+
+
 @pytest.fixture
 def sample_airport_creates() -> list[AirportCreate]:
     return [
@@ -0,0 +1,279 @@
+import asyncio
+from collections.abc import Callable
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+import app.integrations.aerodatabox_client as aerodatabox_module
+from app.integrations.aerodatabox_client import (
+    AeroDataBoxBudgetExhausted,
+    AeroDataBoxClient,
+    AeroDataBoxError,
+)
+from app.integrations.resilience import CircuitBreaker, CircuitState, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def make_client(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(aerodatabox_module.settings, "aerodatabox_api_key", "test-key")
+
+    def factory(handler: Callable[[httpx.Request], httpx.Response]) -> AeroDataBoxClient:
+        client = AeroDataBoxClient()
+        client._client = httpx.AsyncClient(
+            base_url="https://aerodatabox.test", transport=httpx.MockTransport(handler)
+        )
+        return client
+
+    return factory
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep():
+    with patch.object(aerodatabox_module.asyncio, "sleep", new_callable=AsyncMock) as sleep:
+        yield sleep
+
+
+class TestAeroDataBoxRetries:
+    @pytest.mark.asyncio
+    async def test_retries_5xx_then_succeeds(self, make_client, no_backoff_sleep):
+        statuses = iter([503, 502, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = next(statuses)
+            return httpx.Response(status, json=[{"number": "KL123"}] if status == 200 else {})
+
+        client = make_client(handler)
+        flights = await client.get_flights_by_number("KL123", "2026-06-25", "2026-06-26")
+
+        assert [f.data["number"] for f in flights] == ["KL123"]
+        assert no_backoff_sleep.await_count == 2
+        metrics = client.metrics()
+        assert metrics.requests_total == 3
+        assert metrics.retries_total == 2
+        assert metrics.circuit_state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_attempt_budget_is_charged_for_every_retry(self, make_client):
+        statuses = iter([503, 503, 200])
+        charged = 0
+
+        async def attempt_budget() -> bool:
+            nonlocal charged
+            charged += 1
+            return charged <= 2
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(statuses), json={})
+
+        client = make_client(handler)
+        with pytest.raises(AeroDataBoxBudgetExhausted):
+            await client.get_flights_by_number(
+                "KL123", "2026-06-25", "2026-06-26", attempt_budget=attempt_budget
+            )
+
+        # Two requests went out; the third attempt was refused before it was sent.
+        assert charged == 3
+        assert client.metrics().requests_total == 2
+
+    @pytest.mark.asyncio
+    async def test_auth_errors_are_not_retried(self, make_client):
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(401)
+
+        client = make_client(handler)
+        with pytest.raises(AeroDataBoxError) as exc_info:
+            await client.get_flights_by_number("KL123", "2026-06-25", "2026-06-26")
+
+        assert exc_info.value.status_code == 401
+        assert calls == 1
+        assert client.metrics().circuit_consecutive_failures == 0
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_and_fails_fast(self, make_client, monkeypatch):
+        monkeypatch.setattr(aerodatabox_module.settings, "aerodatabox_max_retries", 0)
+        monkeypatch.setattr(aerodatabox_module.settings, "aerodatabox_circuit_failure_threshold", 2)
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(500)
+
+        client = make_client(handler)
+        for _ in range(2):
+            with pytest.raises(AeroDataBoxError):
+                await client.get_flights_by_number("KL123", "2026-06-25", "2026-06-26")
+        with pytest.raises(AeroDataBoxError):
+            await client.get_flights_by_number("KL123", "2026-06-25", "2026-06-26")
+
+        assert calls == 2
+        metrics = client.metrics()
+        assert metrics.circuit_state == CircuitState.OPEN
+        assert metrics.short_circuited_total == 1
+        assert metrics.failures_total == 2
+
+    @pytest.mark.asyncio
+    async def test_half_open_circuit_keeps_a_single_probe_in_flight(self, make_client, monkeypatch):
+        monkeypatch.setattr(aerodatabox_module.settings, "aerodatabox_max_retries", 0)
+        clock = FakeClock()
+        budget_checked, end_early = asyncio.Event(), asyncio.Event()
+        probe_sent, answer_probe = asyncio.Event(), asyncio.Event()
+        requests = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal requests
+            requests += 1
+            if requests == 1:
+                return httpx.Response(500)
+            probe_sent.set()
+            await answer_probe.wait()
+            return httpx.Response(200, json=[])
+
+        async def budget_ending_without_a_request() -> bool:
+            budget_checked.set()
+            await end_early.wait()
+            return False
+
+        client = make_client(handler)
+        client._breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        lookup = ("KL123", "2026-06-25", "2026-06-26")
+
+        # Admitted while closed; ends without an outcome once the circuit is half-open.
+        early = asyncio.create_task(
+            client.get_flights_by_number(*lookup, attempt_budget=budget_ending_without_a_request)
+        )
+        await budget_checked.wait()
+        with pytest.raises(AeroDataBoxError):
+            await client.get_flights_by_number(*lookup)
+        clock.now += 10
+        probe = asyncio.create_task(client.get_flights_by_number(*lookup))
+        await probe_sent.wait()
+        end_early.set()
+        with pytest.raises(AeroDataBoxBudgetExhausted):
+            await early
+
+        with pytest.raises(AeroDataBoxError, match="temporarily unavailable"):
+            await asyncio.wait_for(client.get_flights_by_number(*lookup), timeout=1)
+        answer_probe.set()
+
+        assert await probe == []
+        assert requests == 2
+        assert client.metrics().circuit_state == CircuitState.CLOSED
+
+
+class TestAeroDataBoxLifecycle:
+    @pytest.mark.asyncio
+    async def test_start_builds_pooled_http2_client_and_aclose_releases_it(self, monkeypatch):
+        monkeypatch.setattr(aerodatabox_module.settings, "aerodatabox_api_key", "test-key")
+        client = AeroDataBoxClient()
+
+        with patch.object(
+            aerodatabox_module.httpx, "AsyncClient", wraps=httpx.AsyncClient
+        ) as client_factory:
+            await client.start()
+        pooled = client._client
+        assert pooled is not None
+        kwargs = client_factory.call_args.kwargs
+        assert kwargs["http2"] is True
+        assert kwargs["limits"].keepalive_expiry == (
+            aerodatabox_module.settings.aerodatabox_keepalive_expiry_seconds
+        )
+
+        await client.aclose()
+        assert client._client is None
+        assert pooled.is_closed
+
+    @pytest.mark.asyncio
+    async def test_start_without_api_key_is_a_no_op(self, monkeypatch):
+        monkeypatch.setattr(aerodatabox_module.settings, "aerodatabox_api_key", None)
+        client = AeroDataBoxClient()
+
+        await client.start()
+
+        assert client._client is None
+
+    @pytest.mark.asyncio
+    async def test_warm_up_failure_does_not_block_startup(self, make_client, monkeypatch):
+        monkeypatch.setattr(aerodatabox_module.settings, "aerodatabox_warmup_enabled", True)
+        methods: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            methods.append(request.method)
+            raise httpx.ConnectError("unreachable")
+
+        client = make_client(handler)
+        await client.start()
+
+        assert methods == ["HEAD"]
+        assert client.metrics().requests_total == 0
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_rejects_when_wait_exceeds_budget(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=clock)
+
+        assert await bucket.acquire(max_wait=0)
+        assert await bucket.acquire(max_wait=0)
+        assert not await bucket.acquire(max_wait=0.5)
+
+        clock.now += 1.0
+        assert await bucket.acquire(max_wait=0)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill(self, no_backoff_sleep):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=1, clock=clock)
+
+        async def advance(seconds: float) -> None:
+            clock.now += seconds
+
+        assert await bucket.acquire(max_wait=0)
+        with patch("app.integrations.resilience.asyncio.sleep", side_effect=advance) as sleep:
+            assert await bucket.acquire(max_wait=1.0)
+
+        sleep.assert_awaited_once_with(0.5)
+
+
+class TestCircuitBreaker:
+    def test_half_open_admits_a_single_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+
+        breaker.record_failure()
+        assert not breaker.allow_request()
+        assert breaker.retry_after == 10
+
+        clock.now += 10
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is None
+
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=5, clock=clock)
+        for _ in range(3):
+            breaker.record_failure()
+
+        clock.now += 5
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.OPEN
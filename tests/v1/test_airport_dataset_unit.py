@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.schemas.v1.airport import AirportCreate
+from app.util.airport_dataset import (
+    AirportDataset,
+    encode_airport_dataset,
+    load_airport_rows,
+    write_airport_dataset,
+)
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "app" / "data"
+
+
+def test_round_trip_preserves_fields(
+    tmp_path: Path, sample_airport_creates: list[AirportCreate]
+) -> None:
+    path = tmp_path / "airports.bin"
+    write_airport_dataset(sample_airport_creates, path)
+
+    with AirportDataset.open(path) as dataset:
+        assert len(dataset) == len(sample_airport_creates)
+        # Records are stored sorted by ICAO.
+        assert [record.icao for record in dataset] == ["EGLL", "EHAM", "KJFK"]
+        restored = {record.icao: record.to_airport_create() for record in dataset}
+
+    for airport in sample_airport_creates:
+        assert restored[airport.icao] == airport
+
+
+def test_find_by_icao_and_iata(sample_airport_creates: list[AirportCreate]) -> None:
+    dataset = AirportDataset(encode_airport_dataset(sample_airport_creates))
+
+    record = dataset.find_by_icao("eham")
+    assert record is not None
+    assert record.name == "Amsterdam Airport Schiphol"
+    assert record.latitude == pytest.approx(52.3086)
+
+    iata_record = dataset.find_by_iata("JFK")
+    assert iata_record is not None
+    assert iata_record.icao == "KJFK"
+
+    assert dataset.find_by_icao("ZZZZ") is None
+    assert dataset.find_by_icao("AAAA") is None
+
+
+def test_shared_strings_are_stored_once() -> None:
+    base = {"name": "X", "city": "Same City", "country": "Same Country"}
+    rows = [
+        AirportCreate(icao=icao, iata=icao[:3], longitude=0.0, latitude=0.0, **base)
+        for icao in ("AAAA", "BBBB", "CCCC")
+    ]
+    data = encode_airport_dataset(rows)
+
+    assert data.count(b"Same Country") == 1
+
+
+def test_rejects_foreign_files() -> None:
+    with pytest.raises(ValueError):
+        AirportDataset(b"not an airport dataset")
+
+
+def test_committed_binary_matches_json_source() -> None:
+    source = json.loads((DATA_DIR / "airports.json").read_text(encoding="utf-8"))
+    rows = load_airport_rows(DATA_DIR / "airports.bin")
+
+    assert rows == sorted(source, key=lambda row: row["icao"])
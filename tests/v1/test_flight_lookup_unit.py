@@ -1,16 +1,25 @@
 """Unit tests for flight lookup service and route."""
 
-import math
+import asyncio
+from datetime import UTC, date, datetime, timedelta
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 import app.services.flight_lookup as flight_lookup_module
 from app.api.v1.flight_lookup import lookup_flight_route
+from app.core.config import get_settings
 from app.integrations.aerodatabox_client import AeroDataBoxError, RawFlightData
 from app.schemas.v1.exceptions import BadRequestException, ServiceUnavailableException
-from app.schemas.v1.flight_lookup import FlightLookupResponse
+from app.schemas.v1.flight_lookup import FlightLookupCacheEntry, FlightLookupResponse
 from app.services.flight_lookup import lookup_flight, normalize_flight_number
+from app.services.flight_lookup_cache import (
+    MemoryFlightLookupCache,
+    MongoFlightLookupCache,
+    TieredFlightLookupCache,
+)
+
+settings = get_settings()
 
 # ---------------------------------------------------------------------------
 # Sample data
@@ -50,11 +59,53 @@ SAMPLE_RAW_FLIGHT: dict = {
 
 
 @pytest.fixture(autouse=True)
-def clear_cache():
-    """Clear the in-memory cache before each test."""
-    flight_lookup_module._cache.clear()
-    yield
-    flight_lookup_module._cache.clear()
+def lookup_cache(monkeypatch: pytest.MonkeyPatch) -> MemoryFlightLookupCache:
+    """Give each test a fresh in-process cache so no test reaches the shared Mongo tier.
+
+    The default window is narrowed to one day so each lookup is a single upstream call;
+    window fan-out is covered by TestLookupWindowSplitting.
+    """
+    cache = MemoryFlightLookupCache(max_entries=16)
+    monkeypatch.setattr(flight_lookup_module, "_cache", cache)
+    monkeypatch.setattr(flight_lookup_module.settings, "aerodatabox_lookup_window_days", 1)
+    return cache
+
+
+def age_entry(entry: FlightLookupCacheEntry, seconds: float) -> FlightLookupCacheEntry:
+    """Shift an entry's timestamps `seconds` into the past."""
+    delta = timedelta(seconds=seconds)
+    return entry.model_copy(
+        update={
+            "stored_at": entry.stored_at - delta,
+            "expires_at": entry.expires_at - delta,
+            "stale_until": entry.stale_until - delta,
+        }
+    )
+
+
+async def age_all(cache: MemoryFlightLookupCache, seconds: float) -> None:
+    for key, entry in list(cache._entries.items()):
+        await cache.set(key, age_entry(entry, seconds))
+
+
+async def expire_all(cache: MemoryFlightLookupCache) -> None:
+    """Age every entry past all of its stale windows."""
+    for key, entry in list(cache._entries.items()):
+        await cache.set(
+            key, age_entry(entry, (entry.stale_until - entry.stored_at).total_seconds())
+        )
+
+
+def make_entry(ttl_seconds: int = 60) -> FlightLookupCacheEntry:
+    stored_at = datetime.now(UTC)
+    return FlightLookupCacheEntry(
+        response=FlightLookupResponse(
+            query="KL123", normalized_flight_number="KL123", cached=False, candidates=[]
+        ),
+        stored_at=stored_at,
+        expires_at=stored_at + timedelta(seconds=ttl_seconds),
+        stale_until=stored_at + timedelta(seconds=ttl_seconds),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -200,7 +251,7 @@ class TestLookupFlightService:
         assert "rapidapi" not in dumped.lower()
 
     @pytest.mark.asyncio
-    async def test_success_ttl_expiry_recalls_client(self):
+    async def test_success_ttl_expiry_recalls_client(self, lookup_cache):
         with patch.object(
             flight_lookup_module.aerodatabox_client,
             "get_flights_by_number",
@@ -208,17 +259,17 @@ class TestLookupFlightService:
             return_value=[RawFlightData(data=SAMPLE_RAW_FLIGHT)],
         ) as mock_client:
             await lookup_flight("KL123")
-            # Manually expire the cache entry
-            key = list(flight_lookup_module._cache.keys())[0]
-            # Use -inf so the cache entry is guaranteed older than any TTL,
-            # regardless of how long time.monotonic() has been running.
-            flight_lookup_module._cache[key] = (-math.inf, flight_lookup_module._cache[key][1])
+            entry = next(iter(lookup_cache._entries.values()))
+            assert entry.expires_at - entry.stored_at == timedelta(
+                seconds=settings.aerodatabox_cache_ttl_success_seconds
+            )
+            await expire_all(lookup_cache)
             await lookup_flight("KL123")
 
         assert mock_client.call_count == 2
 
     @pytest.mark.asyncio
-    async def test_no_results_ttl_expiry_recalls_client(self):
+    async def test_no_results_ttl_expiry_recalls_client(self, lookup_cache):
         with patch.object(
             flight_lookup_module.aerodatabox_client,
             "get_flights_by_number",
@@ -226,10 +277,11 @@ class TestLookupFlightService:
             return_value=[],
         ) as mock_client:
             await lookup_flight("KL999")
-            key = list(flight_lookup_module._cache.keys())[0]
-            # Use -inf so the cache entry is guaranteed older than any TTL,
-            # regardless of how long time.monotonic() has been running.
-            flight_lookup_module._cache[key] = (-math.inf, flight_lookup_module._cache[key][1])
+            entry = next(iter(lookup_cache._entries.values()))
+            assert entry.expires_at - entry.stored_at == timedelta(
+                seconds=settings.aerodatabox_cache_ttl_no_results_seconds
+            )
+            await expire_all(lookup_cache)
             await lookup_flight("KL999")
 
         assert mock_client.call_count == 2
@@ -269,6 +321,348 @@ class TestLookupFlightService:
         assert c.source == "AeroDataBox"
 
 
+# ---------------------------------------------------------------------------
+# Stale serving
+# ---------------------------------------------------------------------------
+
+
+def success_ttl() -> int:
+    return settings.aerodatabox_cache_ttl_success_seconds
+
+
+class TestLookupStaleServing:
+    @pytest.mark.asyncio
+    async def test_fresh_hit_reports_age(self, lookup_cache):
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            return_value=[RawFlightData(data=SAMPLE_RAW_FLIGHT)],
+        ):
+            await lookup_flight("KL123")
+            await age_all(lookup_cache, 120)
+            result = await lookup_flight("KL123")
+
+        assert result.cached is True
+        assert result.stale is False
+        assert result.age_seconds is not None and result.age_seconds >= 120
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_refreshed_in_background(self, lookup_cache):
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            return_value=[RawFlightData(data=SAMPLE_RAW_FLIGHT)],
+        ) as mock_client:
+            await lookup_flight("KL123")
+            await age_all(lookup_cache, success_ttl() + 1)
+
+            result = await lookup_flight("KL123")
+            assert result.cached is True
+            assert result.stale is True
+
+            await asyncio.gather(*flight_lookup_module._background_tasks)
+            refreshed = await lookup_flight("KL123")
+
+        assert mock_client.call_count == 2
+        assert refreshed.stale is False
+        assert refreshed.age_seconds is not None and refreshed.age_seconds < 60
+
+    @pytest.mark.asyncio
+    async def test_stale_if_error_serves_old_data(self, lookup_cache):
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            return_value=[RawFlightData(data=SAMPLE_RAW_FLIGHT)],
+        ) as mock_client:
+            await lookup_flight("KL123")
+            # Past the revalidate window but still inside the stale-if-error window.
+            await age_all(
+                lookup_cache,
+                success_ttl() + settings.aerodatabox_cache_stale_while_revalidate_seconds + 1,
+            )
+            mock_client.side_effect = AeroDataBoxError("upstream down", 503)
+
+            result = await lookup_flight("KL123")
+
+        assert result.stale is True
+        assert len(result.candidates) == 1
+
+    @pytest.mark.asyncio
+    async def test_error_past_stale_windows_raises_503(self, lookup_cache):
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            return_value=[RawFlightData(data=SAMPLE_RAW_FLIGHT)],
+        ) as mock_client:
+            await lookup_flight("KL123")
+            await expire_all(lookup_cache)
+            mock_client.side_effect = AeroDataBoxError("upstream down", 503)
+
+            with pytest.raises(ServiceUnavailableException):
+                await lookup_flight("KL123")
+
+
+# ---------------------------------------------------------------------------
+# Window splitting
+# ---------------------------------------------------------------------------
+
+
+def raw_flight_on(day: date) -> RawFlightData:
+    data = {
+        **SAMPLE_RAW_FLIGHT,
+        "departure": {
+            **SAMPLE_RAW_FLIGHT["departure"],
+            "scheduledTime": {"utc": f"{day.isoformat()} 10:30Z"},
+        },
+    }
+    return RawFlightData(data=data)
+
+
+async def flights_for_window(
+    _flight_number: str, date_from: str, _date_to: str
+) -> list[RawFlightData]:
+    # Each day returns its own flight plus the previous day's, which overlaps.
+    day = date.fromisoformat(date_from)
+    return [raw_flight_on(day - timedelta(days=1)), raw_flight_on(day)]
+
+
+class TestLookupWindowSplitting:
+    @pytest.mark.asyncio
+    async def test_window_fans_out_per_day_and_deduplicates(self, monkeypatch):
+        monkeypatch.setattr(flight_lookup_module.settings, "aerodatabox_lookup_window_days", 3)
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            side_effect=flights_for_window,
+        ) as mock_client:
+            result = await lookup_flight("KL123")
+
+        today = date.today()
+        requested = sorted(call.args[1:] for call in mock_client.call_args_list)
+        assert requested == [
+            ((today + timedelta(days=i)).isoformat(), (today + timedelta(days=i + 1)).isoformat())
+            for i in range(3)
+        ]
+        # Days -1..2 are each returned, the overlaps only once.
+        assert len(result.candidates) == 4
+        assert len({c.id for c in result.candidates}) == 4
+        departures = [c.scheduled_departure_time_utc for c in result.candidates]
+        assert departures == sorted(departures)
+
+    @pytest.mark.asyncio
+    async def test_single_day_query_reuses_window_cache(self, monkeypatch):
+        monkeypatch.setattr(flight_lookup_module.settings, "aerodatabox_lookup_window_days", 3)
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            side_effect=flights_for_window,
+        ) as mock_client:
+            await lookup_flight("KL123")
+            result = await lookup_flight("KL123", on_date=date.today() + timedelta(days=1))
+
+        assert mock_client.call_count == 3
+        assert result.cached is True
+        assert len(result.candidates) == 2
+
+    @pytest.mark.asyncio
+    async def test_partially_cached_window_only_fetches_missing_days(self, monkeypatch):
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            side_effect=flights_for_window,
+        ) as mock_client:
+            await lookup_flight("KL123", on_date=date.today())
+            monkeypatch.setattr(flight_lookup_module.settings, "aerodatabox_lookup_window_days", 2)
+            result = await lookup_flight("KL123")
+
+        assert mock_client.call_count == 2
+        assert result.cached is False
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(flight_lookup_module.settings, "aerodatabox_lookup_window_days", 6)
+        monkeypatch.setattr(flight_lookup_module.settings, "aerodatabox_lookup_concurrency", 2)
+        running = 0
+        peak = 0
+
+        async def tracked(*args: str) -> list[RawFlightData]:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            return []
+
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            side_effect=tracked,
+        ) as mock_client:
+            await lookup_flight("KL123")
+
+        assert mock_client.call_count == 6
+        assert peak == 2
+
+
+# ---------------------------------------------------------------------------
+# Request coalescing
+# ---------------------------------------------------------------------------
+
+
+class TestLookupCoalescing:
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_upstream_call(self):
+        release = asyncio.Event()
+
+        async def slow_fetch(*_args: object) -> list[RawFlightData]:
+            await release.wait()
+            return [RawFlightData(data=SAMPLE_RAW_FLIGHT)]
+
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            side_effect=slow_fetch,
+        ) as mock_client:
+            lookups = [asyncio.create_task(lookup_flight(q)) for q in ("KL123", "kl 123", "KL-123")]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*lookups)
+
+        assert mock_client.call_count == 1
+        assert all(len(r.candidates) == 1 for r in results)
+        assert flight_lookup_module._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter_and_are_not_cached(self, lookup_cache):
+        release = asyncio.Event()
+
+        async def failing_fetch(*_args: object) -> list[RawFlightData]:
+            await release.wait()
+            raise AeroDataBoxError("rate limit", 429)
+
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            side_effect=failing_fetch,
+        ) as mock_client:
+            lookups = [asyncio.create_task(lookup_flight("KL123")) for _ in range(3)]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*lookups, return_exceptions=True)
+
+            assert all(isinstance(r, ServiceUnavailableException) for r in results)
+            assert mock_client.call_count == 1
+            assert len(lookup_cache) == 0
+
+            mock_client.side_effect = None
+            mock_client.return_value = []
+            await lookup_flight("KL123")
+
+        assert mock_client.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        release = asyncio.Event()
+
+        async def slow_fetch(*_args: object) -> list[RawFlightData]:
+            await release.wait()
+            return [RawFlightData(data=SAMPLE_RAW_FLIGHT)]
+
+        with patch.object(
+            flight_lookup_module.aerodatabox_client,
+            "get_flights_by_number",
+            new_callable=AsyncMock,
+            side_effect=slow_fetch,
+        ) as mock_client:
+            first = asyncio.create_task(lookup_flight("KL123"))
+            second = asyncio.create_task(lookup_flight("KL123"))
+            await asyncio.sleep(0)
+            first.cancel()
+            release.set()
+            result = await second
+
+        assert mock_client.call_count == 1
+        assert len(result.candidates) == 1
+
+
+# ---------------------------------------------------------------------------
+# Cache tiers
+# ---------------------------------------------------------------------------
+
+
+class TestFlightLookupCache:
+    @pytest.mark.asyncio
+    async def test_memory_tier_evicts_least_recently_used(self):
+        cache = MemoryFlightLookupCache(max_entries=2)
+        await cache.set("a", make_entry())
+        await cache.set("b", make_entry())
+        await cache.get("a")
+        await cache.set("c", make_entry())
+
+        assert len(cache) == 2
+        assert await cache.get("b") is None
+        assert await cache.get("a") is not None
+
+    @pytest.mark.asyncio
+    async def test_memory_tier_drops_expired_entries(self):
+        cache = MemoryFlightLookupCache(max_entries=2)
+        await cache.set("a", make_entry(ttl_seconds=-1))
+
+        assert await cache.get("a") is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_tiered_cache_backfills_memory_from_shared_tier(self):
+        memory = MemoryFlightLookupCache(max_entries=2)
+        shared = AsyncMock()
+        shared.get.return_value = make_entry()
+        cache = TieredFlightLookupCache(memory, shared)
+
+        assert await cache.get("a") is not None
+        assert await cache.get("a") is not None
+
+        shared.get.assert_awaited_once_with("a")
+        assert len(memory) == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_tier_errors_are_misses(self):
+        collection = AsyncMock()
+        collection.find_one.side_effect = RuntimeError("mongo down")
+        collection.replace_one.side_effect = RuntimeError("mongo down")
+        cache = MongoFlightLookupCache(
+            db_factory=lambda: {settings.flight_lookup_cache_collection_name: collection}
+        )
+
+        assert await cache.get("a") is None
+        await cache.set("a", make_entry())
+
+    @pytest.mark.asyncio
+    async def test_shared_tier_round_trip(self):
+        collection = AsyncMock()
+        cache = MongoFlightLookupCache(
+            db_factory=lambda: {settings.flight_lookup_cache_collection_name: collection}
+        )
+        entry = make_entry()
+
+        await cache.set("KL123|2026-06-25:2026-06-26", entry)
+        _, document = collection.replace_one.await_args.args
+        collection.find_one.return_value = {"_id": "KL123|2026-06-25:2026-06-26", **document}
+
+        assert await cache.get("KL123|2026-06-25:2026-06-26") == entry
+        query = collection.find_one.await_args.args[0]
+        assert "$gt" in query["stale_until"]
+
+
 # ---------------------------------------------------------------------------
 # lookup_flight_route
 # ---------------------------------------------------------------------------
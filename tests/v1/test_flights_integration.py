@@ -0,0 +1,203 @@
+from datetime import timedelta
+from typing import Any
+
+import pytest
+
+from app.core.config import get_settings
+from app.models.flight import Flight, FlightStatus
+from app.repositories.flight import FlightRepository, ensure_flight_indexes
+from app.schemas.v1.airport import Airport
+from app.util.time import utc_now
+
+settings = get_settings()
+
+DEPARTURE_AIRPORT_ID = "64a7f0c2f1d2c4b5a6e7d901"
+ARRIVAL_AIRPORT_ID = "64a7f0c2f1d2c4b5a6e7d902"
+OTHER_AIRPORT_ID = "64a7f0c2f1d2c4b5a6e7d903"
+
+
+def _index_names(plan: Any) -> set[str]:
+    """Collect every index used anywhere in an explain() winning plan."""
+    names: set[str] = set()
+    if isinstance(plan, dict):
+        if "indexName" in plan:
+            names.add(plan["indexName"])
+        for value in plan.values():
+            names |= _index_names(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            names |= _index_names(item)
+    return names
+
+
+def _stages(plan: Any) -> set[str]:
+    stages: set[str] = set()
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.add(plan["stage"])
+        for value in plan.values():
+            stages |= _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            stages |= _stages(item)
+    return stages
+
+
+def _assert_index_backed(plan: Any) -> None:
+    stages = _stages(plan)
+    assert "IXSCAN" in stages
+    assert "COLLSCAN" not in stages
+    # No blocking in-memory sort: the index order is the requested order.
+    assert "SORT" not in stages
+
+
+async def _seed(repo: FlightRepository, count: int = 20) -> None:
+    now = utc_now()
+    for i in range(count):
+        await repo.create_flight(
+            Flight(
+                flight_number=f"KL{i}",
+                departure_airport_id=DEPARTURE_AIRPORT_ID,
+                arrival_airport_id=ARRIVAL_AIRPORT_ID,
+                departure_at=now + timedelta(days=i),
+                arrival_at=now + timedelta(days=i, hours=2),
+                status=FlightStatus.ACTIVE,
+                created_at=now,
+            )
+        )
+
+
+class _RecordingCollection:
+    """Pass-through to the real collection that keeps every query the repository sends,
+    so explain() runs on exactly the filter and sort the repository built."""
+
+    def __init__(self, collection: Any) -> None:
+        self._collection = collection
+        self.cursors: list[Any] = []
+        self.find_one_calls: list[tuple[dict[str, Any], Any]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._collection, name)
+
+    def find(self, *args: Any, **kwargs: Any) -> Any:
+        cursor = self._collection.find(*args, **kwargs)
+        self.cursors.append(cursor)
+        return cursor
+
+    async def find_one(self, query: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        self.find_one_calls.append((query, kwargs.get("sort")))
+        return await self._collection.find_one(query, *args, **kwargs)
+
+    async def explain_last_find(self) -> Any:
+        # Cursor.explain() runs on a clone, so a cursor that was already read still works.
+        explain = await self.cursors[-1].explain()
+        return explain["queryPlanner"]["winningPlan"]
+
+    async def explain_last_find_one(self) -> Any:
+        query, sort = self.find_one_calls[-1]
+        find = self._collection.find(query)
+        if sort:
+            find = find.sort(sort)
+        explain = await find.limit(1).explain()
+        return explain["queryPlanner"]["winningPlan"]
+
+
+async def _recording_repository(db: Any) -> FlightRepository:
+    await ensure_flight_indexes(db)
+    repo = FlightRepository(db)
+    await _seed(repo)
+    # Active flights elsewhere and expired ones, so the most selective index wins clearly.
+    now = utc_now()
+    for i in range(40):
+        active = i % 2 == 0
+        departure_at = now + timedelta(days=i + 1) if active else now - timedelta(days=i + 1)
+        await repo.create_flight(
+            Flight(
+                flight_number=f"BA{i}",
+                departure_airport_id=OTHER_AIRPORT_ID,
+                arrival_airport_id=OTHER_AIRPORT_ID,
+                departure_at=departure_at,
+                arrival_at=departure_at + timedelta(hours=2),
+                status=FlightStatus.ACTIVE if active else FlightStatus.EXPIRED,
+                created_at=now,
+            )
+        )
+    repo._flights = _RecordingCollection(repo._flights)
+    return repo
+
+
+class TestFlightIndexes_Integration:
+    @pytest.mark.asyncio
+    async def test_flight_number_lookup(self, flight_repository_real: FlightRepository):
+        await _seed(flight_repository_real)
+
+        flight = await flight_repository_real.get_flight_by_flight_number("KL3")
+
+        assert flight is not None
+        assert flight.flight_number == "KL3"
+        assert await flight_repository_real.get_flight_by_flight_number("XX1") is None
+
+    @pytest.mark.asyncio
+    async def test_delete_by_code_uses_flight_number(
+        self, flight_repository_real: FlightRepository
+    ):
+        await _seed(flight_repository_real, count=2)
+
+        assert await flight_repository_real.delete_flight_by_code("KL1") is True
+        assert await flight_repository_real.get_flight_by_flight_number("KL1") is None
+
+    @pytest.mark.asyncio
+    async def test_flight_number_query_uses_index(self, flight_test_db):
+        repo = await _recording_repository(flight_test_db)
+
+        await repo.get_flight_by_flight_number("KL3")
+
+        plan = await repo._flights.explain_last_find_one()
+        assert "flight_number_1_departure_at_-1" in _index_names(plan)
+        _assert_index_backed(plan)
+
+    @pytest.mark.asyncio
+    async def test_next_active_flight_uses_status_index(self, flight_test_db):
+        repo = await _recording_repository(flight_test_db)
+
+        await repo.get_most_recent_active_flight()
+
+        query, _ = repo._flights.find_one_calls[-1]
+        assert "arrival_at" in query
+        plan = await repo._flights.explain_last_find_one()
+        assert "status_1_departure_at_1__id_1" in _index_names(plan)
+        _assert_index_backed(plan)
+
+    @pytest.mark.asyncio
+    async def test_active_listing_uses_status_index(self, flight_test_db):
+        repo = await _recording_repository(flight_test_db)
+
+        await repo.list_active_flights(limit=5)
+
+        plan = await repo._flights.explain_last_find()
+        assert "status_1_departure_at_1__id_1" in _index_names(plan)
+        _assert_index_backed(plan)
+
+    @pytest.mark.asyncio
+    async def test_airport_departures_use_compound_index(
+        self, flight_test_db, sample_airports: list[Airport]
+    ):
+        repo = await _recording_repository(flight_test_db)
+
+        await repo.get_flights_by_departure_airport(sample_airports[0], FlightStatus.ACTIVE)
+
+        plan = await repo._flights.explain_last_find()
+        assert "departure_airport_id_1_status_1_departure_at_1__id_1" in _index_names(plan)
+        _assert_index_backed(plan)
+
+    @pytest.mark.asyncio
+    async def test_airport_arrivals_use_compound_index(
+        self, flight_test_db, sample_airports: list[Airport]
+    ):
+        repo = await _recording_repository(flight_test_db)
+
+        await repo.get_flights_by_arrival_airport(sample_airports[1], FlightStatus.ACTIVE)
+
+        plan = await repo._flights.explain_last_find()
+        assert "arrival_airport_id_1_status_1_arrival_at_1__id_1" in _index_names(plan)
+        _assert_index_backed(plan)
@@ -0,0 +1,587 @@
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.api.v1.flight import next_flight_events
+from app.core.config import get_settings
+from app.integrations.aerodatabox_client import (
+    AeroDataBoxBudgetExhausted,
+    AeroDataBoxClient,
+    AeroDataBoxError,
+    RawFlightData,
+)
+from app.models.flight import Flight as FlightModel
+from app.models.flight import FlightLiveUpdate, FlightStatus
+from app.repositories.airport import AirportRepository
+from app.repositories.call_budget import CallBudgetRepository
+from app.repositories.flight import FlightRepository
+from app.schemas.v1.airport import Airport
+from app.schemas.v1.exceptions import BadRequestException
+from app.schemas.v1.flight import FlightChangeEvent, FlightChangeOperation
+from app.services.flight import FlightService
+from app.services.flight_events import FLIGHTS_TOPIC, flight_broker, set_change_stream_active
+from app.services.flight_tracker import FlightTracker, match_flight, poll_interval
+from app.util.flight import decode_flight_cursor, encode_flight_cursor
+from app.util.pubsub import Broker
+from app.util.sse import SSE_HEARTBEAT
+from app.workers.flight_expiration_worker import run_flight_expiration_worker
+
+settings = get_settings()
+
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def make_flight(index: int, departure: Airport, arrival: Airport) -> FlightModel:
+    return FlightModel(
+        id=f"64a7f0c2f1d2c4b5a6e7e{index:03d}",
+        flight_number=f"KL{index}",
+        departure_airport_id=str(departure.id),
+        arrival_airport_id=str(arrival.id),
+        departure_at=NOW + timedelta(days=index),
+        arrival_at=NOW + timedelta(days=index, hours=2),
+        status=FlightStatus.ACTIVE,
+        created_at=NOW,
+    )
+
+
+@pytest.fixture
+def flight_repository_mock():
+    return AsyncMock(spec=FlightRepository)
+
+
+@pytest.fixture
+def flight_service_mock(flight_repository_mock, airport_repository_mock):
+    return FlightService(flights=flight_repository_mock, airports=airport_repository_mock)
+
+
+class TestFlightAirportResolution:
+    @pytest.mark.asyncio
+    async def test_list_resolves_airports_in_one_query(
+        self,
+        flight_service_mock: FlightService,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        flights = [make_flight(i, ams, jfk) for i in range(50)]
+        flight_repository_mock.list_flights.return_value = flights
+        airport_repository_mock.get_airports_by_ids.return_value = {
+            str(ams.id): ams,
+            str(jfk.id): jfk,
+        }
+
+        result, _ = await flight_service_mock.get_all_flights(limit=50)
+
+        assert len(result) == 50
+        assert result[0].departure_airport == ams
+        assert result[0].arrival_airport == jfk
+        airport_repository_mock.get_airports_by_ids.assert_awaited_once()
+        airport_repository_mock.get_airport_by_id.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_airport_raises(
+        self,
+        flight_service_mock: FlightService,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        flight_repository_mock.get_flight.return_value = make_flight(1, ams, jfk)
+        airport_repository_mock.get_airports_by_ids.return_value = {str(ams.id): ams}
+
+        with pytest.raises(ValueError, match="Airport not found"):
+            await flight_service_mock.get_flight_by_id(str(make_flight(1, ams, jfk).id))
+
+    @pytest.mark.asyncio
+    async def test_repository_deduplicates_ids(self):
+        cursor = AsyncMock()
+        cursor.to_list.return_value = []
+        collection = Mock()
+        collection.find.return_value = cursor
+        repo = AirportRepository(db={settings.airports_collection_name: collection})
+
+        ids = ["64a7f0c2f1d2c4b5a6e7d901", "64a7f0c2f1d2c4b5a6e7d901"]
+        assert await repo.get_airports_by_ids(ids) == {}
+        cursor.to_list.assert_awaited_once_with(length=1)
+
+        assert await repo.get_airports_by_ids([]) == {}
+        collection.find.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_flight_number_lookup_is_a_single_query(
+        self,
+        flight_service_mock: FlightService,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        flight_repository_mock.get_flight_by_flight_number.return_value = make_flight(7, ams, jfk)
+        airport_repository_mock.get_airports_by_ids.return_value = {
+            str(ams.id): ams,
+            str(jfk.id): jfk,
+        }
+
+        result = await flight_service_mock.get_flight_by_flight_number("KL7")
+
+        assert result is not None and result.flight_number == "KL7"
+        flight_repository_mock.get_flight_by_flight_number.assert_awaited_once_with("KL7")
+        flight_repository_mock.list_flights.assert_not_called()
+
+
+def make_budget(tokens: int = 100) -> AsyncMock:
+    budget = AsyncMock(spec=CallBudgetRepository)
+    remaining = tokens
+
+    async def acquire(key: str, *, rate: float, capacity: int) -> bool:
+        nonlocal remaining
+        remaining -= 1
+        return remaining >= 0
+
+    budget.acquire.side_effect = acquire
+    return budget
+
+
+def make_repository_with_find() -> tuple[FlightRepository, Mock]:
+    cursor = Mock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=[])
+    collection = Mock()
+    collection.find.return_value = cursor
+    return FlightRepository(db={settings.flights_collection_name: collection}), collection
+
+
+class TestFlightPagination:
+    def test_cursor_round_trip(self):
+        flight_id = "64a7f0c2f1d2c4b5a6e7e001"
+        payload = decode_flight_cursor(encode_flight_cursor(NOW, flight_id))
+
+        assert payload.sort_at == NOW
+        assert payload.id == flight_id
+
+    def test_invalid_cursor_is_rejected(self):
+        with pytest.raises(BadRequestException):
+            decode_flight_cursor("not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_points_at_last_item(
+        self,
+        flight_service_mock: FlightService,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        flights = [make_flight(i, ams, jfk) for i in range(3, 0, -1)]
+        flight_repository_mock.list_flights.return_value = flights
+        airport_repository_mock.get_airports_by_ids.return_value = {
+            str(ams.id): ams,
+            str(jfk.id): jfk,
+        }
+
+        items, next_cursor = await flight_service_mock.get_all_flights(limit=2)
+
+        assert [item.flight_number for item in items] == ["KL3", "KL2"]
+        assert next_cursor is not None
+        payload = decode_flight_cursor(next_cursor)
+        assert payload.sort_at == flights[1].departure_at
+        assert payload.id == str(flights[1].id)
+        assert flight_repository_mock.list_flights.await_args.kwargs["limit"] == 3
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(
+        self,
+        flight_service_mock: FlightService,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        flight_repository_mock.list_flights.return_value = [make_flight(1, ams, jfk)]
+        airport_repository_mock.get_airports_by_ids.return_value = {
+            str(ams.id): ams,
+            str(jfk.id): jfk,
+        }
+
+        items, next_cursor = await flight_service_mock.get_all_flights(limit=2)
+
+        assert len(items) == 1
+        assert next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_repository_builds_keyset_query(self):
+        repo, collection = make_repository_with_find()
+        flight_id = "64a7f0c2f1d2c4b5a6e7e001"
+        cursor = decode_flight_cursor(encode_flight_cursor(NOW, flight_id))
+        window_to = NOW + timedelta(days=7)
+
+        await repo.list_flights(limit=5, cursor=cursor, window_from=NOW, window_to=window_to)
+
+        window, keyset_clause = collection.find.call_args.args[0]["$and"]
+        assert window["departure_at"] == {"$gte": NOW, "$lt": window_to}
+        keyset = keyset_clause["$or"]
+        assert keyset[0] == {"departure_at": {"$lt": NOW}}
+        assert keyset[1]["departure_at"] == NOW
+        assert "$lt" in keyset[1]["_id"]
+        cursor_mock = collection.find.return_value
+        cursor_mock.sort.assert_called_once_with([("departure_at", -1), ("_id", -1)])
+        cursor_mock.limit.assert_called_once_with(5)
+
+
+class TestFlightExpiration:
+    @pytest.mark.asyncio
+    async def test_reads_do_not_write(
+        self,
+        flight_service_mock: FlightService,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        flight_repository_mock.list_active_flights.return_value = [make_flight(1, ams, jfk)]
+        flight_repository_mock.get_most_recent_active_flight.return_value = None
+        airport_repository_mock.get_airports_by_ids.return_value = {
+            str(ams.id): ams,
+            str(jfk.id): jfk,
+        }
+
+        await flight_service_mock.get_active_flights(limit=10)
+        await flight_service_mock.get_next_flight()
+
+        flight_repository_mock.expire_flights.assert_not_called()
+        flight_repository_mock.update_flight.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unswept_arrived_flight_is_reported_expired(
+        self,
+        flight_service_mock: FlightService,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        # Arrived long ago but still ACTIVE in the database.
+        flight_repository_mock.list_flights.return_value = [make_flight(0, ams, jfk)]
+        airport_repository_mock.get_airports_by_ids.return_value = {
+            str(ams.id): ams,
+            str(jfk.id): jfk,
+        }
+
+        result, _ = await flight_service_mock.get_all_flights(limit=10)
+
+        assert result[0].status == FlightStatus.EXPIRED
+
+    @pytest.mark.asyncio
+    async def test_repository_expires_in_a_single_update_many(self):
+        collection = AsyncMock()
+        collection.update_many.return_value = Mock(modified_count=3)
+        repo = FlightRepository(db={settings.flights_collection_name: collection})
+
+        assert await repo.expire_flights(NOW) == 3
+
+        collection.update_many.assert_awaited_once_with(
+            {"status": FlightStatus.ACTIVE, "arrival_at": {"$lt": NOW}},
+            {"$set": {"status": FlightStatus.EXPIRED, "updated_at": NOW}},
+        )
+
+    @pytest.mark.asyncio
+    async def test_repository_create_returns_inserted_flight_without_reading_back(
+        self, sample_airports: list[Airport]
+    ):
+        collection = AsyncMock()
+        collection.insert_one.return_value = Mock(inserted_id=ObjectId("64a7f0c2f1d2c4b5a6e7e009"))
+        repo = FlightRepository(db={settings.flights_collection_name: collection})
+        flight = make_flight(1, *sample_airports).model_copy(
+            update={"id": None, "created_at": NOW + timedelta(microseconds=1500)}
+        )
+
+        created = await repo.create_flight(flight)
+
+        collection.find_one.assert_not_awaited()
+        assert created.id == "64a7f0c2f1d2c4b5a6e7e009"
+        assert created.flight_number == flight.flight_number
+        # Mongo keeps milliseconds; the returned flight matches what a later read gives.
+        assert created.created_at == NOW + timedelta(milliseconds=1)
+
+    @pytest.mark.asyncio
+    async def test_active_queries_guard_on_arrival_time(self):
+        repo, collection = make_repository_with_find()
+
+        await repo.list_active_flights()
+
+        query = collection.find.call_args.args[0]
+        assert query["status"] == FlightStatus.ACTIVE
+        assert "$gt" in query["arrival_at"]
+
+    @pytest.mark.asyncio
+    async def test_worker_sweeps_until_stopped(self):
+        stop_event = asyncio.Event()
+        calls = 0
+
+        async def expire(self: FlightService) -> int:
+            nonlocal calls
+            calls += 1
+            stop_event.set()
+            return 1
+
+        with (
+            patch("app.workers.flight_expiration_worker.get_db", return_value={}),
+            patch.object(FlightRepository, "__init__", return_value=None),
+            patch.object(AirportRepository, "__init__", return_value=None),
+            patch.object(FlightService, "expire_flights", expire),
+        ):
+            await asyncio.wait_for(run_flight_expiration_worker(stop_event), timeout=1)
+
+        assert calls == 1
+
+
+def make_provider_flight(icao: str, scheduled: str, **extra: object) -> RawFlightData:
+    return RawFlightData(
+        data={
+            "number": "KL 1",
+            "status": "Delayed",
+            "departure": {
+                "airport": {"icao": icao},
+                "scheduledTime": {"utc": scheduled},
+                "revisedTime": {"utc": "2026-01-02 01:45Z"},
+            },
+            "arrival": {"airport": {"icao": "KJFK"}, "predictedTime": {"utc": "2026-01-02 03:50Z"}},
+            **extra,
+        }
+    )
+
+
+class TestFlightTracker:
+    def test_cadence_tightens_towards_departure(self, sample_airports: list[Airport]):
+        ams, jfk = sample_airports
+        flight = make_flight(1, ams, jfk)
+
+        assert poll_interval(flight, flight.departure_at - timedelta(days=2)) == timedelta(hours=6)
+        assert poll_interval(flight, flight.departure_at - timedelta(hours=12)) == timedelta(
+            hours=2
+        )
+        assert poll_interval(flight, flight.departure_at - timedelta(minutes=30)) == timedelta(
+            minutes=5
+        )
+        assert poll_interval(flight, flight.departure_at + timedelta(minutes=30)) == timedelta(
+            minutes=15
+        )
+
+    def test_matches_same_airport_and_closest_schedule(self, sample_airports: list[Airport]):
+        ams, jfk = sample_airports
+        flight = make_flight(1, ams, jfk)  # departs 2026-01-02 00:00 UTC
+        raw = [
+            make_provider_flight("EGLL", "2026-01-02 00:00Z"),
+            make_provider_flight("EHAM", "2026-01-01 00:05Z"),
+            make_provider_flight("EHAM", "2026-01-02 00:10Z", status="Expected"),
+        ]
+
+        match = match_flight(flight, "EHAM", raw)
+
+        assert match is not None and match["status"] == "Expected"
+
+    @pytest.mark.asyncio
+    async def test_writes_live_times_in_one_bulk_update(
+        self,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        flights = [make_flight(1, ams, jfk), make_flight(2, ams, jfk)]
+        flight_repository_mock.list_flights_due_for_tracking.return_value = flights
+        airport_repository_mock.get_airports_by_ids.return_value = {str(ams.id): ams}
+        client = AsyncMock(spec=AeroDataBoxClient)
+        client.get_flights_by_number.side_effect = [
+            [make_provider_flight("EHAM", "2026-01-02 00:00Z")],
+            AeroDataBoxError("upstream down", 503),
+        ]
+        tracker = FlightTracker(
+            flight_repository_mock, airport_repository_mock, budget=make_budget(), client=client
+        )
+        now = NOW + timedelta(hours=23)
+
+        assert await tracker.track_due_flights(now) == 2
+
+        flight_repository_mock.apply_live_updates.assert_awaited_once()
+        tracked, failed = flight_repository_mock.apply_live_updates.await_args.args[0]
+        assert tracked.departure_estimated_at == datetime(2026, 1, 2, 1, 45, tzinfo=UTC)
+        assert tracked.arrival_estimated_at == datetime(2026, 1, 2, 3, 50, tzinfo=UTC)
+        assert tracked.live_status == "Delayed"
+        assert tracked.live_next_check_at == now + timedelta(minutes=20)
+        assert failed == FlightLiveUpdate(
+            flight_id=str(flights[1].id), live_next_check_at=now + timedelta(hours=6)
+        )
+
+    @pytest.mark.asyncio
+    async def test_charges_every_attempt_to_the_shared_budget(
+        self,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        flights = [make_flight(i, ams, jfk) for i in range(5)]
+        flight_repository_mock.list_flights_due_for_tracking.return_value = flights
+        flight_repository_mock.claim_for_tracking.return_value = True
+        airport_repository_mock.get_airports_by_ids.return_value = {}
+        budget = make_budget(tokens=3)
+
+        attempts = iter([2, 1, 1])  # The first flight needs one retry.
+
+        async def get_flights_by_number(*_args, attempt_budget) -> list[RawFlightData]:
+            for _ in range(next(attempts)):
+                if not await attempt_budget():
+                    raise AeroDataBoxBudgetExhausted("Flight data call budget exhausted", 429)
+            return []
+
+        client = AsyncMock(spec=AeroDataBoxClient)
+        client.get_flights_by_number.side_effect = get_flights_by_number
+        tracker = FlightTracker(
+            flight_repository_mock, airport_repository_mock, budget=budget, client=client
+        )
+
+        assert await tracker.track_due_flights(NOW) == 2
+        assert budget.acquire.await_count == 4
+        limit = settings.flight_tracker_max_calls_per_hour
+        assert budget.acquire.await_args.kwargs == {"rate": limit / 3600, "capacity": limit}
+        polled = flight_repository_mock.apply_live_updates.await_args.args[0]
+        # The third flight was claimed but not polled: its lease is handed back.
+        assert [update.flight_id for update in polled] == [str(f.id) for f in flights[:3]]
+        assert polled[2].live_next_check_at == NOW
+        assert client.get_flights_by_number.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_call_budget_retries_when_two_processes_create_it(self):
+        collection = AsyncMock()
+        collection.find_one_and_update.side_effect = [DuplicateKeyError("race"), {"granted": True}]
+        budget = CallBudgetRepository(db={settings.call_budgets_collection_name: collection})
+
+        assert await budget.acquire("flight-tracker", rate=1 / 3600, capacity=12) is True
+
+        first, retry = collection.find_one_and_update.await_args_list
+        assert first.args[0] == {"_id": "flight-tracker"}
+        assert first.kwargs["upsert"] is True
+        assert "upsert" not in retry.kwargs
+
+    @pytest.mark.asyncio
+    async def test_skips_flights_claimed_by_another_tracker(
+        self,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        flights = [make_flight(1, ams, jfk), make_flight(2, ams, jfk)]
+        flight_repository_mock.list_flights_due_for_tracking.return_value = flights
+        flight_repository_mock.claim_for_tracking.side_effect = [False, True]
+        airport_repository_mock.get_airports_by_ids.return_value = {}
+        client = AsyncMock(spec=AeroDataBoxClient)
+        client.get_flights_by_number.return_value = []
+        tracker = FlightTracker(
+            flight_repository_mock, airport_repository_mock, budget=make_budget(), client=client
+        )
+
+        assert await tracker.track_due_flights(NOW) == 1
+
+        assert client.get_flights_by_number.await_args.args[0] == "KL2"
+        flight_id, now, lease_until = flight_repository_mock.claim_for_tracking.await_args.args
+        assert (flight_id, now) == (str(flights[1].id), NOW)
+        assert lease_until == NOW + timedelta(seconds=settings.flight_tracker_lease_seconds)
+
+    @pytest.mark.asyncio
+    async def test_repository_bulk_write_only_sets_known_fields(self):
+        collection = AsyncMock()
+        collection.bulk_write.return_value = Mock(modified_count=1)
+        repo = FlightRepository(db={settings.flights_collection_name: collection})
+        update = FlightLiveUpdate(flight_id="64a7f0c2f1d2c4b5a6e7e001", live_next_check_at=NOW)
+
+        assert await repo.apply_live_updates([update]) == 1
+        assert await repo.apply_live_updates([]) == 0
+
+        (operation,), kwargs = collection.bulk_write.await_args
+        assert operation[0]._doc == {"$set": {"live_next_check_at": NOW}}
+        assert kwargs == {"ordered": False}
+
+
+def parse_sse(frame: str) -> tuple[str, object]:
+    event, data = frame.strip().split("\n")
+    return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+
+class TestFlightStream:
+    def test_broker_fans_out_and_drops_oldest_when_full(self):
+        broker: Broker[int] = Broker(max_queue_size=2)
+
+        with broker.subscribe("t") as first, broker.subscribe("t") as second:
+            for event in (1, 2, 3):
+                broker.publish("t", event)
+            assert [first.get_nowait(), first.get_nowait()] == [2, 3]
+            assert second.qsize() == 2
+
+        assert broker.subscriber_count("t") == 0
+
+    @pytest.mark.asyncio
+    async def test_sends_snapshot_then_changes_then_heartbeats(
+        self,
+        flight_service_mock: FlightService,
+        flight_repository_mock: AsyncMock,
+        airport_repository_mock: AsyncMock,
+        sample_airports: list[Airport],
+    ):
+        ams, jfk = sample_airports
+        first, second = make_flight(1, ams, jfk), make_flight(2, ams, jfk)
+        flight_repository_mock.get_most_recent_active_flight.return_value = first
+        airport_repository_mock.get_airports_by_ids.return_value = {
+            str(ams.id): ams,
+            str(jfk.id): jfk,
+        }
+        stream = next_flight_events(flight_service_mock, heartbeat_seconds=0.05)
+
+        event, data = parse_sse(await anext(stream))
+        assert (event, data["id"]) == ("next_flight", str(first.id))
+
+        # A change that leaves the next flight untouched is forwarded on its own.
+        flight_broker.publish(
+            FLIGHTS_TOPIC, FlightChangeEvent(operation=FlightChangeOperation.UPDATE)
+        )
+        assert parse_sse(await anext(stream)) == ("flight_changed", {"operation": "update"})
+
+        flight_repository_mock.get_most_recent_active_flight.return_value = second
+        flight_repository_mock.delete_flight.return_value = True
+        await flight_service_mock.delete_flight_by_id(str(first.id))
+        assert parse_sse(await anext(stream)) == (
+            "flight_changed",
+            {"operation": "delete", "flight_id": str(first.id)},
+        )
+        event, data = parse_sse(await anext(stream))
+        assert (event, data["id"]) == ("next_flight", str(second.id))
+
+        assert await anext(stream) == SSE_HEARTBEAT
+        await stream.aclose()
+        assert flight_broker.subscriber_count(FLIGHTS_TOPIC) == 0
+
+    @pytest.mark.asyncio
+    async def test_local_events_are_suppressed_while_change_stream_relays(
+        self, flight_service_mock: FlightService, flight_repository_mock: AsyncMock
+    ):
+        flight_repository_mock.expire_flights.return_value = 2
+
+        with flight_broker.subscribe(FLIGHTS_TOPIC) as changes:
+            set_change_stream_active(True)
+            try:
+                await flight_service_mock.expire_flights()
+            finally:
+                set_change_stream_active(False)
+            assert changes.empty()
+
+            await flight_service_mock.expire_flights()
+            assert changes.get_nowait().operation == FlightChangeOperation.UPDATE
@@ -1,14 +1,34 @@
-from datetime import UTC, datetime
-from unittest.mock import AsyncMock
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from unittest.mock import ANY, AsyncMock, Mock, patch
 
 import pytest
-
-from app.api.v1.mediation import create_mediation_session
-from app.schemas.v1.exceptions import ConflictException
+from pymongo.errors import DuplicateKeyError
+
+import app.services.mediation as mediation_service_module
+import app.workers.__main__ as workers_main_module
+import app.workers.mediation_worker as mediation_worker_module
+from app.api.v1.mediation import create_mediation_session, mediation_session_events
+from app.core.config import Settings
+from app.integrations.openai_client import OpenAIModerationResult, OpenAIStructuredResult
+from app.repositories.mediation import (
+    MediationCommentRepository,
+    MediationJobRepository,
+    MediationPerspectiveRepository,
+    job_rank_at,
+    retry_delay_seconds,
+)
+from app.schemas.v1.exceptions import ConflictException, NotFoundException
 from app.schemas.v1.mediation import (
     AIJobStatus,
     MediationAIJob,
     MediationAIJobType,
+    MediationAuthorType,
+    MediationComment,
+    MediationCommentCursorPayload,
+    MediationEventType,
     MediationModerationResult,
     MediationPerspective,
     MediationPerspectiveDraftUpdate,
@@ -23,12 +43,18 @@ from app.schemas.v1.session import SessionResponse
 from app.schemas.v1.user import UserType
 from app.services.mediation import MediationService
 from app.services.mediation_ai import MediationAIService
-from app.services.mediation_safety import MediationSafetyService, ModerationDecision
+from app.services.mediation_events import mediation_broker, publish_mediation_event
+from app.services.mediation_safety import (
+    MediationSafetyService,
+    ModerationDecision,
+    ModerationDecisionCache,
+)
 
 NOW = datetime(2026, 1, 1, tzinfo=UTC)
 SESSION_ID = "64a7f0c2f1d2c4b5a6e7d8f1"
 PERSPECTIVE_ID = "64a7f0c2f1d2c4b5a6e7d8f2"
 MODERATION_ID = "64a7f0c2f1d2c4b5a6e7d8f3"
+JOB_ID = "64a7f0c2f1d2c4b5a6e7d8f4"
 
 
 def make_session(
@@ -331,6 +357,51 @@ async def test_perspective_moderation_job_blocks_unsafe_perspective() -> None:
     repos["jobs"].create_job_if_not_exists.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_ai_output_is_moderated_upstream_once_per_distinct_text() -> None:
+    service, repos = make_ai_service()
+    safety = MediationSafetyService(repos["openai"])
+    safety._cache = ModerationDecisionCache(8)
+    service._safety = safety
+    repos["openai"].moderate_text.return_value = OpenAIModerationResult(
+        flagged=False, categories={}, category_scores={}, raw_result={"id": "modr-1"}
+    )
+    repos["openai"].create_structured_response.return_value = OpenAIStructuredResult(
+        parsed={
+            "emotional_reflection": "You felt unheard.",
+            "calming_exercise": "Breathe slowly.",
+            "possible_underlying_needs": ["Recognition"],
+            "things_to_avoid_right_now": ["Blaming"],
+            "next_best_action": "Take a short walk.",
+            "neutral_reminder": "Both views matter.",
+        },
+        response_id="resp-1",
+    )
+    repos["perspectives"].get_by_id.return_value = make_perspective(PerspectiveStatus.LOCKED)
+    repos["moderation"].insert.return_value = make_moderation()
+    job = MediationAIJob(
+        job_type=MediationAIJobType.PRIVATE_REFLECTION,
+        status=AIJobStatus.PROCESSING,
+        session_id=SESSION_ID,
+        source_entity_id=PERSPECTIVE_ID,
+        source_entity_type="PERSPECTIVE",
+        idempotency_key=f"private_reflection:{SESSION_ID}:{PERSPECTIVE_ID}",
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+    with patch("app.services.mediation_ai.publish_mediation_event", new_callable=AsyncMock):
+        await service.generate_private_reflection(job)
+        repos["openai"].moderate_text.assert_awaited_once()
+        # A retry that produces the same output reuses the decision.
+        await service.generate_private_reflection(job)
+
+    repos["openai"].moderate_text.assert_awaited_once()
+    assert repos["moderation"].insert.await_count == 2
+    persisted = repos["moderation"].insert.await_args.args[0]
+    assert persisted.provider == MediationProvider.OPENAI
+
+
 @pytest.mark.asyncio
 async def test_shared_advice_generation_ignores_pending_review_perspectives() -> None:
     service, repos = make_ai_service()
@@ -365,9 +436,254 @@ async def test_cannot_comment_before_advice_is_available() -> None:
     )
 
     with pytest.raises(ConflictException):
-        await service.list_comments(SESSION_ID, UserType.JORIS)
+        await service.list_comments(SESSION_ID, UserType.JORIS, limit=20)
+
+    repos["comments"].list_page.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_pages_without_per_session_perspective_lookups() -> None:
+    service, repos = make_service()
+    sessions = [
+        make_session().model_copy(
+            update={"id": f"64a7f0c2f1d2c4b5a6e7d90{index}", "perspective_statuses": statuses}
+        )
+        for index, statuses in enumerate(
+            [
+                {UserType.JORIS: PerspectiveStatus.LOCKED},
+                {UserType.DANFENG: PerspectiveStatus.DRAFT},
+                {},
+            ]
+        )
+    ]
+    repos["sessions"].list_page.return_value = sessions
+
+    items, next_cursor = await service.list_sessions(UserType.JORIS, limit=2, cursor=SESSION_ID)
+
+    repos["sessions"].list_page.assert_awaited_once_with(limit=3, before_id=SESSION_ID)
+    repos["perspectives"].list_for_session.assert_not_called()
+    assert [(item.has_my_perspective, item.has_other_perspective) for item in items] == [
+        (True, False),
+        (False, True),
+    ]
+    assert next_cursor == sessions[1].id
+
+
+@pytest.mark.asyncio
+async def test_perspective_status_changes_are_mirrored_onto_the_session() -> None:
+    perspectives = AsyncMock()
+    sessions = AsyncMock()
+    perspectives.find_one_and_update.return_value = make_perspective(
+        PerspectiveStatus.LOCKED
+    ).serialize()
+    settings = mediation_worker_module.settings
+    repo = MediationPerspectiveRepository(
+        db={
+            settings.mediation_perspectives_collection_name: perspectives,
+            settings.mediation_sessions_collection_name: sessions,
+        }
+    )
+
+    await repo.lock_perspective(PERSPECTIVE_ID, MODERATION_ID)
+
+    sessions.update_one.assert_awaited_once()
+    query, update = sessions.update_one.await_args.args
+    locked_at = perspectives.find_one_and_update.return_value["updated_at"]
+    assert str(query["_id"]) == SESSION_ID
+    # An older transition finishing late must not overwrite this one.
+    assert {"perspective_status_updated_at.Joris": {"$lte": locked_at}} in query["$or"]
+    assert update == {
+        "$set": {
+            "perspective_statuses.Joris": PerspectiveStatus.LOCKED.value,
+            "perspective_status_updated_at.Joris": locked_at,
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_session_detail_runs_its_lookups_concurrently_and_once() -> None:
+    service, repos = make_service()
+    lookups = [
+        (repos["sessions"].get_by_id, make_session()),
+        (repos["perspectives"].list_for_session, [make_perspective()]),
+        (repos["comments"].list_page, []),
+        (repos["ai"].get_reflection_for_user, None),
+        (repos["ai"].get_latest_advice, None),
+        (
+            repos["jobs"].latest_status_by_type,
+            {MediationAIJobType.PRIVATE_REFLECTION: AIJobStatus.PROCESSING},
+        ),
+    ]
+    barrier = asyncio.Barrier(len(lookups))
+
+    def gated(result: object):
+        async def lookup(*_args: object, **_kwargs: object) -> object:
+            # Only completes once every lookup is in flight at the same time.
+            await barrier.wait()
+            return result
+
+        return lookup
+
+    for mock, result in lookups:
+        mock.side_effect = gated(result)
+
+    detail = await asyncio.wait_for(
+        service.get_session_detail(SESSION_ID, UserType.JORIS), timeout=1
+    )
+
+    assert detail.my_reflection_status == "PROCESSING"
+    assert detail.advice_status == "NONE"
+    for mock, _ in lookups:
+        mock.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_session_detail_cancels_its_lookups_when_the_session_is_missing() -> None:
+    service, repos = make_service()
+    repos["sessions"].get_by_id.return_value = None
+    cancelled: list[str] = []
+
+    def pending(name: str):
+        async def lookup(*_args: object, **_kwargs: object) -> None:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(name)
+                raise
+
+        return lookup
+
+    repos["perspectives"].list_for_session.side_effect = pending("perspectives")
+    repos["comments"].list_page.side_effect = pending("comments")
+    repos["ai"].get_reflection_for_user.side_effect = pending("reflection")
+    repos["ai"].get_latest_advice.side_effect = pending("advice")
+    repos["jobs"].latest_status_by_type.side_effect = pending("job_statuses")
+
+    with pytest.raises(NotFoundException):
+        await asyncio.wait_for(service.get_session_detail(SESSION_ID, UserType.JORIS), timeout=1)
+    await asyncio.sleep(0)
+
+    assert sorted(cancelled) == [
+        "advice",
+        "comments",
+        "job_statuses",
+        "perspectives",
+        "reflection",
+    ]
+
+
+def make_comment(index: int) -> MediationComment:
+    return MediationComment(
+        id=f"64a7f0c2f1d2c4b5a6e7d9a{index}",
+        session_id=SESSION_ID,
+        author_type=MediationAuthorType.USER,
+        author_user_type=UserType.JORIS,
+        content=f"Comment {index}",
+        created_at=NOW + timedelta(seconds=index),
+    )
 
-    repos["comments"].list_for_session.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_list_comments_pages_with_a_created_at_id_cursor() -> None:
+    service, repos = make_service()
+    repos["sessions"].get_by_id.return_value = make_session(MediationSessionStatus.DISCUSSION_OPEN)
+    repos["comments"].list_page.return_value = [make_comment(index) for index in range(3)]
+
+    items, next_cursor = await service.list_comments(SESSION_ID, UserType.JORIS, limit=2)
+    repos["comments"].list_page.return_value = []
+    await service.list_comments(SESSION_ID, UserType.JORIS, limit=2, cursor=next_cursor)
+
+    assert [item.content for item in items] == ["Comment 0", "Comment 1"]
+    assert repos["comments"].list_page.await_args.kwargs["cursor"] == (
+        MediationCommentCursorPayload(created_at=items[1].created_at, id=items[1].id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_session_detail_embeds_the_first_comment_page_with_a_cursor(monkeypatch) -> None:
+    monkeypatch.setattr(mediation_service_module.settings, "max_page_size", 2)
+    service, repos = make_service()
+    repos["sessions"].get_by_id.return_value = make_session(MediationSessionStatus.DISCUSSION_OPEN)
+    repos["perspectives"].list_for_session.return_value = []
+    repos["comments"].list_page.return_value = [make_comment(index) for index in range(3)]
+    repos["ai"].get_reflection_for_user.return_value = None
+    repos["ai"].get_latest_advice.return_value = None
+    repos["jobs"].latest_status_by_type.return_value = {}
+
+    detail = await service.get_session_detail(SESSION_ID, UserType.JORIS)
+    repos["comments"].list_page.return_value = []
+    await service.list_comments(
+        SESSION_ID, UserType.JORIS, limit=2, cursor=detail.comments_next_cursor
+    )
+
+    assert [item.content for item in detail.comments] == ["Comment 0", "Comment 1"]
+    assert repos["comments"].list_page.await_args.kwargs["cursor"] == (
+        MediationCommentCursorPayload(
+            created_at=detail.comments[1].created_at, id=detail.comments[1].id
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_comment_repository_queries_after_cursor_and_tails_by_index() -> None:
+    collection = AsyncMock()
+    find = collection.find = Mock()
+    cursor = find.return_value.sort.return_value.limit.return_value
+    cursor.to_list = AsyncMock(
+        return_value=[make_comment(2).serialize(), make_comment(1).serialize()]
+    )
+    repo = MediationCommentRepository(
+        db={mediation_worker_module.settings.mediation_comments_collection_name: collection}
+    )
+
+    await repo.list_page(
+        SESSION_ID,
+        limit=20,
+        cursor=MediationCommentCursorPayload(created_at=NOW, id=JOB_ID),
+        since=NOW - timedelta(hours=1),
+    )
+    query = find.call_args.args[0]
+    recent = await repo.list_recent(SESSION_ID, 2)
+
+    scoped, after = query["$and"]
+    assert scoped == {
+        "session_id": SESSION_ID,
+        "created_at": {"$gt": "2025-12-31T23:00:00.000000Z"},
+    }
+    assert after["$or"][0] == {"created_at": {"$gt": "2026-01-01T00:00:00.000000Z"}}
+    assert find.return_value.sort.call_args.args[0] == [("created_at", -1), ("_id", -1)]
+    find.return_value.sort.return_value.limit.assert_called_with(2)
+    assert [comment.content for comment in recent] == ["Comment 1", "Comment 2"]
+
+
+@pytest.mark.asyncio
+async def test_comment_page_bounds_sort_with_stored_whole_second_timestamps() -> None:
+    collection = AsyncMock()
+    find = collection.find = Mock()
+    find.return_value.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=[])
+    repo = MediationCommentRepository(
+        db={mediation_worker_module.settings.mediation_comments_collection_name: collection}
+    )
+    on_the_second = make_comment(0)
+    half_second_later = on_the_second.model_copy(
+        update={"created_at": NOW + timedelta(milliseconds=500)}
+    )
+    stored = [half_second_later.serialize()["created_at"], on_the_second.serialize()["created_at"]]
+
+    await repo.list_page(
+        SESSION_ID,
+        limit=20,
+        cursor=MediationCommentCursorPayload(created_at=NOW, id=on_the_second.id),
+        since=NOW,
+    )
+    scoped, after = find.call_args.args[0]["$and"]
+    since_bound = scoped["created_at"]["$gt"]
+    cursor_bound = after["$or"][0]["created_at"]["$gt"]
+
+    # Mongo compares strings bytewise, as Python does.
+    assert sorted(stored) == [on_the_second.serialize()["created_at"], stored[0]]
+    assert since_bound == cursor_bound == on_the_second.serialize()["created_at"]
+    assert half_second_later.serialize()["created_at"] > since_bound
 
 
 @pytest.mark.asyncio
@@ -518,3 +834,491 @@ async def test_unarchive_removes_only_current_user_pending_mark() -> None:
     args = repos["sessions"].unmark_archived.await_args.args
     assert args[0] == SESSION_ID
     assert set(args[1]) == {UserType.JORIS}
+
+
+@pytest.mark.asyncio
+async def test_perspective_lock_publishes_session_events() -> None:
+    service, repos = make_ai_service()
+    job = MediationAIJob(
+        job_type=MediationAIJobType.PERSPECTIVE_MODERATION,
+        status=AIJobStatus.PROCESSING,
+        session_id=SESSION_ID,
+        source_entity_id=PERSPECTIVE_ID,
+        source_entity_type="PERSPECTIVE",
+        idempotency_key=f"perspective_moderation:{SESSION_ID}:{PERSPECTIVE_ID}",
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    repos["perspectives"].get_by_id.return_value = make_perspective(
+        PerspectiveStatus.SUBMITTED_PENDING_REVIEW
+    )
+    repos["safety"].moderate_perspective.return_value = normal_decision()
+    repos["moderation"].insert.return_value = make_moderation()
+    repos["perspectives"].lock_perspective.return_value = make_perspective(PerspectiveStatus.LOCKED)
+    repos["perspectives"].count_locked_for_session.return_value = 2
+    repos["jobs"].create_job_if_not_exists.side_effect = lambda item: item
+
+    with mediation_broker.subscribe(SESSION_ID) as events:
+        await service.moderate_perspective_submission(job)
+        published = [events.get_nowait() for _ in range(events.qsize())]
+
+    assert [(event.event_type, event.perspective_status, event.status) for event in published] == [
+        (MediationEventType.PERSPECTIVE_STATUS_CHANGED, PerspectiveStatus.LOCKED, None),
+        (
+            MediationEventType.STATUS_CHANGED,
+            None,
+            MediationSessionStatus.AI_MEDIATION_PROCESSING,
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_session_event_stream_hides_other_users_private_events() -> None:
+    stream = mediation_session_events(SESSION_ID, UserType.JORIS, heartbeat_seconds=60)
+    first_frame = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+
+    await publish_mediation_event(
+        SESSION_ID,
+        MediationEventType.REFLECTION_AVAILABLE,
+        recipient_user_type=UserType.DANFENG,
+    )
+    await publish_mediation_event(
+        SESSION_ID,
+        MediationEventType.ADVICE_AVAILABLE,
+        status=MediationSessionStatus.AI_ADVICE_AVAILABLE,
+    )
+    event, data = (await first_frame).strip().split("\n")
+    await stream.aclose()
+
+    assert event == "event: ADVICE_AVAILABLE"
+    assert json.loads(data.removeprefix("data: "))["status"] == "AI_ADVICE_AVAILABLE"
+    assert mediation_broker.subscriber_count(SESSION_ID) == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_wakes_on_job_change_instead_of_polling(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mediation_worker_module.settings, "mediation_worker_fallback_poll_interval_seconds", 60
+    )
+    monkeypatch.setattr(
+        mediation_worker_module.settings, "mediation_stale_job_sweep_interval_seconds", 60
+    )
+    stop_event = asyncio.Event()
+    changes: asyncio.Queue[None] = asyncio.Queue()
+    claimable: list[MediationAIJob] = []
+    job = MediationAIJob(
+        id=JOB_ID,
+        job_type=MediationAIJobType.COMMENT_RESPONSE,
+        status=AIJobStatus.PROCESSING,
+        session_id=SESSION_ID,
+        idempotency_key=f"comment_response:{SESSION_ID}:{JOB_ID}",
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+    @asynccontextmanager
+    async def watch_claimable():
+        async def stream():
+            while True:
+                yield await changes.get()
+
+        yield stream()
+
+    jobs = AsyncMock(spec=MediationJobRepository)
+    jobs.watch_claimable = watch_claimable
+    jobs.fail_exhausted_stale_processing_jobs.return_value = 0
+    jobs.next_retry_at.return_value = None
+    jobs.claim_next_pending_job.side_effect = lambda *_, **__: (
+        claimable.pop() if claimable else None
+    )
+    service = AsyncMock(spec=MediationAIService)
+    service.process_job.side_effect = lambda _: stop_event.set()
+
+    with (
+        patch.object(mediation_worker_module, "get_db"),
+        patch.object(mediation_worker_module, "OpenAIClient"),
+        patch.object(mediation_worker_module, "MediationJobRepository", return_value=jobs),
+        patch.object(mediation_worker_module, "MediationAIService", return_value=service),
+    ):
+        worker = asyncio.create_task(mediation_worker_module.run_mediation_worker(stop_event))
+        await asyncio.sleep(0.05)
+        idle_claims = jobs.claim_next_pending_job.await_count
+
+        claimable.append(job)
+        changes.put_nowait(None)
+        await asyncio.wait_for(worker, timeout=1)
+
+    # Idle: the startup checks only, no 2-second polling loop.
+    assert idle_claims <= 3
+    service.process_job.assert_awaited_once_with(job)
+    jobs.mark_completed.assert_awaited_once_with(JOB_ID, ANY)
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_respects_limits_and_drains_on_stop(monkeypatch) -> None:
+    worker_settings = mediation_worker_module.settings
+    monkeypatch.setattr(worker_settings, "mediation_worker_change_stream_enabled", False)
+    monkeypatch.setattr(worker_settings, "mediation_worker_poll_interval_seconds", 60)
+    monkeypatch.setattr(worker_settings, "mediation_worker_concurrency", 3)
+    monkeypatch.setattr(
+        worker_settings, "mediation_worker_job_type_limits", {"SHARED_MEDIATION_ADVICE": 1}
+    )
+    stop_event = asyncio.Event()
+    release = asyncio.Event()
+    sessions = [f"64a7f0c2f1d2c4b5a6e7d9{index:02d}" for index in range(4)]
+
+    def make_job(job_type: MediationAIJobType, session_id: str) -> MediationAIJob:
+        return MediationAIJob(
+            id=f"64a7f0c2f1d2c4b5a6e7da{len(pending):02d}",
+            job_type=job_type,
+            status=AIJobStatus.PROCESSING,
+            session_id=session_id,
+            idempotency_key=f"{job_type.value}:{session_id}",
+            created_at=NOW,
+            updated_at=NOW,
+        )
+
+    pending: list[MediationAIJob] = []
+    for job_type, session_id in [
+        (MediationAIJobType.SHARED_MEDIATION_ADVICE, sessions[0]),
+        (MediationAIJobType.SHARED_MEDIATION_ADVICE, sessions[1]),
+        (MediationAIJobType.COMMENT_RESPONSE, sessions[0]),
+        (MediationAIJobType.PERSPECTIVE_MODERATION, sessions[2]),
+        (MediationAIJobType.PERSPECTIVE_MODERATION, sessions[3]),
+    ]:
+        pending.append(make_job(job_type, session_id))
+    advice_s0, advice_s1, comment_s0, moderation_s2, moderation_s3 = pending
+
+    def claim(_stale, *, owner, job_types, exclude_session_ids):
+        for job in pending:
+            if job.job_type in job_types and job.session_id not in exclude_session_ids:
+                pending.remove(job)
+                return job
+        return None
+
+    running: list[MediationAIJob] = []
+
+    async def process(job: MediationAIJob) -> None:
+        running.append(job)
+        await release.wait()
+
+    jobs = AsyncMock(spec=MediationJobRepository)
+    jobs.fail_exhausted_stale_processing_jobs.return_value = 0
+    jobs.claim_next_pending_job.side_effect = claim
+    jobs.next_retry_at.return_value = None
+    service = AsyncMock(spec=MediationAIService)
+    service.process_job.side_effect = process
+
+    with (
+        patch.object(mediation_worker_module, "get_db"),
+        patch.object(mediation_worker_module, "OpenAIClient"),
+        patch.object(mediation_worker_module, "MediationJobRepository", return_value=jobs),
+        patch.object(mediation_worker_module, "MediationAIService", return_value=service),
+    ):
+        worker = asyncio.create_task(mediation_worker_module.run_mediation_worker(stop_event))
+        await asyncio.sleep(0.05)
+
+        # Advice is capped at one, and the session 0 comment waits for its advice job.
+        assert running == [advice_s0, moderation_s2, moderation_s3]
+
+        stop_event.set()
+        await asyncio.sleep(0.05)
+        assert not worker.done()
+
+        release.set()
+        await asyncio.wait_for(worker, timeout=1)
+
+    assert pending == [advice_s1, comment_s0]
+    assert jobs.mark_completed.await_count == 3
+
+
+def make_claimed_job() -> MediationAIJob:
+    return MediationAIJob(
+        id=JOB_ID,
+        job_type=MediationAIJobType.SHARED_MEDIATION_ADVICE,
+        status=AIJobStatus.PROCESSING,
+        session_id=SESSION_ID,
+        idempotency_key=f"shared_advice:{SESSION_ID}",
+        lease_owner="worker-a",
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+@pytest.mark.asyncio
+async def test_standalone_worker_exits_cleanly_when_shutdown_times_out(monkeypatch) -> None:
+    monkeypatch.setattr(
+        workers_main_module.settings, "mediation_worker_shutdown_timeout_seconds", 0.01
+    )
+    monkeypatch.setattr(workers_main_module, "get_db", Mock())
+    monkeypatch.setattr(workers_main_module, "ensure_mediation_indexes", AsyncMock())
+    cancelled = asyncio.Event()
+
+    async def slow_to_stop(stop_event: asyncio.Event, _owner: str) -> None:
+        stop_event.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(workers_main_module, "run_mediation_worker", slow_to_stop)
+
+    await workers_main_module._serve()
+
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_worker_heartbeats_while_processing(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mediation_worker_module.settings, "mediation_job_heartbeat_interval_seconds", 0.01
+    )
+    jobs = AsyncMock(spec=MediationJobRepository)
+    jobs.heartbeat.return_value = True
+    service = AsyncMock(spec=MediationAIService)
+
+    async def process(_job: MediationAIJob) -> None:
+        await asyncio.sleep(0.05)
+
+    service.process_job.side_effect = process
+
+    await mediation_worker_module._process_claimed_job(
+        service, jobs, make_claimed_job(), "worker-a"
+    )
+
+    assert jobs.heartbeat.await_count >= 2
+    jobs.heartbeat.assert_awaited_with(JOB_ID, "worker-a")
+    jobs.mark_completed.assert_awaited_once_with(JOB_ID, "worker-a")
+
+
+@pytest.mark.asyncio
+async def test_worker_abandons_job_when_lease_is_lost(monkeypatch) -> None:
+    monkeypatch.setattr(
+        mediation_worker_module.settings, "mediation_job_heartbeat_interval_seconds", 0.01
+    )
+    jobs = AsyncMock(spec=MediationJobRepository)
+    jobs.heartbeat.return_value = False
+    service = AsyncMock(spec=MediationAIService)
+
+    async def process(_job: MediationAIJob) -> None:
+        await asyncio.sleep(60)
+
+    service.process_job.side_effect = process
+
+    await asyncio.wait_for(
+        mediation_worker_module._process_claimed_job(service, jobs, make_claimed_job(), "worker-a"),
+        timeout=1,
+    )
+
+    jobs.mark_completed.assert_not_called()
+    jobs.mark_failed_or_retry.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stale_job_recovery_keys_off_missed_heartbeats() -> None:
+    collection = AsyncMock()
+    collection.find_one_and_update.return_value = None
+    repo = MediationJobRepository(
+        db={mediation_worker_module.settings.mediation_ai_jobs_collection_name: collection}
+    )
+
+    await repo.claim_next_pending_job(60, owner="worker-b")
+
+    query, update = collection.find_one_and_update.await_args.args
+    stale = query["$or"][1]
+    assert stale["status"] == AIJobStatus.PROCESSING
+    assert "$lte" in stale["$or"][0]["heartbeat_at"]
+    assert update["$set"]["lease_owner"] == "worker-b"
+    assert update["$set"]["heartbeat_at"] == update["$set"]["started_at"]
+
+
+def busy_session_error(session_id: str) -> DuplicateKeyError:
+    return DuplicateKeyError(
+        "E11000 duplicate key error",
+        11000,
+        {"keyPattern": {"session_id": 1}, "keyValue": {"session_id": session_id}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_sessions_processing_in_another_worker() -> None:
+    collection = AsyncMock()
+    other = make_claimed_job().model_copy(update={"session_id": PERSPECTIVE_ID})
+    collection.find_one_and_update.side_effect = [busy_session_error(SESSION_ID), other.serialize()]
+    repo = MediationJobRepository(
+        db={mediation_worker_module.settings.mediation_ai_jobs_collection_name: collection}
+    )
+
+    claimed = await repo.claim_next_pending_job(owner="worker-b")
+
+    assert claimed.session_id == PERSPECTIVE_ID
+    first, retry = collection.find_one_and_update.await_args_list
+    assert "session_id" not in first.args[0]
+    assert retry.args[0]["session_id"] == {"$nin": [SESSION_ID]}
+
+
+@pytest.mark.asyncio
+async def test_claim_reclaims_the_stale_job_holding_a_busy_session() -> None:
+    collection = AsyncMock()
+    stale = make_claimed_job()
+    collection.find_one_and_update.side_effect = [busy_session_error(SESSION_ID), stale.serialize()]
+    repo = MediationJobRepository(
+        db={mediation_worker_module.settings.mediation_ai_jobs_collection_name: collection}
+    )
+
+    claimed = await repo.claim_next_pending_job(60, owner="worker-b")
+
+    assert claimed.id == stale.id
+    reclaim = collection.find_one_and_update.await_args.args[0]
+    assert reclaim["session_id"] == SESSION_ID
+    assert reclaim["status"] == AIJobStatus.PROCESSING
+    assert "$lte" in reclaim["$or"][0]["heartbeat_at"]
+
+
+def test_job_lease_still_reads_the_deprecated_processing_timeout(tmp_path) -> None:
+    env_file = tmp_path / ".env"
+    env_file.write_text('MEDIATION_JOB_PROCESSING_TIMEOUT_SECONDS="300"\n')
+
+    assert Settings(_env_file=env_file).mediation_job_lease_seconds == 300
+
+    env_file.write_text(
+        'MEDIATION_JOB_PROCESSING_TIMEOUT_SECONDS="300"\nMEDIATION_JOB_LEASE_SECONDS="45"\n'
+    )
+
+    assert Settings(_env_file=env_file).mediation_job_lease_seconds == 45
+
+
+def test_job_priority_defaults_by_type_and_ranks_age_over_priority(monkeypatch) -> None:
+    monkeypatch.setattr(mediation_worker_module.settings, "mediation_job_priority_step_seconds", 30)
+    monkeypatch.setattr(
+        mediation_worker_module.settings, "mediation_job_session_fairness_seconds", 10
+    )
+    moderation = MediationAIJob.model_validate(
+        {**make_claimed_job().serialize(), "job_type": "PERSPECTIVE_MODERATION", "priority": None}
+    )
+    reflection = MediationAIJob.model_validate(
+        {**make_claimed_job().serialize(), "job_type": "PRIVATE_REFLECTION", "priority": None}
+    )
+
+    assert make_claimed_job().priority == 1
+    assert moderation.priority == 0
+    assert reflection.priority == 2
+    # A reflection queued a minute ago still runs before a moderation job queued now,
+    # but not before one queued 30 seconds ago.
+    old_reflection = job_rank_at(NOW - timedelta(seconds=61), reflection.priority, 0)
+    assert old_reflection < job_rank_at(NOW, moderation.priority, 0)
+    assert old_reflection > job_rank_at(NOW - timedelta(seconds=30), moderation.priority, 0)
+    # Every job a session already has queued pushes its next one back.
+    assert job_rank_at(NOW, 0, 3) == NOW + timedelta(seconds=30)
+
+
+@pytest.mark.asyncio
+async def test_job_repository_ranks_new_jobs_and_claims_by_rank() -> None:
+    collection = AsyncMock()
+    collection.count_documents.return_value = 2
+    collection.find_one_and_update.side_effect = [make_claimed_job().serialize(), None]
+    repo = MediationJobRepository(
+        db={mediation_worker_module.settings.mediation_ai_jobs_collection_name: collection}
+    )
+    job = make_claimed_job().model_copy(update={"id": None, "status": AIJobStatus.PENDING})
+
+    await repo.create_job_if_not_exists(job)
+    await repo.claim_next_pending_job(owner="worker-a")
+
+    assert collection.count_documents.await_args.args[0] == {
+        "session_id": SESSION_ID,
+        "status": AIJobStatus.PENDING,
+    }
+    upsert, claim = collection.find_one_and_update.await_args_list
+    assert upsert.args[0] == {"idempotency_key": job.idempotency_key}
+    assert upsert.kwargs["upsert"] is True
+    inserted = MediationAIJob.model_validate(upsert.args[1]["$setOnInsert"])
+    assert inserted.rank_at == job_rank_at(NOW, job.priority, 2)
+    assert claim.kwargs["sort"][0] == ("rank_at", 1)
+    collection.insert_one.assert_not_awaited()
+    collection.find_one.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_job_upsert_that_loses_a_duplicate_key_race_retries() -> None:
+    collection = AsyncMock()
+    collection.count_documents.return_value = 0
+    winner = make_claimed_job()
+    collection.find_one_and_update.side_effect = [
+        DuplicateKeyError("E11000 duplicate key error"),
+        winner.serialize(),
+    ]
+    repo = MediationJobRepository(
+        db={mediation_worker_module.settings.mediation_ai_jobs_collection_name: collection}
+    )
+    job = winner.model_copy(update={"id": None, "status": AIJobStatus.PENDING})
+
+    stored = await repo.create_job_if_not_exists(job)
+
+    assert stored.id == winner.id
+    first, retry = collection.find_one_and_update.await_args_list
+    assert retry == first
+    collection.find_one.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_job_upsert_without_a_document_raises() -> None:
+    collection = AsyncMock()
+    collection.count_documents.return_value = 0
+    collection.find_one_and_update.return_value = None
+    repo = MediationJobRepository(
+        db={mediation_worker_module.settings.mediation_ai_jobs_collection_name: collection}
+    )
+
+    with pytest.raises(RuntimeError):
+        await repo.create_job_if_not_exists(make_claimed_job())
+
+
+def test_stored_job_ranks_sort_chronologically_as_text() -> None:
+    ranks = [NOW, NOW + timedelta(microseconds=500_000), NOW + timedelta(seconds=1)]
+    stored = [
+        make_claimed_job().model_copy(update={"rank_at": rank, "created_at": rank}).serialize()
+        for rank in ranks
+    ]
+
+    # The claim sorts on the stored strings; a whole-second rank must not sort last.
+    assert sorted(stored, key=lambda doc: doc["rank_at"]) == stored
+    assert sorted(stored, key=lambda doc: doc["created_at"]) == stored
+    assert stored[0]["rank_at"] == "2026-01-01T00:00:00.000000Z"
+    assert MediationAIJob.model_validate(stored[1]).rank_at == ranks[1]
+
+
+def test_retry_delay_backs_off_exponentially_with_jitter(monkeypatch) -> None:
+    settings = mediation_worker_module.settings
+    monkeypatch.setattr(settings, "mediation_job_retry_base_delay_seconds", 10)
+    monkeypatch.setattr(settings, "mediation_job_retry_max_delay_seconds", 60)
+
+    assert 5 <= retry_delay_seconds(1) <= 10
+    assert 20 <= retry_delay_seconds(3) <= 40
+    assert 30 <= retry_delay_seconds(10) <= 60
+    assert retry_delay_seconds(1, retry_after=120) == 120
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_rescheduled_and_skipped_until_due() -> None:
+    collection = AsyncMock()
+    collection.find_one.return_value = {"attempts": 1, "max_attempts": 3}
+    collection.find_one_and_update.return_value = None
+    repo = MediationJobRepository(
+        db={mediation_worker_module.settings.mediation_ai_jobs_collection_name: collection}
+    )
+
+    before = datetime.now(UTC)
+    await repo.mark_failed_or_retry(JOB_ID, "429 Too Many Requests", retry_after=90)
+    await repo.claim_next_pending_job(60, owner="worker-a")
+
+    _, retry = collection.find_one_and_update.await_args_list[0].args
+    assert retry["$set"]["status"] == AIJobStatus.PENDING
+    assert retry["$set"]["next_attempt_at"] >= before + timedelta(seconds=90)
+    claim_filter, _ = collection.find_one_and_update.await_args_list[1].args
+    pending = claim_filter["$or"][0]
+    assert pending["status"] == AIJobStatus.PENDING
+    assert pending["$or"][0] == {"next_attempt_at": None}
+    assert "$lte" in pending["$or"][1]["next_attempt_at"]
@@ -1,4 +1,18 @@
-from app.integrations.openai_client import _to_openai_strict_json_schema
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import openai
+import pytest
+
+import app.integrations.openai_client as openai_module
+from app.integrations.batching import MicroBatcher
+from app.integrations.openai_client import (
+    OpenAIClient,
+    _to_openai_strict_json_schema,
+    retry_after_seconds,
+)
 from app.schemas.v1.mediation import PrivateReflectionOutput, SharedMediationAdviceOutput
 
 
@@ -35,3 +49,96 @@ def test_shared_advice_nested_task_schema_is_normalized_for_openai_strict_output
     schema = _to_openai_strict_json_schema(SharedMediationAdviceOutput.model_json_schema())
 
     _assert_object_schemas_are_strict(schema)
+
+
+def _rate_limit_error(headers: dict[str, str]) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.test/v1/responses")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_retry_after_is_read_from_rate_limit_errors_and_their_causes() -> None:
+    assert retry_after_seconds(_rate_limit_error({"retry-after": "20"})) == 20
+    assert retry_after_seconds(_rate_limit_error({"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(_rate_limit_error({})) is None
+    assert retry_after_seconds(RuntimeError("boom")) is None
+
+    try:
+        raise RuntimeError("AI call failed") from _rate_limit_error({"retry-after": "7"})
+    except RuntimeError as wrapped:
+        assert retry_after_seconds(wrapped) == 7
+
+
+class _Dumpable(SimpleNamespace):
+    def model_dump(self, **_: object) -> dict[str, object]:
+        return {
+            key: value.model_dump() if isinstance(value, _Dumpable) else value
+            for key, value in vars(self).items()
+        }
+
+
+def _moderation_response(texts: list[str]) -> _Dumpable:
+    return _Dumpable(
+        id="modr-1",
+        model="omni-moderation-latest",
+        results=[
+            _Dumpable(
+                flagged="unsafe" in text,
+                categories=_Dumpable(violence="unsafe" in text),
+                category_scores=_Dumpable(violence=0.9 if "unsafe" in text else 0.01),
+            )
+            for text in texts
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_moderations_share_one_upstream_request(monkeypatch) -> None:
+    monkeypatch.setattr(openai_module.settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(
+        openai_module, "moderation_batcher", MicroBatcher(window_seconds=0.01, max_batch_size=8)
+    )
+    create = AsyncMock(side_effect=lambda *, model, input: _moderation_response(input))
+    client = OpenAIClient()
+    client._client = SimpleNamespace(moderations=SimpleNamespace(create=create))
+    # e.g. a request handler's client alongside the worker's.
+    other = OpenAIClient()
+    other._client = client._client
+
+    results = await asyncio.gather(
+        client.moderate_text(text="hello"),
+        other.moderate_text(text="something unsafe"),
+        client.moderate_text(text="thanks"),
+    )
+
+    create.assert_awaited_once()
+    assert create.await_args.kwargs["input"] == ["hello", "something unsafe", "thanks"]
+    assert [result.flagged for result in results] == [False, True, False]
+    assert results[1].categories == {"violence": True}
+    assert len(results[1].raw_result["results"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_flushes_full_batches_and_fans_out_errors() -> None:
+    batcher: MicroBatcher[str, str] = MicroBatcher(window_seconds=60, max_batch_size=2)
+    batches: list[list[str]] = []
+
+    async def send(items: list[str]) -> list[str]:
+        batches.append(items)
+        if "bad" in items:
+            raise RuntimeError("upstream down")
+        return [item.upper() for item in items]
+
+    # A full batch goes out without waiting for the window.
+    assert await asyncio.wait_for(
+        asyncio.gather(batcher.submit("a", send), batcher.submit("b", send)), timeout=1
+    ) == ["A", "B"]
+    failed = await asyncio.wait_for(
+        asyncio.gather(
+            batcher.submit("bad", send), batcher.submit("c", send), return_exceptions=True
+        ),
+        timeout=1,
+    )
+
+    assert batches == [["a", "b"], ["bad", "c"]]
+    assert all(isinstance(result, RuntimeError) for result in failed)